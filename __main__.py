@@ -17,12 +17,25 @@ In addition, you should have the following subfolders
 
 Moving any of these folders or files will prevent the game from working properly
 
+To run the game in release mode (without the checks in the game2d setters), type
+
+    python . --release
+
 Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 Version)
 """
+import sys
+
+# Kivy rejects the options it does not know, so take ours out before it reads them
+RELEASE = '--release' in sys.argv
+if RELEASE:
+    sys.argv.remove('--release')
+
 from consts import *
 from app import *
 
 # Application code
 if __name__ == '__main__':
-    Planetoids(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    Planetoids(width=GAME_WIDTH,height=GAME_HEIGHT,retained=RETAINED_VIEW,
+               atlas=TEXTURE_ATLAS,release=RELEASE_MODE or RELEASE,trace=TRACE_FILE,
+               hitch_log=HITCH_LOG,hitch_budget=HITCH_BUDGET).run()
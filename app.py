@@ -12,7 +12,10 @@ you are ensure about where a new class should go, post a question on Ed Discussi
 from consts import *
 from game2d import *
 from wave import *
+from replay import Recorder
 import json
+import random
+import time
 
 # PRIMARY RULE: Planetoids can only access attributes in wave.py via getters/setters
 # Planetoids is NOT allowed to access anything in models.py
@@ -83,6 +86,13 @@ class Planetoids(GameApp):
     # Attribute _sdown: Whether the 'S' was help down last frame
     # Invariant: _sdown is a boolean
     # END REMOVE
+    #
+    # Attribute _recorder: the recorder of the current session
+    # Invariant: _recorder is a Recorder, or None if the session is not being recorded
+    #            (RECORD_FILE is None, or the wave is over)
+    #
+    # Attribute _entered: the time the current state was entered (for traces)
+    # Invariant: _entered is an int from time.perf_counter_ns
 
     # DO NOT MAKE A NEW INITIALIZER!
 
@@ -102,6 +112,9 @@ class Planetoids(GameApp):
         """
         # IMPLEMENT ME
         self._state=STATE_INACTIVE
+        self._entered=time.perf_counter_ns()
+        if self.tracer!=None:
+            self.tracer.name_track(TRACE_STATES, 'states')
         self._wave=None
         self._title=GLabel(text='Planetoids', font_name=TITLE_FONT,\
         font_size=TITLE_SIZE)
@@ -113,6 +126,7 @@ class Planetoids(GameApp):
         self._message.top=self._title.y-TITLE_OFFSET
         self._sdown=False
         self._last=0
+        self._recorder=None
 
     def update(self,dt):
         """
@@ -154,40 +168,70 @@ class Planetoids(GameApp):
         
         You are allowed to add more states if you wish. Should you do so, you should
         describe them here.
+
+        The wave does not advance one tick per frame. It runs at a fixed TICK_RATE, and
+        its clock turns dt into however many ticks are due (see StepClock in wave.py).
+        So the game runs at the same speed whatever the frame rate.
         
+        If RECORD_FILE is set, every frame of the wave is recorded (see replay.py). The
+        recording is saved when the wave is won or lost. Likewise, if TIMING_FILE is
+        set, the phases of every frame are timed (see timing.py) and the timings are
+        saved when the wave is won or lost.
+
+        If the game is traced (TRACE_FILE is set), every state is an event on the
+        TRACE_STATES track of the trace, and the phases of the wave are events nested in
+        the frames. The number of asteroids and bullets is a counter.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
 
         # IMPLEMENT ME
+        ticks=0
         if self._state != STATE_INACTIVE:
             self._title = None
         if self._state == STATE_ACTIVE:
             self._message= None
         if self._state==STATE_INACTIVE:
             if self.input.is_key_down('s') and not self._sdown and self._last==0:
-                self._state=STATE_LOADING
+                self._setState(STATE_LOADING)
                 self._sdown=True
                 self._last=self.input.key_count
         if self._state == STATE_LOADING:
-            self._wave=Wave(self.load_json(DEFAULT_WAVE))
-            self._state=STATE_ACTIVE
+            seed=random.randrange(1<<62)
+            self._wave=Wave(self.load_json(DEFAULT_WAVE), seed=seed)
+            if RECORD_FILE!=None:
+                self._recorder=Recorder(DEFAULT_WAVE, seed)
+            if self.tracer!=None:
+                self._wave.setTimer(TracedTimer(self.tracer))
+            elif TIMING_FILE!=None:
+                self._wave.setTimer(PhaseTimer())
+            self._setState(STATE_ACTIVE)
         if self._state == STATE_ACTIVE:
-            self._wave.update(self.input)
+            ticks=self._wave.update(self.input, dt)
+            if self.tracer!=None:
+                self.tracer.counter('entities', {'asteroids':self._wave.getAstLen(),
+                                    'bullets':len(self._wave.getBullets())})
             if self._wave.getShip() == None:
-                self._state=STATE_PAUSED
+                self._setState(STATE_PAUSED)
         if self._state==STATE_PAUSED and self._wave.getLives()>0:
             self._continuemsg()
             if self.input.is_key_down('s'):
-                self._state=STATE_CONTINUE
+                self._setState(STATE_CONTINUE)
         if self._state==STATE_CONTINUE:
             self._wave.reset()
-            self._state=STATE_ACTIVE
+            self._setState(STATE_ACTIVE)
+        if self._recorder!=None:
+            self._record(ticks)
         if self._state==STATE_PAUSED and self._wave.getLives()==0:
             self._lossmsg()
+            self._saveRecording()
+            self._saveTiming()
             self._state==STATE_COMPLETE
         if self._win():
             self._winmsg()
+            self._saveRecording()
+            self._saveTiming()
             self._state==STATE_COMPLETE
  
     def draw(self):
@@ -224,6 +268,71 @@ class Planetoids(GameApp):
             return True
         return False
 
+    def _record(self, ticks):
+        """
+        Adds the current frame to the recording.
+
+        Parameter ticks: the number of ticks the wave advanced this frame
+        Precondition: ticks is an int >= 0
+        """
+        mask=inputMask(self.input)
+        if self.input.is_key_down('s'):
+            mask|=INPUT_START
+        self._recorder.record(mask, ticks)
+
+    def _saveRecording(self):
+        """
+        Saves the recording to RECORD_FILE and stops recording.
+
+        This does nothing if the session is not being recorded.
+        """
+        if self._recorder!=None:
+            self._recorder.save(RECORD_FILE)
+            self._recorder=None
+
+    def _saveTiming(self):
+        """
+        Saves the phase timings of the wave to TIMING_FILE and stops timing.
+
+        This does nothing if the wave is not being timed. The timings are not saved if
+        the wave was only timed for the trace.
+        """
+        timer=self._wave.getTimer()
+        if timer!=None:
+            if TIMING_FILE!=None:
+                timer.dump(TIMING_FILE)
+            self._wave.setTimer(None)
+
+    def diagnostics(self):
+        """
+        Returns a dictionary describing the state of the game, for the hitch log.
+
+        The dictionary holds the name of the state and, if there is a wave, the lives,
+        asteroids, bullets and asteroids destroyed, and the ticks the clock dropped.
+        """
+        info={'state':STATE_NAMES[self._state]}
+        if self._wave!=None:
+            info['lives']=self._wave.getLives()
+            info['asteroids']=self._wave.getAstLen()
+            info['bullets']=len(self._wave.getBullets())
+            info['destroyed']=self._wave.getDestroyed()
+            info['dropped']=self._wave.getClock().getDropped()
+        return info
+
+    def _setState(self, state):
+        """
+        Changes the state of the game, and traces the state that ended.
+
+        Parameter state: the new state
+        Precondition: state is one of the STATE constants in consts.py
+        """
+        if state!=self._state and self.tracer!=None:
+            now=time.perf_counter_ns()
+            self.tracer.complete(STATE_NAMES[self._state], 'state', self._entered, now,
+                                 TRACE_STATES)
+            self._entered=now
+        self._state=state
+
     def _continuemsg(self):
         """
         Assigns a message to the _message attribute indicating the user
@@ -0,0 +1,226 @@
+"""
+Batch simulation runner for Planetoids
+
+This module runs many headless Wave sessions in parallel, one process per core, and
+streams the result of every session to a JSONL file (one JSON object per line).
+
+A session is a wave file, a seed and an input policy. The policy is either 'scripted'
+(a random but seeded player that fires constantly, see ScriptedPolicy) or the name of a
+replay file written by replay.py (see RecordedPolicy). Sessions follow the rules of
+Planetoids, except that the ship is restored as soon as it is destroyed. A session ends
+when the wave is won or lost, when a recorded policy runs out of input, or after a
+maximum number of ticks.
+
+Each result holds the wave, the seed, the policy, the outcome ('win', 'loss', 'timeout'
+or 'end of input'), the ticks survived, the asteroids destroyed, the lives left and the
+time per tick in microseconds. For example, to run 1000 seeds of every wave in Data:
+
+    python batch.py --seeds 1000 --out results.jsonl
+
+Type python batch.py --help for all of the options.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from wave import *
+from replay import Replay
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import glob
+import itertools
+import json
+import os
+import time
+
+# The wave data already loaded in this process, by file name
+_WAVES = {}
+# The recorded ticks already loaded in this process, by file name
+_RECORDINGS = {}
+
+
+class ScriptedPolicy(object):
+    """
+    A class for a scripted player.
+
+    The player fires whenever it can. It turns in one direction (or not at all) for a
+    random number of ticks before choosing again, and applies thrust now and then. All
+    choices come from a generator with the session seed, so a session is reproducible.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _random: the random generator of the player
+    # Invariant: _random is a random.Random object
+    #
+    # Attribute _mask: the input mask the player is holding down
+    # Invariant: _mask is an int mask of the INPUT constants in consts.py
+    #
+    # Attribute _hold: the number of ticks left to hold down _mask
+    # Invariant: _hold is an int >= 0
+
+    # INITIALIZER TO CREATE A NEW PLAYER
+    def __init__(self, seed):
+        """
+        Initializes a scripted player.
+
+        Parameter seed: the seed of the player
+        Precondition: seed is an int
+        """
+        self._random=random.Random(seed)
+        self._mask=INPUT_FIRE
+        self._hold=0
+
+    # ADDITIONAL METHODS
+    def nextMask(self):
+        """
+        Returns the input mask for the next tick.
+        """
+        if self._hold==0:
+            self._mask=INPUT_FIRE|self._random.choice((0,INPUT_LEFT,INPUT_RIGHT))
+            if self._random.random()<0.25:
+                self._mask|=INPUT_THRUST
+            self._hold=self._random.randint(10,40)
+        self._hold-=1
+        return self._mask
+
+
+class RecordedPolicy(object):
+    """
+    A class for a player that plays back the ticks of a replay file.
+
+    Only the ship input is played back. The wave and seed of the session need not be
+    those of the recording.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _ticks: the input mask of every recorded tick
+    # Invariant: _ticks is a bytes object
+    #
+    # Attribute _next: the position of the next tick in _ticks
+    # Invariant: _next is an int >= 0
+
+    # INITIALIZER TO CREATE A NEW PLAYER
+    def __init__(self, filename):
+        """
+        Initializes a player from the given replay file.
+
+        Parameter filename: the replay file
+        Precondition: filename is a string naming a file written by Recorder.save
+        """
+        if not filename in _RECORDINGS:
+            _RECORDINGS[filename]=Replay(filename).getTicks()
+        self._ticks=_RECORDINGS[filename]
+        self._next=0
+
+    # ADDITIONAL METHODS
+    def nextMask(self):
+        """
+        Returns the input mask for the next tick, or None if the recording is over.
+        """
+        if self._next==len(self._ticks):
+            return None
+        self._next+=1
+        return self._ticks[self._next-1]
+
+
+def runSession(session):
+    """
+    Returns the result of a single headless session as a dictionary.
+
+    This function runs in the worker processes, so it only takes and returns plain
+    values that can be pickled.
+
+    Parameter session: the session as a tuple (wave file, seed, policy, max ticks)
+    Precondition: the wave file is a path to a wave JSON file, the seed is an int, the
+    policy is 'scripted' or a path to a replay file, and max ticks is an int > 0
+    """
+    (path,seed,policy,limit)=session
+    if not path in _WAVES:
+        with open(path) as file:
+            _WAVES[path]=json.load(file)
+    data=_WAVES[path]
+    wave=Wave(data, seed=seed)
+    player=ScriptedPolicy(seed) if policy=='scripted' else RecordedPolicy(policy)
+    outcome='timeout'
+    ticks=0
+    start=time.perf_counter()
+    while ticks<limit:
+        if wave.getAstLen()==0:
+            outcome='win'
+            break
+        if wave.getShip() is None:
+            if wave.getLives()==0:
+                outcome='loss'
+                break
+            wave.reset()
+        mask=player.nextMask()
+        if mask is None:
+            outcome='end of input'
+            break
+        wave.step(mask)
+        ticks+=1
+    seconds=time.perf_counter()-start
+    return {'wave':os.path.basename(path),'seed':seed,'policy':policy,'outcome':outcome,
+            'ticks':ticks,'destroyed':wave.getDestroyed(),'lives':wave.getLives(),
+            'us_per_tick':seconds*1e6/max(ticks,1)}
+
+
+def sessions(waves, seeds, policies, limit):
+    """
+    Returns an iterator over every combination of wave, seed and policy.
+
+    Parameter waves: the paths of the wave files
+    Precondition: waves is a list of strings
+
+    Parameter seeds: the seeds
+    Precondition: seeds is an iterable of ints
+
+    Parameter policies: the policies ('scripted' or a replay file)
+    Precondition: policies is a list of strings
+
+    Parameter limit: the most ticks in a session
+    Precondition: limit is an int > 0
+    """
+    for (seed,path,policy) in itertools.product(seeds,waves,policies):
+        yield (path,seed,policy,limit)
+
+
+def main(args=None):
+    """
+    Runs the sessions given on the command line and writes their results.
+
+    Parameter args: the command line arguments (sys.argv if None)
+    Precondition: args is None or a list of strings
+    """
+    parser=argparse.ArgumentParser(description='Run headless Planetoids sessions.')
+    parser.add_argument('--waves',nargs='+',default=None,
+                        help='the wave files (default: every JSON file in Data)')
+    parser.add_argument('--seeds',type=int,default=100,help='the number of seeds')
+    parser.add_argument('--first-seed',type=int,default=0,help='the first seed')
+    parser.add_argument('--policy',nargs='+',default=['scripted'],
+                        help="'scripted' and/or replay files")
+    parser.add_argument('--ticks',type=int,default=TICK_RATE*600,
+                        help='the most ticks in a session')
+    parser.add_argument('--workers',type=int,default=os.cpu_count(),
+                        help='the number of processes (default: one per core)')
+    parser.add_argument('--out',default='results.jsonl',help='the JSONL file to write')
+    options=parser.parse_args(args)
+    waves=options.waves
+    if waves is None:
+        folder=os.path.join(os.path.dirname(os.path.abspath(__file__)),'Data')
+        waves=sorted(glob.glob(os.path.join(folder,'*.json')))
+    seeds=range(options.first_seed,options.first_seed+options.seeds)
+    total=len(waves)*len(seeds)*len(options.policy)
+    # Large chunks keep the workers busy without pickling every session on its own
+    chunk=max(1,min(256,total//(options.workers*8)))
+    start=time.perf_counter()
+    with ProcessPoolExecutor(options.workers) as pool, open(options.out,'w') as out:
+        results=pool.map(runSession,sessions(waves,seeds,options.policy,options.ticks),
+                         chunksize=chunk)
+        for result in results:
+            out.write(json.dumps(result)+'\n')
+    print('%d sessions in %.1f s with %d workers' % (total,time.perf_counter()-start,
+          options.workers))
+
+
+# Application code
+if __name__ == '__main__':
+    main()
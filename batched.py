@@ -0,0 +1,610 @@
+"""
+Batched simulation module for Planetoids
+
+This module contains the class BatchedWave, which advances many independent waves (or
+worlds) in lockstep. It plays by exactly the same rules as the class Wave: the ship
+turns, thrusts and fires like a Ship, bullets are tested along their swept paths, each
+bullet takes the asteroid it reaches first, and broken asteroids split in the same
+directions as in Wave. The script lockstep.py checks this, tick by tick.
+
+The difference is in how the state is stored. A Wave keeps its own Python objects, so
+stepping a thousand waves means a thousand trips through the interpreter. A BatchedWave
+keeps the ships, asteroids and bullets of every world in padded NumPy arrays, with a
+mask saying which slots are in use, and each step is a handful of array operations over
+all of the worlds at once.
+
+Asteroid slots are not in draw order. Instead every asteroid has a key that sorts like
+the draw order of a Wave (the children of an asteroid take its place), and the key
+breaks ties wherever Wave would pick the first row.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from models import degToRad, sizeCode
+from physics import wrapDelta
+import numpy as np
+import math
+
+# The most asteroids that a single asteroid can break up into, by size code
+_PIECES = (1, 3, 9)
+# The step between the keys of the children of an asteroid, by size code of the parent
+_KEY_STEP = (0, 1, 4)
+# The step between the keys of the asteroids of a wave file
+_KEY_SPAN = 16
+# The rotations that give the directions of the second and third children
+_TURNS = ((math.cos(degToRad(120)),math.sin(degToRad(120))),
+          (math.cos(degToRad(240)),math.sin(degToRad(240))))
+
+
+def bulletCapacity():
+    """
+    Returns the most bullets that can be in play at once in a single world.
+
+    A bullet is deleted once it leaves the screen, so it lives at most as long as it
+    takes to cross the screen diagonally, and the ship fires at most once every
+    BULLET_RATE ticks.
+    """
+    life=math.ceil((math.hypot(GAME_WIDTH,GAME_HEIGHT)+2*BULLET_RADIUS)/BULLET_SPEED)+1
+    return math.ceil(life/BULLET_RATE)+1
+
+
+class BatchedWave(object):
+    """
+    A class to advance many independent waves at once.
+
+    Each world starts from a wave JSON, just like a Wave. The method step takes one
+    input mask per world and advances every world that has a ship by one tick. Like a
+    Wave, a world whose ship was destroyed stands still until the method reset gives
+    it a new ship (if it has lives left).
+
+    The state of the worlds is read through the getters, which return the arrays
+    themselves (do not modify them). Slots that are not in use hold stale values, so
+    always combine an array with its mask.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _start: the start position of the ship in each world
+    # Invariant: _start is a float array of shape (n,2)
+    #
+    # Attribute _startAngle: the start angle of the ship in each world
+    # Invariant: _startAngle is a float array of shape (n,)
+    #
+    # Attribute _alive: whether each world has a ship
+    # Invariant: _alive is a bool array of shape (n,)
+    #
+    # Attribute _lives: the number of lives left in each world
+    # Invariant: _lives is an int array of shape (n,) with values >= 0
+    #
+    # Attribute _firerate: the number of ticks since each ship last fired
+    # Invariant: _firerate is an int array of shape (n,) with values >= 0
+    #
+    # Attribute _shipPos, _shipVel, _facing: the position, velocity and facing of ships
+    # Invariant: each is a float array of shape (n,2)
+    #
+    # Attribute _angle: the angle of each ship in degrees
+    # Invariant: _angle is a float array of shape (n,)
+    #
+    # Attribute _astLive: whether each asteroid slot is in use
+    # Invariant: _astLive is a bool array of shape (n,a)
+    #
+    # Attribute _astPos, _astVel: the centers and velocities of the asteroids
+    # Invariant: each is a float array of shape (n,a,2)
+    #
+    # Attribute _astSize: the size codes of the asteroids
+    # Invariant: _astSize is an int8 array of shape (n,a) with values in 0..2
+    #
+    # Attribute _astKey: the draw order keys of the asteroids
+    # Invariant: _astKey is an int64 array of shape (n,a), distinct in each world
+    #
+    # Attribute _bulLive: whether each bullet slot is in use
+    # Invariant: _bulLive is a bool array of shape (n,b)
+    #
+    # Attribute _bulPos, _bulLast, _bulVel: the position, position before the last
+    # move and velocity of the bullets
+    # Invariant: each is a float array of shape (n,b,2)
+    #
+    # Attribute _bulSerial: the order in which the bullets were fired
+    # Invariant: _bulSerial is an int64 array of shape (n,b)
+    #
+    # Attribute _fired: the number of bullets fired so far in all worlds
+    # Invariant: _fired is an int >= 0
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getWorlds(self):
+        """
+        Returns the number of worlds.
+
+        The value is an int > 0.
+        """
+        return len(self._alive)
+
+    def getAlive(self):
+        """
+        Returns whether each world has a ship.
+
+        The value is a bool array of shape (n,).
+        """
+        return self._alive
+
+    def getLives(self):
+        """
+        Returns the number of lives left in each world.
+
+        The value is an int array of shape (n,).
+        """
+        return self._lives
+
+    def getShipPositions(self):
+        """
+        Returns the position of the ship in each world.
+
+        The value is a float array of shape (n,2). It is stale for a world without ship.
+        """
+        return self._shipPos
+
+    def getShipVelocities(self):
+        """
+        Returns the velocity of the ship in each world.
+
+        The value is a float array of shape (n,2). It is stale for a world without ship.
+        """
+        return self._shipVel
+
+    def getShipAngles(self):
+        """
+        Returns the angle of the ship in each world, in degrees.
+
+        The value is a float array of shape (n,). It is stale for a world without ship.
+        """
+        return self._angle
+
+    def getAstLen(self):
+        """
+        Returns the number of asteroids in each world.
+
+        The value is an int array of shape (n,).
+        """
+        return self._astLive.sum(axis=1)
+
+    def getAsteroidMask(self):
+        """
+        Returns whether each asteroid slot is in use.
+
+        The value is a bool array of shape (n,a).
+        """
+        return self._astLive
+
+    def getAsteroidPositions(self):
+        """
+        Returns the centers of the asteroids.
+
+        The value is a float array of shape (n,a,2).
+        """
+        return self._astPos
+
+    def getAsteroidVelocities(self):
+        """
+        Returns the velocities of the asteroids.
+
+        The value is a float array of shape (n,a,2).
+        """
+        return self._astVel
+
+    def getAsteroidSizes(self):
+        """
+        Returns the size codes of the asteroids.
+
+        The value is an int8 array of shape (n,a).
+        """
+        return self._astSize
+
+    def getAsteroidKeys(self):
+        """
+        Returns the draw order keys of the asteroids.
+
+        Sorting the asteroids of a world by key gives the row order of a Wave.
+        The value is an int64 array of shape (n,a).
+        """
+        return self._astKey
+
+    def getBulletMask(self):
+        """
+        Returns whether each bullet slot is in use.
+
+        The value is a bool array of shape (n,b).
+        """
+        return self._bulLive
+
+    def getBulletPositions(self):
+        """
+        Returns the positions of the bullets.
+
+        The value is a float array of shape (n,b,2).
+        """
+        return self._bulPos
+
+    # INITIALIZER TO CREATE THE WORLDS
+    def __init__(self, data, worlds=None, bullets=None):
+        """
+        Initializes the worlds from the given wave data.
+
+        There are enough asteroid slots for every asteroid to break up completely, and
+        by default enough bullet slots for the fastest firing ship (see bulletCapacity).
+
+        Parameter data: the dictionary defining every wave, or a list with one per world
+        Precondition: data is a wave JSON dictionary or a nonempty list of them
+
+        Parameter worlds: the number of worlds if data is a single dictionary
+        Precondition: worlds is an int > 0, or None if data is a list
+
+        Parameter bullets: the number of bullet slots per world
+        Precondition: bullets is an int > 0, or None for bulletCapacity()
+        """
+        if isinstance(data,dict):
+            data=[data]*worlds
+        n=len(data)
+        codes=[[sizeCode(asteroid['size']) for asteroid in wave['asteroids']]
+               for wave in data]
+        a=max(1,max(sum(_PIECES[code] for code in row) for row in codes))
+        b=bulletCapacity() if bullets is None else bullets
+        self._start=np.array([wave['ship']['position'] for wave in data],dtype=float)
+        self._startAngle=np.array([wave['ship']['angle'] for wave in data],dtype=float)
+        self._alive=np.zeros(n,dtype=bool)
+        self._lives=np.full(n,3,dtype=np.int64)
+        self._firerate=np.zeros(n,dtype=np.int64)
+        self._shipPos=np.zeros((n,2))
+        self._shipVel=np.zeros((n,2))
+        self._facing=np.zeros((n,2))
+        self._angle=np.zeros(n)
+        self._astLive=np.zeros((n,a),dtype=bool)
+        self._astPos=np.zeros((n,a,2))
+        self._astVel=np.zeros((n,a,2))
+        self._astSize=np.zeros((n,a),dtype=np.int8)
+        self._astKey=np.zeros((n,a),dtype=np.int64)
+        self._bulLive=np.zeros((n,b),dtype=bool)
+        self._bulPos=np.zeros((n,b,2))
+        self._bulLast=np.zeros((n,b,2))
+        self._bulVel=np.zeros((n,b,2))
+        self._bulSerial=np.zeros((n,b),dtype=np.int64)
+        self._fired=0
+        for world,wave in enumerate(data):
+            count=len(codes[world])
+            if count==0:
+                continue
+            dir=np.array([asteroid['direction'] for asteroid in wave['asteroids']],
+                         dtype=float).reshape(-1,2)
+            size=np.array(codes[world],dtype=np.int8)
+            self._astLive[world,:count]=True
+            self._astPos[world,:count]=[asteroid['position'] for asteroid in wave['asteroids']]
+            self._astVel[world,:count]=self._velocities(dir,size)
+            self._astSize[world,:count]=size
+            self._astKey[world,:count]=np.arange(count)*_KEY_SPAN
+        self.reset(np.ones(n,dtype=bool))
+
+    # UPDATE METHOD TO MOVE THE SHIPS, ASTEROIDS, AND BULLETS
+    def step(self, actions):
+        """
+        Advances every world with a ship by a single tick.
+
+        This follows the same rules as Wave.step, world by world.
+
+        Parameter actions: the keys held down in each world during this tick
+        Precondition: actions is an int mask of the INPUT constants in consts.py, or an
+        array of shape (n,) of them
+        """
+        on=self._alive.copy()
+        if not on.any():
+            return
+        actions=np.broadcast_to(np.asarray(actions,dtype=np.int64),on.shape)
+        self._firerate[on]+=1
+        self._steer(on, actions)
+        self._moveShips(on)
+        self._moveAsteroids(on)
+        self._fire(on&((actions&INPUT_FIRE)!=0)&(self._firerate>=BULLET_RATE))
+        moving=on[:,np.newaxis]&self._bulLive
+        self._bulLast[moving]=self._bulPos[moving]
+        self._bulPos[moving]+=self._bulVel[moving]
+        self._detectBulletCollision(on)
+        self._deleteBullet(on)
+        self._detectShipCollision(on)
+
+    # RESET METHOD FOR CREATING A NEW LIFE
+    def reset(self, worlds=None):
+        """
+        Gives the given worlds a new ship with the original features, like Wave.reset.
+
+        Parameter worlds: the worlds to reset (by default every world that has no ship
+        but has lives left)
+        Precondition: worlds is None or a bool array of shape (n,)
+        """
+        if worlds is None:
+            worlds=~self._alive&(self._lives>0)
+        self._alive[worlds]=True
+        self._shipPos[worlds]=self._start[worlds]
+        self._shipVel[worlds]=0.0
+        self._angle[worlds]=self._startAngle[worlds]
+        radians=np.pi*self._angle[worlds]/180
+        self._facing[worlds]=np.stack((np.cos(radians),np.sin(radians)),axis=-1)
+
+    # HELPER METHODS FOR PHYSICS AND COLLISION DETECTION
+    def _steer(self, on, actions):
+        """
+        Turns the ships and applies thrust, like Ship.turn and Ship.velocity.
+
+        Parameter on: the worlds to advance
+        Precondition: on is a bool array of shape (n,)
+
+        Parameter actions: the keys held down in each world
+        Precondition: actions is an int array of shape (n,)
+        """
+        left=on&((actions&INPUT_LEFT)!=0)
+        right=on&((actions&INPUT_RIGHT)!=0)
+        self._angle[left]+=SHIP_TURN_RATE
+        self._angle[right]-=SHIP_TURN_RATE
+        turned=left|right
+        radians=np.pi*self._angle[turned]/180
+        self._facing[turned]=np.stack((np.cos(radians),np.sin(radians)),axis=-1)
+        thrust=on&((actions&INPUT_THRUST)!=0)
+        velocity=self._shipVel[thrust]+self._facing[thrust]*SHIP_IMPULSE
+        speed=np.sqrt((velocity*velocity).sum(axis=1))
+        fast=speed>SHIP_MAX_SPEED
+        velocity[fast]=velocity[fast]/speed[fast,np.newaxis]*SHIP_MAX_SPEED
+        self._shipVel[thrust]=velocity
+
+    def _moveShips(self, on):
+        """
+        Moves the ships and wraps them around the dead zone, like Ship.move.
+
+        Parameter on: the worlds to advance
+        Precondition: on is a bool array of shape (n,)
+        """
+        self._shipPos[on]+=self._shipVel[on]
+        self._wrap(self._shipPos, on)
+
+    def _moveAsteroids(self, on):
+        """
+        Moves the asteroids and wraps them around the dead zone, like AsteroidField.move.
+
+        Parameter on: the worlds to advance
+        Precondition: on is a bool array of shape (n,)
+        """
+        self._astPos[on]+=self._astVel[on]
+        self._wrap(self._astPos, on)
+
+    def _wrap(self, pos, on):
+        """
+        Wraps the positions of the given worlds that left the dead zone.
+
+        Parameter pos: the positions to wrap
+        Precondition: pos is a float array whose first axis is the world and last axis
+        is (x,y)
+
+        Parameter on: the worlds to wrap
+        Precondition: on is a bool array of shape (n,)
+        """
+        x=pos[...,0]
+        y=pos[...,1]
+        on=on.reshape(on.shape+(1,)*(x.ndim-1))
+        x[on&(x<-DEAD_ZONE)]+=WORLD_WIDTH
+        x[on&(x>(GAME_WIDTH+DEAD_ZONE))]-=WORLD_WIDTH
+        y[on&(y<-DEAD_ZONE)]+=WORLD_HEIGHT
+        y[on&(y>(GAME_HEIGHT+DEAD_ZONE))]-=WORLD_HEIGHT
+
+    def _fire(self, worlds):
+        """
+        Fires a bullet from the ship of the given worlds, like the Bullet initializer.
+
+        The bullet goes in the first free slot. A world with no free slot does not
+        fire (this cannot happen with the default capacity).
+
+        Parameter worlds: the worlds that fire
+        Precondition: worlds is a bool array of shape (n,)
+        """
+        slot=np.argmin(self._bulLive,axis=1)
+        worlds=worlds&~self._bulLive[np.arange(len(slot)),slot]
+        world=np.flatnonzero(worlds)
+        slot=slot[world]
+        pos=self._facing[world]*SHIP_RADIUS+self._shipPos[world]
+        self._bulLive[world,slot]=True
+        self._bulPos[world,slot]=pos
+        self._bulLast[world,slot]=pos
+        self._bulVel[world,slot]=self._facing[world]*BULLET_SPEED
+        self._bulSerial[world,slot]=self._fired+np.arange(len(world))
+        self._fired+=len(world)
+        self._firerate[worlds]=0
+
+    def _detectBulletCollision(self, on):
+        """
+        Breaks up the asteroids hit by a bullet and removes those bullets.
+
+        This is sweptHits followed by firstHits (see physics.py), for every world: the
+        bullets are resolved in the order they were fired, and each takes the asteroid
+        it reaches first that was not taken by an earlier bullet.
+
+        Parameter on: the worlds to advance
+        Precondition: on is a bool array of shape (n,)
+        """
+        live=on[:,np.newaxis]&self._bulLive
+        if not live.any() or not self._astLive.any():
+            return
+        serial=np.where(live,self._bulSerial,np.iinfo(np.int64).max)
+        order=np.argsort(serial,axis=1)
+        taken=~self._astLive
+        hitWorld=[]
+        hitBullet=[]
+        hitAsteroid=[]
+        for rank in range(order.shape[1]):
+            bullet=order[:,rank]
+            world=np.flatnonzero(live[np.arange(len(bullet)),bullet])
+            if len(world)==0:
+                break
+            bullet=bullet[world]
+            times=self._impactTimes(world, bullet)
+            times[taken[world]]=np.inf
+            first=times.min(axis=1)
+            hit=np.isfinite(first)
+            if not hit.any():
+                continue
+            world=world[hit]
+            bullet=bullet[hit]
+            keys=np.where(times[hit]==first[hit,np.newaxis],self._astKey[world],
+                          np.iinfo(np.int64).max)
+            asteroid=np.argmin(keys,axis=1)
+            taken[world,asteroid]=True
+            hitWorld.append(world)
+            hitBullet.append(bullet)
+            hitAsteroid.append(asteroid)
+        if not hitWorld:
+            return
+        world=np.concatenate(hitWorld)
+        bullet=np.concatenate(hitBullet)
+        asteroid=np.concatenate(hitAsteroid)
+        velocity=self._bulVel[world,bullet]
+        col=velocity/np.sqrt((velocity*velocity).sum(axis=1))[:,np.newaxis]
+        self._split(world, asteroid, col)
+        self._bulLive[world,bullet]=False
+
+    def _impactTimes(self, world, bullet):
+        """
+        Returns the time of impact of one bullet per world with every asteroid.
+
+        The test is the same as in sweptHits. The result is a float array of shape
+        (k,a), with the fraction of the tick at which the bullet first touches each
+        asteroid, or inf if it does not touch it this tick.
+
+        Parameter world: the worlds
+        Precondition: world is an int array of shape (k,)
+
+        Parameter bullet: the bullet slot in each world
+        Precondition: bullet is an int array of shape (k,)
+        """
+        start=self._bulLast[world,bullet][:,np.newaxis,:]
+        travel=self._bulPos[world,bullet][:,np.newaxis,:]-start
+        motion=self._astVel[world]
+        gap=start-self._astPos[world]+motion
+        sx=wrapDelta(gap[...,0],WORLD_WIDTH)
+        sy=wrapDelta(gap[...,1],WORLD_HEIGHT)
+        dx=travel[...,0]-motion[...,0]
+        dy=travel[...,1]-motion[...,1]
+        reach=np.take(ASTEROID_RADII,self._astSize[world])+BULLET_RADIUS
+        a=dx*dx+dy*dy
+        b=sx*dx+sy*dy
+        c=sx*sx+sy*sy-reach*reach
+        disc=b*b-a*c
+        inside=c<=0
+        moving=(a>0)&(disc>=0)&~inside
+        times=np.full(a.shape,np.inf)
+        times[inside]=0.0
+        times[moving]=(-b[moving]-np.sqrt(disc[moving]))/a[moving]
+        times[(times<0)|(times>1)]=np.inf
+        return times
+
+    def _deleteBullet(self, on):
+        """
+        Removes the bullets that left the screen, like Bullet.isDelete.
+
+        Parameter on: the worlds to advance
+        Precondition: on is a bool array of shape (n,)
+        """
+        x=self._bulPos[...,0]
+        y=self._bulPos[...,1]
+        gone=(x>GAME_WIDTH+BULLET_RADIUS)|(x<-BULLET_RADIUS)
+        gone|=(y>GAME_HEIGHT+BULLET_RADIUS)|(y<-BULLET_RADIUS)
+        self._bulLive[on[:,np.newaxis]&gone]=False
+
+    def _detectShipCollision(self, on):
+        """
+        Destroys the ships that touch an asteroid and breaks up that asteroid.
+
+        Like Wave._detectShipCollision, the ship takes the first asteroid in draw order.
+
+        Parameter on: the worlds to advance
+        Precondition: on is a bool array of shape (n,)
+        """
+        world=np.flatnonzero(on)
+        gap=self._astPos[world]-self._shipPos[world][:,np.newaxis,:]
+        dx=np.abs(gap[...,0])
+        np.minimum(dx,WORLD_WIDTH-dx,out=dx)
+        dy=np.abs(gap[...,1])
+        np.minimum(dy,WORLD_HEIGHT-dy,out=dy)
+        reach=np.take(ASTEROID_RADII,self._astSize[world])+SHIP_RADIUS
+        touch=self._astLive[world]&(dx*dx+dy*dy<=reach*reach)
+        hit=touch.any(axis=1)
+        if not hit.any():
+            return
+        world=world[hit]
+        keys=np.where(touch[hit],self._astKey[world],np.iinfo(np.int64).max)
+        asteroid=np.argmin(keys,axis=1)
+        self._lives[world]-=1
+        self._alive[world]=False
+        col=self._shipVel[world].copy()
+        still=(col*col).sum(axis=1)==0
+        col[still]=self._facing[world[still]]
+        self._split(world, asteroid, col)
+
+    def _split(self, world, asteroid, col):
+        """
+        Breaks up the given asteroids, like Wave._split.
+
+        Every asteroid is removed. In place of a medium or large asteroid, three
+        asteroids one size smaller are spawned: one in the direction col and two turned
+        by 120 and 240 degrees (and normalized), like _bulletCollisionVector.
+
+        Parameter world: the world of each asteroid
+        Precondition: world is an int array of shape (k,)
+
+        Parameter asteroid: the slot of each asteroid
+        Precondition: asteroid is an int array of shape (k,), with no repeated pairs
+
+        Parameter col: the collision vector of each asteroid
+        Precondition: col is a float array of shape (k,2)
+        """
+        size=self._astSize[world,asteroid].astype(np.intp)
+        self._astLive[world,asteroid]=False
+        broken=size>0
+        if not broken.any():
+            return
+        world=world[broken]
+        asteroid=asteroid[broken]
+        size=size[broken]-1
+        col=col[broken]
+        turned=[col]
+        for (cos,sin) in _TURNS:
+            dir=np.stack((col[:,0]*cos-col[:,1]*sin,col[:,0]*sin+col[:,1]*cos),axis=-1)
+            turned.append(dir/np.sqrt((dir*dir).sum(axis=1))[:,np.newaxis])
+        dir=np.stack(turned,axis=1)
+        radius=np.take(ASTEROID_RADII,size)[:,np.newaxis,np.newaxis]
+        center=dir*radius+self._astPos[world,asteroid][:,np.newaxis,:]
+        keys=self._astKey[world,asteroid][:,np.newaxis]+\
+        np.take(_KEY_STEP,size+1)[:,np.newaxis]*np.arange(1,4)
+        # Put the children of each world in the free slots of that world, in order
+        world=np.repeat(world,3)
+        size=np.repeat(size,3).astype(np.int8)
+        order=np.argsort(world,kind='stable')
+        rank=np.empty(len(world),dtype=np.intp)
+        rank[order]=np.arange(len(world))-np.searchsorted(world[order],world[order])
+        free=np.argsort(self._astLive[world],axis=1,kind='stable')
+        slot=free[np.arange(len(world)),rank]
+        self._astLive[world,slot]=True
+        self._astPos[world,slot]=center.reshape(-1,2)
+        self._astVel[world,slot]=self._velocities(dir.reshape(-1,2),size)
+        self._astSize[world,slot]=size
+        self._astKey[world,slot]=keys.reshape(-1)
+
+    def _velocities(self, dir, size):
+        """
+        Returns the velocities of asteroids moving in the given directions.
+
+        The speed is determined by the size, as in AsteroidField.spawn. A direction of
+        (0,0) gives a stationary asteroid.
+
+        Parameter dir: the directions of movement
+        Precondition: dir is a float array of shape (k,2)
+
+        Parameter size: the size codes
+        Precondition: size is an int array of shape (k,) with values in 0..2
+        """
+        magnitude=np.sqrt((dir[:,0]**2)+(dir[:,1]**2))[:,np.newaxis]
+        vel=np.divide(dir,magnitude,out=np.zeros_like(dir),where=magnitude>0)
+        vel*=np.take(ASTEROID_SPEEDS,size)[:,np.newaxis]
+        return vel
@@ -0,0 +1,19 @@
+"""
+Benchmark package for Planetoids
+
+This package makes synthetic waves (in the same JSON schema as the files in Data) with
+any number of asteroids and bullets, and times the phases of a headless Wave step at
+each size. It reports the time per entity per tick and how the time scales with the
+number of asteroids, and it can save a run as a baseline to compare later runs against.
+
+Run it from the directory of the game (so that it can find wave.py) with
+
+    python -m bench
+
+Type python -m bench --help for all of the options.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from .synth import makeWave, addBullets
+from .scaling import PHASES, measure, sweep, exponent, saveBaseline, loadBaseline
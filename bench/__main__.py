@@ -0,0 +1,71 @@
+"""
+Command line module for the Planetoids benchmarks
+
+This module runs the benchmarks and prints a report. Run it from the directory of the
+game with
+
+    python -m bench [--asteroids N ...] [--bullets N ...] [--save FILE] [--compare FILE]
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from .scaling import PHASES, sweep, exponent, saveBaseline, loadBaseline
+import argparse
+import sys
+
+
+def main(args=None):
+    """
+    Runs the benchmarks given on the command line and prints a report.
+
+    Parameter args: the command line arguments (sys.argv if None)
+    Precondition: args is None or a list of strings
+    """
+    parser=argparse.ArgumentParser(prog='python -m bench',
+                                   description='Time the phases of a Wave step.')
+    parser.add_argument('--asteroids',type=int,nargs='+',
+                        default=[10,100,1000,10000,100000],help='the asteroid counts')
+    parser.add_argument('--bullets',type=int,nargs='+',default=[0,50,500],
+                        help='the bullet counts')
+    parser.add_argument('--reps',type=int,default=5,help='the repetitions per phase')
+    parser.add_argument('--seed',type=int,default=0,help='the seed of the waves')
+    parser.add_argument('--sizes',type=float,nargs=3,default=[1,1,1],
+                        metavar=('SMALL','MEDIUM','LARGE'),help='the weights of the sizes')
+    parser.add_argument('--save',help='save the results as a baseline to this file')
+    parser.add_argument('--compare',help='compare against the baseline in this file')
+    options=parser.parse_args(args)
+    baseline=loadBaseline(options.compare) if options.compare else None
+
+    header='%9s %7s  %-24s %12s %12s' % ('asteroids','bullets','phase','us/tick',
+                                         'ns/entity')
+    if baseline!=None:
+        header+=' %9s' % 'vs base'
+    print(header)
+
+    def log(row):
+        line='%9d %7d  %-24s %12.1f %12.2f' % (row['asteroids'],row['bullets'],
+              row['phase'],row['ns']/1000,row['ns_per_entity'])
+        if baseline!=None:
+            old=baseline.get((row['asteroids'],row['bullets'],row['phase']))
+            line+=' %8.2fx' % (row['ns']/old['ns']) if old and old['ns'] else '         -'
+        print(line)
+        sys.stdout.flush()
+
+    rows=sweep(options.asteroids,options.bullets,options.reps,options.seed,
+               tuple(options.sizes),log)
+    print()
+    print('Scaling exponent in the number of asteroids (1 = linear):')
+    for count in options.bullets:
+        slopes=[]
+        for phase in PHASES:
+            slope=exponent(rows,phase,count)
+            slopes.append('%s %s' % (phase,'-' if slope is None else '%.2f' % slope))
+        print('  %4d bullets: %s' % (count,', '.join(slopes)))
+    if options.save:
+        saveBaseline(rows,options.save)
+        print('Saved baseline to %s' % options.save)
+
+
+# Application code
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Scaling module for the Planetoids benchmarks
+
+This module times the phases of a Wave step as the number of entities grows. Each
+measurement builds a synthetic wave, fires the bullets (which have not moved yet,
+so the collision phases test them where they are), and takes a snapshot (see
+Wave.snapshot). Every repetition restores the snapshot first, so each phase is always
+timed on the same state, and only the phase itself is inside the timer.
+
+The phases are the whole step (Wave.step, the headless version of update) and its
+three helpers that depend on the number of entities: the bullet collisions, the ship
+collision and the deletion of bullets.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from wave import Wave
+from .synth import makeWave, addBullets
+import json
+import math
+import platform
+import statistics
+import time
+
+# The phases that are timed, in the order they are reported (named as in timing.py)
+PHASES = ('step', 'bulletCollision', 'shipCollision', 'deleteBullet')
+# The names of the phases in older baselines
+_RENAMED = {'update':'step', '_detectBulletCollision':'bulletCollision',
+            '_detectShipCollision':'shipCollision', '_deleteBullet':'deleteBullet'}
+
+
+def _call(wave, phase):
+    """
+    Runs a single phase of a wave step.
+
+    Parameter wave: the wave to run
+    Precondition: wave is a Wave object
+
+    Parameter phase: the phase to run
+    Precondition: phase is one of the strings in PHASES
+    """
+    if phase=='step':
+        wave.step(0)
+    elif phase=='bulletCollision':
+        wave._detectBulletCollision()
+    elif phase=='shipCollision':
+        if wave.getShip()!=None:
+            wave._detectShipCollision()
+    else:
+        wave._deleteBullet()
+
+
+def measure(asteroids, bullets, reps=5, seed=0, sizes=(1,1,1)):
+    """
+    Returns the median time of each phase in nanoseconds, as a dictionary by phase.
+
+    Parameter asteroids: the number of asteroids in the wave
+    Precondition: asteroids is an int >= 0
+
+    Parameter bullets: the number of bullets in the wave
+    Precondition: bullets is an int >= 0
+
+    Parameter reps: the number of times to run each phase
+    Precondition: reps is an int > 0
+
+    Parameter seed: the seed of the synthetic wave
+    Precondition: seed is an int
+
+    Parameter sizes: the relative weights of small, medium and large asteroids
+    Precondition: sizes is a tuple of three numbers >= 0, not all 0
+    """
+    wave=Wave(makeWave(asteroids,seed,sizes),seed=seed)
+    addBullets(wave,bullets,seed)
+    state=wave.snapshot()
+    result={}
+    for phase in PHASES:
+        times=[]
+        for rep in range(reps):
+            wave.restore(state)
+            start=time.perf_counter_ns()
+            _call(wave,phase)
+            times.append(time.perf_counter_ns()-start)
+        result[phase]=statistics.median(times)
+    return result
+
+
+def sweep(asteroids, bullets, reps=5, seed=0, sizes=(1,1,1), log=None):
+    """
+    Returns the measurements for every combination of sizes, as a list of dictionaries.
+
+    Each dictionary has the keys 'asteroids', 'bullets', 'phase', 'ns' (the median time
+    of the phase) and 'ns_per_entity' (that time divided by the number of asteroids and
+    bullets, or by 1 if there are none).
+
+    Parameter asteroids: the numbers of asteroids to measure
+    Precondition: asteroids is a list of ints >= 0
+
+    Parameter bullets: the numbers of bullets to measure
+    Precondition: bullets is a list of ints >= 0
+
+    Parameter reps: the number of times to run each phase
+    Precondition: reps is an int > 0
+
+    Parameter seed: the seed of the synthetic waves
+    Precondition: seed is an int
+
+    Parameter sizes: the relative weights of small, medium and large asteroids
+    Precondition: sizes is a tuple of three numbers >= 0, not all 0
+
+    Parameter log: a function to call with each new row (for progress)
+    Precondition: log is None or a function of one argument (a row)
+    """
+    rows=[]
+    for count in bullets:
+        for size in asteroids:
+            times=measure(size,count,reps,seed,sizes)
+            for phase in PHASES:
+                row={'asteroids':size,'bullets':count,'phase':phase,'ns':times[phase],
+                     'ns_per_entity':times[phase]/max(1,size+count)}
+                rows.append(row)
+                if log!=None:
+                    log(row)
+    return rows
+
+
+def exponent(rows, phase, bullets):
+    """
+    Returns the scaling exponent of a phase in the number of asteroids.
+
+    This is the slope of the least squares line through log(time) against
+    log(asteroids), so 1 means linear time and 2 quadratic time. The result is None if
+    there are fewer than two sizes with asteroids.
+
+    Parameter rows: the measurements
+    Precondition: rows is a list of dictionaries, as returned by sweep
+
+    Parameter phase: the phase
+    Precondition: phase is one of the strings in PHASES
+
+    Parameter bullets: the number of bullets of the measurements to use
+    Precondition: bullets is an int >= 0
+    """
+    points=[(math.log(row['asteroids']),math.log(max(row['ns'],1))) for row in rows
+            if row['phase']==phase and row['bullets']==bullets and row['asteroids']>0]
+    if len(points)<2:
+        return None
+    mx=sum(x for (x,y) in points)/len(points)
+    my=sum(y for (x,y) in points)/len(points)
+    sxx=sum((x-mx)**2 for (x,y) in points)
+    sxy=sum((x-mx)*(y-my) for (x,y) in points)
+    return sxy/sxx if sxx>0 else None
+
+
+def saveBaseline(rows, path):
+    """
+    Saves measurements to a JSON file, to compare later runs against.
+
+    Parameter rows: the measurements
+    Precondition: rows is a list of dictionaries, as returned by sweep
+
+    Parameter path: the file to write
+    Precondition: path is a string naming a file
+    """
+    data={'created':time.strftime('%Y-%m-%dT%H:%M:%S'),'machine':platform.platform(),
+          'python':platform.python_version(),'rows':rows}
+    with open(path,'w') as file:
+        json.dump(data,file,indent=1)
+
+
+def loadBaseline(path):
+    """
+    Returns the measurements in a baseline file, as a dictionary.
+
+    The keys are tuples (asteroids, bullets, phase) and the values are the rows. Older
+    baselines named the phases 'update' and after the methods of Wave, so those names
+    are read as the names in PHASES.
+
+    Parameter path: the file to read
+    Precondition: path is a string naming a file
+    """
+    with open(path) as file:
+        data=json.load(file)
+    result={}
+    for row in data['rows']:
+        row['phase']=_RENAMED.get(row['phase'],row['phase'])
+        result[(row['asteroids'],row['bullets'],row['phase'])]=row
+    return result
@@ -0,0 +1,70 @@
+"""
+Synthetic wave module for the Planetoids benchmarks
+
+This module makes waves with any number of asteroids and bullets. The waves follow the
+same schema as the files in Data, so they can be given to Wave like any other wave.
+Everything is drawn from a seeded generator, so the same arguments always give the
+same wave.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+import random
+import math
+
+
+def makeWave(asteroids, seed=0, sizes=(1,1,1)):
+    """
+    Returns a wave dictionary with the given number of asteroids.
+
+    The asteroids are spread uniformly over the screen with uniformly random directions.
+    The ship starts in the center, facing up, as in the files in Data.
+
+    Parameter asteroids: the number of asteroids
+    Precondition: asteroids is an int >= 0
+
+    Parameter seed: the seed of the generator
+    Precondition: seed is an int
+
+    Parameter sizes: the relative weights of small, medium and large asteroids
+    Precondition: sizes is a tuple of three numbers >= 0, not all 0
+    """
+    rand=random.Random(seed)
+    items=[]
+    for size in rand.choices(ASTEROID_SIZES,weights=sizes,k=asteroids):
+        angle=rand.uniform(0,2*math.pi)
+        items.append({'size':size,
+                      'position':[rand.uniform(0,GAME_WIDTH),rand.uniform(0,GAME_HEIGHT)],
+                      'direction':[math.cos(angle)*100,math.sin(angle)*100]})
+    return {'version':1.0,'comment':'Synthetic wave with %d asteroids' % asteroids,
+            'ship':{'position':[GAME_WIDTH//2,GAME_HEIGHT//2],'angle':90},
+            'asteroids':items}
+
+
+def addBullets(wave, bullets, seed=0):
+    """
+    Fires the given number of bullets in a wave from random places on screen.
+
+    The bullets are fired by the wave itself, so they are scheduled to expire like any
+    other bullet. The ship is put back where it was afterwards.
+
+    Parameter wave: the wave to fire in
+    Precondition: wave is a Wave object with a ship
+
+    Parameter bullets: the number of bullets
+    Precondition: bullets is an int >= 0
+
+    Parameter seed: the seed of the generator
+    Precondition: seed is an int
+    """
+    rand=random.Random(seed)
+    ship=wave.getShip()
+    state=ship.getState()
+    for k in range(bullets):
+        angle=rand.uniform(0,360)
+        radians=math.pi*angle/180
+        ship.setState((rand.uniform(0,GAME_WIDTH),rand.uniform(0,GAME_HEIGHT),angle,
+                       0.0,0.0,math.cos(radians),math.sin(radians)))
+        wave._fire()
+    ship.setState(state)
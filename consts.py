@@ -19,6 +19,19 @@ GAME_WIDTH  = 800
 GAME_HEIGHT = 700
 # The offscreen dead zone for "wrapping"
 DEAD_ZONE = 48
+# The width of the wrapped world (the display plus the dead zone on both sides)
+WORLD_WIDTH  = GAME_WIDTH+2*DEAD_ZONE
+# The height of the wrapped world (the display plus the dead zone on both sides)
+WORLD_HEIGHT = GAME_HEIGHT+2*DEAD_ZONE
+# Whether the display keeps objects on the canvas between frames (see GView). This is
+# off until the retained mode has been tested under Kivy
+RETAINED_VIEW = False
+# Whether to pack the images into a texture atlas (see TextureAtlas). This is off until
+# the atlas has been tested with the Kivy texture loader
+TEXTURE_ATLAS = False
+# Whether the game2d property setters skip their checks. This is off so that development
+# runs check every precondition; a release is run with the --release flag (see __main__)
+RELEASE_MODE = False
 
 ### SHIP CONSTANTS ###
 
@@ -72,6 +85,18 @@ SMALL_RADIUS = 16
 # The speed of a small planetoid
 SMALL_SPEED  = 3
 
+# The planetoid size names, indexed by size code (small, medium, large)
+ASTEROID_SIZES  = (SMALL_ASTEROID, MEDIUM_ASTEROID, LARGE_ASTEROID)
+# The planetoid images, indexed by size code
+ASTEROID_IMAGES = (SMALL_IMAGE, MEDIUM_IMAGE, LARGE_IMAGE)
+# The planetoid radii, indexed by size code
+ASTEROID_RADII  = (SMALL_RADIUS, MEDIUM_RADIUS, LARGE_RADIUS)
+# The planetoid speeds, indexed by size code
+ASTEROID_SPEEDS = (SMALL_SPEED, MEDIUM_SPEED, LARGE_SPEED)
+# Whether to draw the asteroids of each size as one batch (see GSpriteBatch). This is
+# off until the batches have been tested under Kivy
+BATCH_ASTEROIDS = False
+
 ### BULLET CONSTANTS ###
 
 # The radius of a bullet (width/2 and height/2)
@@ -83,6 +108,82 @@ BULLET_RATE   = 10
 # The color of a bullet
 BULLET_COLOR   = 'red'
 
+# The most spent bullets kept in the pool for reuse
+BULLET_POOL_CAP = 256
+
+### INPUT CONSTANTS ###
+
+# The bit set in an input mask when the ship turns left
+INPUT_LEFT   = 1
+# The bit set in an input mask when the ship turns right
+INPUT_RIGHT  = 2
+# The bit set in an input mask when the ship applies thrust
+INPUT_THRUST = 4
+# The bit set in an input mask when the ship fires a bullet
+INPUT_FIRE   = 8
+# The bits of an input mask that control the ship
+INPUT_KEYS   = INPUT_LEFT|INPUT_RIGHT|INPUT_THRUST|INPUT_FIRE
+# The bit set in a recorded input mask while the S key is held down
+INPUT_START  = 16
+
+### REPLAY CONSTANTS ###
+
+# The first bytes of every replay file
+REPLAY_MAGIC   = b'PLRP'
+# The version of the replay file format
+REPLAY_VERSION = 1
+# The file to record the session to, or None to not record
+RECORD_FILE    = None
+# The first bytes of every wave snapshot
+SNAPSHOT_MAGIC   = b'PLSN'
+# The version of the wave snapshot format
+SNAPSHOT_VERSION = 1
+
+### PHYSICS CONSTANTS ###
+
+# The most object pairs a collision kernel tests at once (bounds its memory use)
+BLOCK_PAIRS = 1<<20
+# The most asteroids a sweep-and-prune broadphase moves before it sorts from scratch
+SWEEP_REPAIR = 256
+# The most asteroids in a wave file for which a wave uses a brute force broadphase
+# by default (for a few asteroids, it is faster than a spatial hash)
+BRUTE_FORCE_WAVE = 64
+
+### CLOCK CONSTANTS ###
+
+# The number of simulation ticks per second (the speed the game was tuned for)
+TICK_RATE = 60
+# The most ticks to simulate in one frame when catching up after a slow frame
+MAX_CATCHUP = 5
+
+### TIMING CONSTANTS ###
+
+# The number of frames kept by a phase timer (see timing.py)
+TIMING_SAMPLES = 1024
+# The CSV file to write the phase timings of each wave to (None to not time the waves)
+TIMING_FILE    = None
+# The Chrome trace file to write the frames, states and wave phases to (None for no trace)
+TRACE_FILE     = None
+# The trace track of the game states (the frames are on track 1)
+TRACE_STATES   = 2
+# The log file for frames that are too slow (None to not watch for slow frames)
+HITCH_LOG      = None
+# The time a frame may take before it is logged, in frame times
+HITCH_BUDGET   = 2.0
+
+### ENVIRONMENT CONSTANTS ###
+
+# The number of nearest asteroids in an environment observation
+ENV_NEAREST = 8
+# The most ticks in an environment episode
+ENV_TICKS = TICK_RATE*600
+# The reward for every asteroid destroyed
+REWARD_DESTROY = 1.0
+# The reward for losing a life
+REWARD_DEATH   = -10.0
+# The reward for winning the wave
+REWARD_WIN     = 10.0
+
 ### GAME CONSTANTS ###
 
 # state before the game has started
@@ -97,6 +198,9 @@ STATE_PAUSED   = 3
 STATE_CONTINUE = 4
 #: state when the game is complete (won or lost)
 STATE_COMPLETE = 5
+# The names of the states, by value (for traces)
+STATE_NAMES = ('STATE_INACTIVE', 'STATE_LOADING', 'STATE_ACTIVE', 'STATE_PAUSED',
+               'STATE_CONTINUE', 'STATE_COMPLETE')
 
 ### FONT CONSTANTS ###
 
@@ -139,4 +243,10 @@ try:
 except:
     pass # Use original value
 
+# A second argument is a file to record the session to (see replay.py)
+try:
+    RECORD_FILE = sys.argv[2]
+except:
+    pass # Do not record
+
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
@@ -0,0 +1,280 @@
+"""
+Environment module for Planetoids
+
+This module contains the class PlanetoidsEnv, a Gym-style environment around Wave for
+automated play. An agent calls reset to start an episode and then step with one action
+per tick, getting back (obs, reward, done, info).
+
+An action is an input mask (an int in 0..INPUT_KEYS, see consts.py). An observation is a
+flat float array of fixed size: the ship state followed by the ENV_NEAREST asteroids
+nearest to the ship, nearest first, measured the short way around the wrapped world
+(the same distance as the collision code in physics.py). The layout is
+
+    ship:       x, y, velocity x, velocity y, facing x, facing y, alive
+    asteroids:  offset x, offset y, velocity x, velocity y, radius, present
+
+where the offset of an asteroid is relative to the ship. Missing asteroids (when there
+are fewer than ENV_NEAREST) are all zeros. When the ship is destroyed, the observation
+keeps its last position with alive 0, and the next step restores it if there are lives
+left (the player never has to press S).
+
+The environment never imports game2d. Making an observation does not allocate arrays:
+the observation, the info dictionary and the scratch arrays for the distances and the
+nearest indices are made once and reused by every step (the distance scratch only grows
+when a wave has more asteroids than any before it). The wave itself still allocates as
+it steps. Since the observation is reused, do not keep it across steps without copying
+it.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from wave import *
+from replay import loadWave
+import numpy as np
+
+# The number of ship values in an observation
+SHIP_FEATURES = 7
+# The number of values for each asteroid in an observation
+ASTEROID_FEATURES = 6
+
+
+class PlanetoidsEnv(object):
+    """
+    A class to play Planetoids as a Gym-style environment.
+
+    The reward of a step is REWARD_DESTROY for every asteroid destroyed, plus
+    REWARD_DEATH if the ship was destroyed and REWARD_WIN if the wave was won. An
+    episode is done when the wave is won or lost, or after a maximum number of ticks.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _nearest: the number of asteroids in an observation
+    # Invariant: _nearest is an int > 0
+    #
+    # Attribute _limit: the most ticks in an episode
+    # Invariant: _limit is an int > 0
+    #
+    # Attribute _name: the wave file of the current episode
+    # Invariant: _name is a string
+    #
+    # Attribute _waves: the wave data already loaded, by file name
+    # Invariant: _waves is a dict of wave JSON dictionaries
+    #
+    # Attribute _wave: the wave of the current episode
+    # Invariant: _wave is a Wave object, or None before the first reset
+    #
+    # Attribute _ticks: the number of ticks in the current episode
+    # Invariant: _ticks is an int >= 0
+    #
+    # Attribute _destroyed: the asteroids destroyed before the last step
+    # Invariant: _destroyed is an int >= 0
+    #
+    # Attribute _obs: the observation buffer
+    # Invariant: _obs is a float array of shape (SHIP_FEATURES+ASTEROID_FEATURES*_nearest,)
+    #
+    # Attribute _ship: the ship part of _obs
+    # Invariant: _ship is a view of _obs of shape (SHIP_FEATURES,)
+    #
+    # Attribute _asteroids: the asteroid part of _obs
+    # Invariant: _asteroids is a view of _obs of shape (_nearest,ASTEROID_FEATURES)
+    #
+    # Attribute _scratch: the work space for the distances to the asteroids
+    # Invariant: _scratch is a float array of shape (4,m), where m is at least the
+    #            number of asteroids seen so far
+    #
+    # Attribute _near: the rows of the nearest asteroids, nearest first
+    # Invariant: _near is an int array of shape (_nearest,)
+    #
+    # Attribute _info: the info dictionary returned by step
+    # Invariant: _info is a dict with the keys 'lives', 'asteroids', 'destroyed', 'ticks'
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getWave(self):
+        """
+        Returns the wave of the current episode.
+
+        The wave is a Wave object, or None before the first reset.
+        """
+        return self._wave
+
+    def getActions(self):
+        """
+        Returns the number of possible actions.
+
+        The actions are the input masks 0 to INPUT_KEYS, so this is INPUT_KEYS+1.
+        """
+        return INPUT_KEYS+1
+
+    def getObservationSize(self):
+        """
+        Returns the size of an observation.
+
+        The size is an int > 0.
+        """
+        return len(self._obs)
+
+    # INITIALIZER TO CREATE A NEW ENVIRONMENT
+    def __init__(self, name=DEFAULT_WAVE, nearest=ENV_NEAREST, limit=ENV_TICKS):
+        """
+        Initializes an environment. Call reset to start the first episode.
+
+        Parameter name: the default wave file, in the Data directory
+        Precondition: name is a string
+
+        Parameter nearest: the number of asteroids in an observation
+        Precondition: nearest is an int > 0
+
+        Parameter limit: the most ticks in an episode
+        Precondition: limit is an int > 0
+        """
+        self._nearest=nearest
+        self._limit=limit
+        self._name=name
+        self._waves={}
+        self._wave=None
+        self._ticks=0
+        self._destroyed=0
+        self._obs=np.zeros(SHIP_FEATURES+ASTEROID_FEATURES*nearest)
+        self._ship=self._obs[:SHIP_FEATURES]
+        self._asteroids=self._obs[SHIP_FEATURES:].reshape(nearest,ASTEROID_FEATURES)
+        self._scratch=np.zeros((4,64))
+        self._near=np.zeros(nearest,dtype=np.intp)
+        self._info={'lives':0,'asteroids':0,'destroyed':0,'ticks':0}
+
+    # ADDITIONAL METHODS
+    def reset(self, seed=None, name=None):
+        """
+        Returns the first observation of a new episode.
+
+        Parameter seed: the seed of the wave
+        Precondition: seed is None or an int
+
+        Parameter name: the wave file (the last one used if None)
+        Precondition: name is None or a string naming a JSON file in Data
+        """
+        if name!=None:
+            self._name=name
+        if not self._name in self._waves:
+            self._waves[self._name]=loadWave(self._name)
+        data=self._waves[self._name]
+        self._wave=Wave(data, seed=seed)
+        self._ticks=0
+        self._destroyed=0
+        return self._observe()
+
+    def step(self, action):
+        """
+        Returns the tuple (obs, reward, done, info) after advancing a single tick.
+
+        Parameter action: the keys to hold down this tick
+        Precondition: action is an int mask in 0..INPUT_KEYS
+        """
+        wave=self._wave
+        if wave.getShip() is None and wave.getLives()>0:
+            wave.reset()
+        lives=wave.getLives()
+        wave.step(int(action))
+        self._ticks+=1
+        destroyed=wave.getDestroyed()
+        reward=REWARD_DESTROY*(destroyed-self._destroyed)
+        self._destroyed=destroyed
+        if wave.getLives()<lives:
+            reward+=REWARD_DEATH
+        won=wave.getAstLen()==0 and wave.getLives()>0
+        if won:
+            reward+=REWARD_WIN
+        done=won or wave.getLives()==0 or self._ticks>=self._limit
+        info=self._info
+        info['lives']=wave.getLives()
+        info['asteroids']=wave.getAstLen()
+        info['destroyed']=destroyed
+        info['ticks']=self._ticks
+        return (self._observe(), reward, done, info)
+
+    # HELPER METHODS
+    def _observe(self):
+        """
+        Returns the observation buffer after filling it with the current state.
+        """
+        ship=self._wave.getShip()
+        obs=self._ship
+        if ship!=None:
+            velocity=ship.getVelocity()
+            facing=ship.getFacing()
+            obs[0]=ship.x
+            obs[1]=ship.y
+            obs[2]=velocity.x
+            obs[3]=velocity.y
+            obs[4]=facing.x
+            obs[5]=facing.y
+            obs[6]=1.0
+        else:
+            obs[2:]=0.0
+        self._nearestAsteroids(obs[0], obs[1])
+        return self._obs
+
+    def _nearestAsteroids(self, x, y):
+        """
+        Fills the asteroid part of the observation with the asteroids nearest to (x,y).
+
+        The nearest asteroids are picked one at a time by their smallest distance, which
+        for a few of them is as fast as a partition and needs no new arrays.
+
+        Parameter x: the horizontal coordinate of the ship
+        Precondition: x is a float
+
+        Parameter y: the vertical coordinate of the ship
+        Precondition: y is a float
+        """
+        field=self._wave.getAsteroids()
+        n=len(field)
+        rows=self._asteroids
+        rows[:]=0.0
+        if n==0:
+            return
+        if self._scratch.shape[1]<n:
+            self._scratch=np.zeros((4,max(n,2*self._scratch.shape[1])))
+        (dx,dy,dist,wrap)=(row[:n] for row in self._scratch)
+        pos=field.getPositions()
+        self._offset(pos[:,0], x, WORLD_WIDTH, dx, wrap)
+        self._offset(pos[:,1], y, WORLD_HEIGHT, dy, wrap)
+        np.multiply(dx,dx,out=dist)
+        np.multiply(dy,dy,out=wrap)
+        dist+=wrap
+        k=min(n,self._nearest)
+        near=self._near[:k]
+        for j in range(k):
+            near[j]=dist.argmin()
+            dist[near[j]]=np.inf
+        np.take(dx,near,out=rows[:k,0],mode='clip')
+        np.take(dy,near,out=rows[:k,1],mode='clip')
+        np.take(field.getVelocities(),near,axis=0,out=rows[:k,2:4],mode='clip')
+        np.take(field.getRadii(),near,out=rows[:k,4],mode='clip')
+        rows[:k,5]=1.0
+
+    def _offset(self, coords, origin, period, out, work):
+        """
+        Stores in out the offsets from origin to coords, the short way around an axis.
+
+        This is wrapDelta (see physics.py) without temporary arrays.
+
+        Parameter coords: the coordinates on the axis
+        Precondition: coords is a float array
+
+        Parameter origin: the coordinate to measure from
+        Precondition: origin is a float
+
+        Parameter period: the length of the wrapped axis
+        Precondition: period is a number > 0
+
+        Parameter out: the array to store the offsets in
+        Precondition: out is a float array of the same length as coords
+
+        Parameter work: scratch space
+        Precondition: work is a float array of the same length as coords
+        """
+        np.subtract(coords,origin,out=out)
+        np.divide(out,period,out=work)
+        np.round(work,out=work)
+        work*=period
+        out-=work
@@ -7,10 +7,16 @@ simpler for students in CS 1110.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from .gobject import GObject, GScene
+from .gobject import GObject, GScene, set_release, is_release
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
 from .gsprite import GSprite
+from .gbatch import GSpriteBatch
+from .gquad import GQuad
+from .atlas import TextureAtlas
 from .gpath import GPath, GTriangle, GPolygon
 from .gview import GInput, GView
 from .sound import Sound, SoundLibrary
-from .app import GameApp
\ No newline at end of file
+from .app import GameApp
+from .telemetry import FrameStats
+from .tracing import Tracer
+from .watchdog import HitchWatchdog
\ No newline at end of file
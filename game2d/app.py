@@ -8,6 +8,7 @@ Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
 import datetime
+import time
 
 # Basic Kivy Modules
 import kivy
@@ -19,6 +20,12 @@ from kivy.clock  import Clock
 from kivy.core.window import Window
 from kivy.logger import Logger
 
+from .telemetry import FrameStats
+from .tracing import Tracer
+from .watchdog import HitchWatchdog
+from .atlas import TextureAtlas
+from .gobject import set_release
+
 import traceback
 import os.path
 import json
@@ -45,10 +52,16 @@ class GameApp(kivy.app.App):
     
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
+    
+    Every frame is timed (see the attribute ``telemetry``).  Pressing the telemetry key
+    (F3 by default) shows or hides a summary of the frame times on top of the game.
     """
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
     
+    # Class attribute for the tracer of the game (None if the game is not traced)
+    TRACER = None
+    
     
     # MUTABLE ATTRIBUTES
     @property
@@ -70,9 +83,30 @@ class GameApp(kivy.app.App):
         assert value > 0, 'value %s is not positive' % repr(value)
         Clock.unschedule(self._refresh)
         self._fps = value
+        self._telemetry.fps = value
+        if not self._watchdog is None:
+            self._watchdog.fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
     
+    @property
+    def overlay(self):
+        """
+        Whether the frame telemetry is displayed on top of the game.
+        
+        The overlay is hidden by default.  It can also be toggled by pressing the 
+        telemetry key given to the constructor (F3 by default).
+        
+        **Invariant**: Must be a bool.
+        """
+        return self._overlay
+    
+    @overlay.setter
+    def overlay(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._overlay = value
+    
+    
     # IMMUTABLE PROPERTIES
     @property
     def width(self):
@@ -116,6 +150,31 @@ class GameApp(kivy.app.App):
         """
         return self._input
     
+    @property
+    def telemetry(self):
+        """
+        The frame times of the game.
+        
+        Use this attribute to get the time spent clearing, updating and drawing each
+        frame, the jitter of the frame rate and the number of missed frames.  See the
+        class :class:`FrameStats` for more information.
+        
+        **Invariant**: Must be instance of :class:`FrameStats`
+        """
+        return self._telemetry
+    
+    @property
+    def tracer(self):
+        """
+        The tracer of the game, or None if the game is not traced.
+        
+        Use this attribute to add your own events to the trace.  See the class 
+        :class:`Tracer` for more information.
+        
+        **Invariant**: Must be instance of :class:`Tracer` or None
+        """
+        return GameApp.TRACER
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
@@ -209,6 +268,7 @@ class GameApp(kivy.app.App):
         if name in cls.TEXTURE_CACHE:
             return cls.TEXTURE_CACHE[name]
         
+        start = time.perf_counter_ns()
         try:
             from kivy.core.image import Image
             texture = Image(name).texture
@@ -216,6 +276,9 @@ class GameApp(kivy.app.App):
         except:
             texture = None
         
+        if not cls.TRACER is None:
+            cls.TRACER.complete('load_texture','io',start,time.perf_counter_ns(),
+                                args={'name':name,'loaded':not texture is None})
         return texture
     
     @classmethod
@@ -253,6 +316,7 @@ class GameApp(kivy.app.App):
             Logger.info('GameApp: No json file named %s.' % repr(name))
             return None
         
+        start = time.perf_counter_ns()
         data = None
         with open(os.path.join(cls.json,name)) as f: 
             data = f.read()
@@ -266,6 +330,10 @@ class GameApp(kivy.app.App):
                 items = traceback.format_exception(exc_type, exc_value, exc_tb)
                 Logger.info(items[-1].strip())
                 data = None
+        
+        if not cls.TRACER is None:
+            cls.TRACER.complete('load_json','io',start,time.perf_counter_ns(),
+                                args={'name':name,'loaded':not data is None})
         return data
     
     
@@ -281,6 +349,18 @@ class GameApp(kivy.app.App):
             
             GameApp(width=400,height=400)
         
+        The keyword ``telemetry_key`` sets the key that toggles the telemetry overlay 
+        ('f3' by default, or None for no key).  The keyword ``trace`` is the name of a
+        file to write a trace of the game to (see :class:`Tracer`), or None (the 
+        default) to not trace the game.  The keyword ``hitch_log`` is the name of a log 
+        file for frames that take longer than ``hitch_budget`` frame times (2 by default),
+        or None (the default) to not watch for slow frames (see :class:`HitchWatchdog`).
+        The keyword ``retained`` puts the view in retained mode (see :class:`GView`); it
+        is False by default.  The keyword ``atlas`` packs the **Images** folder into a 
+        texture atlas when the game starts (see :class:`TextureAtlas`); it is False by
+        default.  The keyword ``release`` turns off the checks in the property setters
+        of all graphics objects (see :func:`set_release`); it is False by default.
+        
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
@@ -304,6 +384,29 @@ class GameApp(kivy.app.App):
         Window.size = (self.width,self.height)
         
         self._fps = f
+        self._telemetry = FrameStats(f)
+        self._overlay = False
+        self._overlay_key = keywords.pop('telemetry_key', 'f3')
+        self._overlay_down = False
+        self._overlay_label = None
+        
+        trace = keywords.pop('trace', None)
+        assert trace is None or type(trace) == str, '%s is not a file name' % repr(trace)
+        if not trace is None:
+            GameApp.TRACER = Tracer(trace)
+        
+        self._retained = keywords.pop('retained', False)
+        assert type(self._retained) == bool, '%s is not a bool' % repr(self._retained)
+        self._atlas = keywords.pop('atlas', False)
+        assert type(self._atlas) == bool, '%s is not a bool' % repr(self._atlas)
+        release = keywords.pop('release', False)
+        assert type(release) == bool, '%s is not a bool' % repr(release)
+        set_release(release)
+        
+        log = keywords.pop('hitch_log', None)
+        factor = keywords.pop('hitch_budget', 2.0)
+        assert log is None or type(log) == str, '%s is not a file name' % repr(log)
+        self._watchdog = None if log is None else HitchWatchdog(log,f,factor)
         
         x = keywords.pop('left', None)
         y = keywords.pop('top', None)
@@ -342,6 +445,9 @@ class GameApp(kivy.app.App):
         from .gview import GInput, GView
         self._view = GView()
         self._view.size_hint = (1,1)
+        self._view.retained = self._retained
+        if self._atlas:
+            self._load_atlas()
         self._input = GInput()
         self._input._register(self._view)
         return self.view
@@ -365,6 +471,10 @@ class GameApp(kivy.app.App):
         """
         import sys
         kivy.app.App.stop(self)
+        if not GameApp.TRACER is None:
+            GameApp.TRACER.close()
+        if not self._watchdog is None:
+            self._watchdog.stop()
         sys.exit(0)
     
     def start(self):
@@ -406,6 +516,21 @@ class GameApp(kivy.app.App):
         pass
     
     
+    def diagnostics(self):
+        """
+        Returns a dictionary describing the state of the game, for problem reports.
+        
+        This method is called when a frame is too slow (see the keyword ``hitch_log``),
+        and the dictionary is written to the log with the frame.  Override it to report
+        whatever helps to explain a slow frame, such as the number of objects on screen.
+        It should be fast, and should not change the game.
+        
+        :return: The state of the game, as names and printable values
+        :rtype:  ``dict``
+        """
+        return {}
+    
+    
     # HIDDEN METHODS
     def _bootstrap(self,dt):
         """
@@ -427,12 +552,84 @@ class GameApp(kivy.app.App):
         This method a callback-proxy for the methods `update` and `draw`.  It handles
         important issues behind the scenes, particularly with clearing the window.
         
+        It also times the frame for the telemetry, draws the overlay if it is shown,
+        commits the frame to the view (see :meth:`GView.commit`), and tells the watchdog
+        (if any) when the frame starts and ends.
+        
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
+        watchdog = self._watchdog
+        if not watchdog is None:
+            watchdog.begin()
+        start = time.perf_counter_ns()
         self.view.clear()
+        cleared = time.perf_counter_ns()
         self.update(dt)
+        updated = time.perf_counter_ns()
         self.draw()
+        self._draw_overlay()
+        self.view.commit()
+        drawn = time.perf_counter_ns()
+        self._telemetry.record(dt,(cleared-start)/1e9,(updated-cleared)/1e9,
+                               (drawn-updated)/1e9)
+        
+        hitch = not watchdog is None and watchdog.end(dt,self.diagnostics)
+        tracer = GameApp.TRACER
+        if not tracer is None:
+            tracer.complete('frame','frame',start,time.perf_counter_ns(),args={'dt':dt})
+            tracer.complete('clear','frame',start,cleared)
+            tracer.complete('update','frame',cleared,updated)
+            tracer.complete('draw','frame',updated,drawn)
+            if hitch:
+                tracer.instant('hitch','frame')
+    
+    def _draw_overlay(self):
+        """
+        Toggles the telemetry overlay on a key press, and draws it if it is shown.
+        
+        The text of the overlay only changes every half second, since every change
+        renders a new texture.
+        """
+        if not self._overlay_key is None:
+            down = self.input.is_key_down(self._overlay_key)
+            if down and not self._overlay_down:
+                self._overlay = not self._overlay
+            self._overlay_down = down
+        
+        if not self._overlay:
+            return
+        
+        if self._overlay_label is None:
+            from .grectangle import GLabel
+            self._overlay_label = GLabel(text=self._telemetry.summary(),font_size=14,
+                                         linecolor='green')
+        elif self._telemetry.frames % max(1,int(self.fps/2)) == 0:
+            self._overlay_label.text = self._telemetry.summary()
+        self._overlay_label.left = 4
+        self._overlay_label.top = self.height-4
+        self._overlay_label.draw(self.view)
+    
+    def _load_atlas(self):
+        """
+        Loads the atlas of the **Images** folder into the texture cache.
+        
+        The atlas is rebuilt first if any image changed.  If it cannot be built (for
+        example, because PIL is not installed), a warning is logged and the images are
+        loaded one at a time.
+        """
+        start = time.perf_counter_ns()
+        try:
+            atlas = TextureAtlas(GameApp.images)
+            atlas.install(GameApp.TEXTURE_CACHE)
+        except Exception as e:
+            Logger.warning('GameApp: Cannot use a texture atlas, loading the images '+
+                           'one at a time (%s).' % repr(e))
+            return
+        
+        if not GameApp.TRACER is None:
+            GameApp.TRACER.complete('load_atlas','io',start,time.perf_counter_ns(),
+                                    args={'images':len(atlas.names),'rebuilt':atlas.rebuilt})
     
     def _setpaths(self):
         """
@@ -0,0 +1,259 @@
+"""
+Texture atlases for 2D game support.
+
+A texture atlas packs many images into a few large images (the pages), so that the
+objects drawn with them share a texture.  This saves a texture switch for every object,
+and lets objects with different images be drawn together.
+
+The class :class:`TextureAtlas` packs every PNG file in a folder, and caches the pages
+with an index of the regions in a subfolder (``.atlas`` by default).  The atlas is only
+rebuilt when an image is added, removed or changed.  Once it is installed, the method
+:meth:`GameApp.load_texture` returns the region of the atlas for an image instead of
+loading the file.  So :class:`GImage` and :class:`GSprite` use the atlas without any
+change; you still refer to images by their file name.  When a :class:`GameApp` is
+created with the keyword ``atlas=True``, it does all of this for you.
+
+Building an atlas requires PIL (Pillow).  Loading one only requires Kivy.  To build the
+atlas of a game ahead of time, run this module on the **Images** folder::
+
+    python -m game2d.atlas Images
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import glob
+import hashlib
+import json
+import os
+import os.path
+
+
+class TextureAtlas(object):
+    """
+    A class representing the texture atlas of a folder of images.
+
+    Creating an atlas brings the cache up to date, but does not load any textures.  Use
+    :meth:`load` to get the textures of the regions, or :meth:`install` to make
+    :meth:`GameApp.load_texture` use them.
+
+    The images are packed in rows (shelves), tallest first, with ``padding`` empty pixels
+    around each one so that filtering does not bleed between neighbours.  Images that do
+    not fit in a page are left out, and are loaded from their own files as before.  The
+    region of an image is in pixels from the bottom left of its page, which is the
+    convention of ``Texture.get_region``.
+    """
+    # The version of the index format
+    VERSION = 1
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def folder(self):
+        """
+        The folder of the images in this atlas.
+
+        **Immutable**: This value cannot be changed after the atlas is created.
+
+        **Invariant**: Must be a string naming a folder.
+        """
+        return self._folder
+
+    @property
+    def names(self):
+        """
+        The file names of the images in this atlas, in alphabetical order.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a tuple of strings.
+        """
+        return tuple(sorted(self._regions))
+
+    @property
+    def rebuilt(self):
+        """
+        Whether the cache was rebuilt when this atlas was created.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a bool.
+        """
+        return self._rebuilt
+
+
+    # BUILT-IN METHODS
+    def __init__(self,folder,cache=None,size=4096,padding=2):
+        """
+        Creates the atlas of a folder, rebuilding the cache if it is out of date.
+
+        :param folder: The folder of the images
+        :type folder:  ``str``
+
+        :param cache: The folder for the pages and index (``folder/.atlas`` if None)
+        :type cache:  ``str`` or None
+
+        :param size: The width and height of a page in pixels
+        :type size:  ``int`` > 0
+
+        :param padding: The empty pixels around each image
+        :type padding:  ``int`` >= 0
+        """
+        assert os.path.isdir(folder), '%s is not a folder' % repr(folder)
+        assert type(size) == int and size > 0, '%s is not a valid page size' % repr(size)
+        assert type(padding) == int and padding >= 0, '%s is not valid padding' % repr(padding)
+        self._folder = folder
+        self._cache = os.path.join(folder,'.atlas') if cache is None else cache
+        self._size = size
+        self._padding = padding
+        self._rebuilt = False
+
+        sources = self._sources()
+        index = self._read()
+        if (index is None or index['sources'] != sources or index['size'] != size or
+            index['padding'] != padding):
+            index = self._build(sources)
+            self._rebuilt = True
+        self._pages = [page['file'] for page in index['pages']]
+        self._regions = {}
+        for (number,page) in enumerate(index['pages']):
+            for (name,region) in page['regions'].items():
+                self._regions[name] = (number,tuple(region))
+
+    def __contains__(self,name):
+        """
+        :return: True if the image ``name`` is in this atlas.
+        :rtype:  ``bool``
+        """
+        return name in self._regions
+
+
+    # PUBLIC METHODS
+    def region(self,name):
+        """
+        Returns the page and region of an image.
+
+        :param name: The file name of the image
+        :type name:  ``str`` in this atlas
+
+        :return: The page number and the region (x, y, width, height) in pixels
+        :rtype:  ``tuple``
+        """
+        assert name in self._regions, '%s is not in the atlas' % repr(name)
+        return self._regions[name]
+
+    def load(self):
+        """
+        Loads the pages of this atlas and returns the textures of all of its images.
+
+        :return: The texture region of every image, by file name
+        :rtype:  ``dict`` of ``str`` to ``Texture``
+        """
+        from kivy.core.image import Image
+        pages = [Image(os.path.join(self._cache,page)).texture for page in self._pages]
+        textures = {}
+        for (name,(number,region)) in self._regions.items():
+            textures[name] = pages[number].get_region(*region)
+        return textures
+
+    def install(self,cache):
+        """
+        Loads this atlas into a texture cache.
+
+        The cache is usually ``GameApp.TEXTURE_CACHE``.  Every image of the atlas that
+        is not in the cache yet gets the texture of its region.
+
+        :param cache: The texture cache to add to
+        :type cache:  ``dict`` of ``str`` to ``Texture``
+        """
+        for (name,texture) in self.load().items():
+            if not name in cache:
+                cache[name] = texture
+
+
+    # HIDDEN METHODS
+    def _sources(self):
+        """
+        Returns the SHA-1 of every PNG file in the folder, by file name.
+        """
+        sources = {}
+        for path in sorted(glob.glob(os.path.join(self._folder,'*.png'))):
+            with open(path,'rb') as file:
+                sources[os.path.basename(path)] = hashlib.sha1(file.read()).hexdigest()
+        return sources
+
+    def _read(self):
+        """
+        Returns the index in the cache, or None if there is no valid index.
+        """
+        try:
+            with open(os.path.join(self._cache,'index.json')) as file:
+                index = json.load(file)
+            if index.get('version') != self.VERSION:
+                return None
+            for page in index['pages']:
+                if not os.path.exists(os.path.join(self._cache,page['file'])):
+                    return None
+            return index
+        except (OSError,ValueError,KeyError):
+            return None
+
+    def _build(self,sources):
+        """
+        Packs the images into pages, writes them to the cache and returns the index.
+
+        :param sources: The SHA-1 of every image, by file name
+        :type sources:  ``dict``
+        """
+        from PIL import Image
+        images = {}
+        for name in sources:
+            images[name] = Image.open(os.path.join(self._folder,name)).convert('RGBA')
+
+        pad = self._padding
+        order = sorted(images,key=lambda name: (-images[name].height,-images[name].width,name))
+        pages = []
+        layout = None
+        for name in order:
+            (width,height) = images[name].size
+            if width+2*pad > self._size or height+2*pad > self._size:
+                continue
+            if layout is None or layout['x']+width+2*pad > self._size:
+                y = 0 if layout is None else layout['y']+layout['shelf']
+                if layout is None or y+height+2*pad > self._size:
+                    layout = {'x':0,'y':0,'shelf':0,'places':{}}
+                    pages.append(layout)
+                else:
+                    layout.update(x=0,y=y,shelf=0)
+            layout['places'][name] = (layout['x']+pad,layout['y']+pad)
+            layout['x'] += width+2*pad
+            layout['shelf'] = max(layout['shelf'],height+2*pad)
+
+        os.makedirs(self._cache,exist_ok=True)
+        for path in glob.glob(os.path.join(self._cache,'page-*.png')):
+            os.remove(path)
+        index = {'version':self.VERSION,'size':self._size,'padding':pad,
+                 'sources':sources,'pages':[]}
+        for (number,layout) in enumerate(pages):
+            height = layout['y']+layout['shelf']
+            page = Image.new('RGBA',(self._size,height),(0,0,0,0))
+            regions = {}
+            for (name,(x,y)) in layout['places'].items():
+                image = images[name]
+                page.paste(image,(x,y))
+                # PIL measures y from the top, Kivy from the bottom
+                regions[name] = [x,height-y-image.height,image.width,image.height]
+            filename = 'page-%d.png' % number
+            page.save(os.path.join(self._cache,filename))
+            index['pages'].append({'file':filename,'regions':regions})
+
+        with open(os.path.join(self._cache,'index.json'),'w') as file:
+            json.dump(index,file,indent=1,sort_keys=True)
+        return index
+
+
+# Build the atlas of a folder from the command line
+if __name__ == '__main__':
+    import sys
+    folder = sys.argv[1] if len(sys.argv) > 1 else 'Images'
+    atlas = TextureAtlas(folder)
+    print('%s: %d images in %s (%s)' % (folder,len(atlas.names),atlas._cache,
+          'rebuilt' if atlas.rebuilt else 'up to date'))
@@ -0,0 +1,195 @@
+"""
+Batched sprites for 2D game support.
+
+A :class:`GSpriteBatch` draws many copies of the same image with a single Kivy ``Mesh``.
+Every copy is a textured quad, and the vertices of all of the quads are computed at once
+with NumPy from arrays of positions, sizes and angles.  This is much faster than a
+:class:`GImage` per copy when there are hundreds or thousands of copies on screen, since
+each ``GImage`` has its own group of seven canvas instructions.
+
+The indices of a ``Mesh`` are unsigned shorts, so a single mesh holds at most 65535
+vertices.  A batch with more copies than fit (see ``MESH_QUADS``) is split across several
+meshes.  The vertices and indices are kept in NumPy buffers that are handed to Kivy as
+they are (a ``Mesh`` takes any buffer of floats, or of unsigned shorts for the indices),
+so nothing is converted to a Python list.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+from .app import GameApp
+import numpy as np
+
+# The corners of a quad, as fractions of the width and height from its center
+_CORNERS = np.array([[-0.5,-0.5],[0.5,-0.5],[0.5,0.5],[-0.5,0.5]])
+# The two triangles of a quad, as indices of its corners
+_TRIANGLES = np.array([0,1,2,2,3,0],np.uint16)
+
+#: The most copies drawn by a single ``Mesh`` (4 vertices each, at most 65535 vertices)
+MESH_QUADS = 16383
+
+
+class GSpriteBatch(object):
+    """
+    A class representing many copies of an image, drawn with one canvas instruction.
+
+    The image is given by a file in the **Images** directory, as with :class:`GImage`.
+    The copies are set all at once with the method :meth:`update`, usually once per
+    animation frame, and drawn with the method :meth:`draw` like any :class:`GObject`.
+
+    The copies are drawn in the order given, and all copies are drawn at the same depth
+    as the batch itself.  So a batch cannot be interleaved with other objects.  Copies
+    can be scaled and rotated, but not tinted or outlined.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for the image.
+
+        **Immutable**: This value cannot be changed after the batch is created.
+
+        **Invariant**: Must be a string refering to a valid file.
+        """
+        return self._source
+
+    @property
+    def count(self):
+        """
+        The number of copies drawn.
+
+        **Immutable**: This value cannot be altered.  Use :meth:`update` instead.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._count
+
+
+    # BUILT-IN METHODS
+    def __init__(self,source):
+        """
+        Creates a new, empty batch for an image.
+
+        :param source: The image file to draw
+        :type source:  ``str``
+        """
+        assert GameApp.is_image(source), '%s is not an image file' % repr(source)
+        self._source = source
+        self._count = 0
+        self._texture = GameApp.load_texture(source)
+        # The texture coordinates of the corners (these handle flipped textures and
+        # textures that are regions of a larger one)
+        self._coords = np.array(self._texture.tex_coords,float).reshape(4,2)
+        self._vertices = np.zeros((0,4,4),np.float32)
+        self._indices = np.zeros(0,np.uint16)
+        self._meshes = []
+        self._filled = []
+        self._cache = InstructionGroup()
+        self._cache.add(Color(1,1,1,1))
+
+    def __str__(self):
+        """
+        :return: A readable string representation of this object.
+        :rtype:  ``str``
+        """
+        return '[source=%s,count=%d]' % (repr(self._source),self._count)
+
+    def __repr__(self):
+        """
+        :return: An unambiguous string representation of this object.
+        :rtype:  ``str``
+        """
+        return str(self.__class__)+str(self)
+
+
+    # PUBLIC METHODS
+    def update(self,positions,sizes,angles=None):
+        """
+        Sets the copies of the image to draw.
+
+        The arrays all have one entry per copy.  A size is either a single number (for a
+        square copy) or a pair of the width and height.
+
+        :param positions: The centers of the copies
+        :type positions:  NumPy array of shape (n,2)
+
+        :param sizes: The sizes of the copies
+        :type sizes:  number, or NumPy array of shape (n,) or (n,2)
+
+        :param angles: The angles of the copies in degrees counter-clockwise (None for 0)
+        :type angles:  NumPy array of shape (n,), or None
+        """
+        positions = np.asarray(positions,float).reshape(-1,2)
+        n = len(positions)
+        if len(self._vertices) < n:
+            self._reserve(max(n,2*len(self._vertices)))
+        sizes = np.asarray(sizes,float)
+        if sizes.ndim < 2:
+            sizes = np.stack(np.broadcast_arrays(sizes,sizes),-1)
+        corners = _CORNERS[np.newaxis,:,:]*np.broadcast_to(sizes,(n,2))[:,np.newaxis,:]
+        if not angles is None:
+            radians = np.radians(np.asarray(angles,float))[:,np.newaxis]
+            cos = np.cos(radians)
+            sin = np.sin(radians)
+            x = corners[:,:,0]*cos-corners[:,:,1]*sin
+            y = corners[:,:,0]*sin+corners[:,:,1]*cos
+            corners = np.stack((x,y),-1)
+        vertices = self._vertices[:n]
+        np.add(corners,positions[:,np.newaxis,:],out=vertices[:,:,:2])
+        self._count = n
+        self._upload()
+
+    def draw(self,view):
+        """
+        Draws the copies in the provide view.
+
+        Ideally, the view should be the one provided by :class:`GameApp`.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        view.draw(self._cache)
+
+
+    # HIDDEN METHODS
+    def _reserve(self,capacity):
+        """
+        Replaces the buffers with ones large enough for the given number of copies.
+
+        The texture coordinates of the vertices and the indices never change, so they
+        are filled in here, once per capacity.
+
+        :param capacity: The number of copies to make room for
+        :type capacity:  ``int`` > 0
+        """
+        self._vertices = np.zeros((capacity,4,4),np.float32)
+        self._vertices[:,:,2:] = self._coords
+        quads = np.arange(min(capacity,MESH_QUADS),dtype=np.uint16)[:,np.newaxis]*4
+        self._indices = (quads+_TRIANGLES).ravel()
+
+    def _upload(self):
+        """
+        Hands the vertices of the copies to the meshes, ``MESH_QUADS`` copies per mesh.
+
+        Meshes are added and removed as the number of copies changes.  Every mesh uses
+        the start of the same index buffer, and its indices are only set again when its
+        number of copies changes.
+        """
+        meshes = -(-self._count//MESH_QUADS)
+        while len(self._meshes) < meshes:
+            mesh = Mesh(mode='triangles',texture=self._texture)
+            self._meshes.append(mesh)
+            self._filled.append(0)
+            self._cache.add(mesh)
+        while len(self._meshes) > meshes:
+            self._cache.remove(self._meshes.pop())
+            self._filled.pop()
+        for (pos,mesh) in enumerate(self._meshes):
+            start = pos*MESH_QUADS
+            quads = min(self._count-start,MESH_QUADS)
+            if self._filled[pos] != quads:
+                mesh.indices = self._indices[:6*quads]
+                self._filled[pos] = quads
+            mesh.vertices = self._vertices[start:start+quads].reshape(-1)
@@ -77,6 +77,95 @@ def is_gobject_list(g):
         return False
 
 
+# The rgba values of the colors parsed in release mode, by value
+_COLORS = {}
+
+def to_rgba(c):
+    """
+    Converts a color value to a 4-element tuple of floats between 0 and 1.
+
+    This method does not check its argument.  Names and tuples are parsed only once,
+    and then looked up.  This is the conversion used by the color setters in release
+    mode.
+
+    :return: The rgba value of c, or None if c is None
+    :rtype:  ``tuple`` or None
+
+    :param c: The color value
+    :type c:  a value satisfying :func:`is_color`, or None
+    """
+    if c is None:
+        return None
+    key = c if type(c) in [str, tuple] else None
+    if not key is None and key in _COLORS:
+        return _COLORS[key]
+
+    if type(c) in [introcs.RGB, introcs.HSV]:
+        rgba = tuple(c.glColor())
+    elif type(c) == str:
+        color = introcs.RGB.CreateWebColor(c) if c[0] == '#' else introcs.RGB.CreateName(c)
+        rgba = tuple(color.glColor())
+    else:
+        rgba = tuple(float(z) for z in c)+((1.0,) if len(c) == 3 else ())
+
+    if not key is None:
+        _COLORS[key] = rgba
+    return rgba
+
+
+# Whether the property setters are on the fast path (see set_release)
+_RELEASE = False
+
+# The original (checked) properties replaced in release mode, by class and name
+_CHECKED = {}
+
+def set_release(flag):
+    """
+    Turns release mode on or off for all graphics objects.
+
+    In debug mode (the default), every property setter checks its value with an assert,
+    and the angle and color setters do extra work to normalize their values.  In
+    release mode, the setters listed in the attribute ``_FAST`` of each class are
+    replaced by the methods ``_fast_<name>`` of that class, which skip all of that.
+    The properties are swapped on the classes, so neither mode pays for a test of the
+    flag when a property is set.
+
+    Running Python with ``-O`` only removes the asserts.  Release mode also removes the
+    work around them, but it means that a bad value is not caught where it is set.
+    Debug a game in debug mode first.
+
+    :param flag: True for release mode; False for debug mode
+    :type flag:  ``bool``
+    """
+    global _RELEASE
+    _RELEASE = bool(flag)
+    classes = [GObject]
+    seen = set()
+    while classes:
+        cls = classes.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        classes.extend(cls.__subclasses__())
+        for name in cls.__dict__.get('_FAST',()):
+            if not (cls,name) in _CHECKED:
+                _CHECKED[(cls,name)] = cls.__dict__[name]
+            prop = _CHECKED[(cls,name)]
+            if _RELEASE:
+                prop = prop.setter(cls.__dict__['_fast_'+name])
+            setattr(cls,name,prop)
+
+
+def is_release():
+    """
+    Checks whether release mode is on.
+
+    :return: True if the property setters are on the fast path; False otherwise
+    :rtype:  ``bool``
+    """
+    return _RELEASE
+
+
 # #mark -
 
 class GObject(object):
@@ -90,6 +179,9 @@ class GObject(object):
     subclasses: :class:`GRectangle`, :class:`GEllipse`, :class:`GImage`, :class:`GLabel`,
     :class:`GTriangle`, :class:`GPolygon`, or :class:`GPath`.
     """
+    # The setters replaced in release mode (see :func:`set_release`)
+    _FAST = ('x','y','width','height','scale','angle','linecolor','fillcolor','name',
+             'left','right','top','bottom')
 
     # MUTABLE PROPERTIES
     @property
@@ -626,6 +718,105 @@ class GObject(object):
         except:
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
 
+    # RELEASE SETTERS
+    def _fast_x(self,value):
+        """
+        Sets the x coordinate without checks.
+        """
+        self._trans.x = value
+        self._mtrue = False
+
+    def _fast_y(self,value):
+        """
+        Sets the y coordinate without checks.
+        """
+        self._trans.y = value
+        self._mtrue = False
+
+    def _fast_width(self,value):
+        """
+        Sets the width without checks.
+        """
+        self._width = float(value)
+        if self._defined:
+            self._reset()
+
+    def _fast_height(self,value):
+        """
+        Sets the height without checks.
+        """
+        self._height = float(value)
+        if self._defined:
+            self._reset()
+
+    def _fast_scale(self,value):
+        """
+        Sets the scale without checks.
+        """
+        if type(value) in [tuple, list]:
+            self._scale.x = value[0]
+            self._scale.y = value[1]
+        else:
+            self._scale.x = value
+            self._scale.y = value
+        self._mtrue = False
+
+    def _fast_angle(self,value):
+        """
+        Sets the angle without checks, keeping the matrix if it is unchanged.
+        """
+        if value != self._rotate.angle:
+            self._rotate.angle = value
+            self._mtrue = False
+
+    def _fast_linecolor(self,value):
+        """
+        Sets the line color without checks, parsing each color value only once.
+        """
+        value = to_rgba(value)
+        self._linecolor = None if value is None else Color(*value)
+        if self._defined:
+            self._reset()
+
+    def _fast_fillcolor(self,value):
+        """
+        Sets the fill color without checks, parsing each color value only once.
+        """
+        value = to_rgba(value)
+        self._fillcolor = None if value is None else Color(*value)
+        if self._defined:
+            self._reset()
+
+    def _fast_name(self,value):
+        """
+        Sets the name without checks.
+        """
+        self._name = value
+
+    def _fast_left(self,value):
+        """
+        Sets the left edge without checks.
+        """
+        self.x += value-self.left
+
+    def _fast_right(self,value):
+        """
+        Sets the right edge without checks.
+        """
+        self.x += value-self.right
+
+    def _fast_top(self,value):
+        """
+        Sets the top edge without checks.
+        """
+        self.y += value-self.top
+
+    def _fast_bottom(self,value):
+        """
+        Sets the bottom edge without checks.
+        """
+        self.y += value-self.bottom
+
     # HIDDEN METHODS
     def _reset(self):
         """
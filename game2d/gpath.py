@@ -104,6 +104,9 @@ class GPath(GObject):
     in the path, shifting the path accordingly.
     """
     
+    # The setters replaced in release mode (see :func:`set_release`)
+    _FAST = ('linewidth',)
+    
     # MUTABLE PROPERTIES
     @property
     def points(self):
@@ -249,6 +252,15 @@ class GPath(GObject):
         return self.contains(point)
     
     
+    # RELEASE SETTERS
+    def _fast_linewidth(self,value):
+        """
+        Sets the line width without checks.
+        """
+        self._linewidth = value
+        if self._defined:
+            self._reset()
+    
     # HIDDEN METHODS
     def _reset(self):
         """
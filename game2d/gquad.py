@@ -0,0 +1,197 @@
+"""
+Lightweight sprites for 2D game support.
+
+A :class:`GQuad` is an image drawn as a single textured square.  Unlike :class:`GImage`,
+it is not a :class:`GObject`: it has no scale, no colors, no border and no transform
+matrices.  It only knows its position, angle, size and image.  In exchange, it is a
+``__slots__`` object with three canvas instructions (a group, a color and a ``Quad``)
+instead of a dictionary-backed object with eight.  So it is much smaller and faster to
+create, which matters when a game keeps hundreds or thousands of them alive.
+
+The corners of the square are computed in Python when the sprite is drawn, and only if
+it moved since the last time.  Use a :class:`GSpriteBatch` instead if all of the copies
+of an image can be drawn together.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+from .app import GameApp
+import math
+
+
+class GQuad(object):
+    """
+    A class representing a square image that can move and spin.
+
+    As with :class:`GImage`, the image is given by a file in the **Images** directory,
+    and the attributes ``x`` and ``y`` refer to the center of the square.  The image is
+    stretched to fill the square.
+
+    This class cannot be subclassed like :class:`GObject`.  It has no ``__dict__``, so a
+    subclass must declare ``__slots__`` for any attributes it adds (or it loses the
+    memory savings).  It is drawn with the method :meth:`draw` like any other object.
+    """
+    __slots__ = ('_source','_x','_y','_angle','_size','_moved','_quad','_cache')
+
+    # MUTABLE PROPERTIES
+    @property
+    def x(self):
+        """
+        The horizontal coordinate of the center.
+
+        **Invariant**: Must be an int or float.
+        """
+        return self._x
+
+    @x.setter
+    def x(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        self._x = value
+        self._moved = True
+
+    @property
+    def y(self):
+        """
+        The vertical coordinate of the center.
+
+        **Invariant**: Must be an int or float.
+        """
+        return self._y
+
+    @y.setter
+    def y(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        self._y = value
+        self._moved = True
+
+    @property
+    def angle(self):
+        """
+        The angle of rotation about the center, in degrees counter-clockwise.
+
+        **Invariant**: Must be an int or float.
+        """
+        return self._angle
+
+    @angle.setter
+    def angle(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        self._angle = value
+        self._moved = True
+
+    @property
+    def size(self):
+        """
+        The width (and height) of the square.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._size
+
+    @size.setter
+    def size(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._size = value
+        self._moved = True
+
+    @property
+    def source(self):
+        """
+        The source file for the image.
+
+        **Invariant**: Must be a string refering to a valid file.
+        """
+        return self._source
+
+    @source.setter
+    def source(self,value):
+        assert GameApp.is_image(value), '%s is not an image file' % repr(value)
+        self._source = value
+        self._quad.texture = GameApp.load_texture(value)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,source,size,x=0,y=0,angle=0):
+        """
+        Creates a new sprite.
+
+        :param source: The image file to draw
+        :type source:  ``str``
+
+        :param size: The width (and height) of the square
+        :type size:  ``int`` or ``float`` > 0
+
+        :param x: The horizontal coordinate of the center
+        :type x:  ``int`` or ``float``
+
+        :param y: The vertical coordinate of the center
+        :type y:  ``int`` or ``float``
+
+        :param angle: The angle of rotation in degrees counter-clockwise
+        :type angle:  ``int`` or ``float``
+        """
+        # The texture coordinates of a Quad follow its texture (flipped or not)
+        self._quad = Quad()
+        self._cache = InstructionGroup()
+        self._cache.add(Color(1,1,1,1))
+        self._cache.add(self._quad)
+        self.source = source
+        self.size = size
+        self.x = x
+        self.y = y
+        self.angle = angle
+
+    def __str__(self):
+        """
+        :return: A readable string representation of this object.
+        :rtype:  ``str``
+        """
+        return '[source=%s,center=(%s,%s),size=%s,angle=%s]' % \
+            (repr(self._source),repr(self._x),repr(self._y),repr(self._size),repr(self._angle))
+
+    def __repr__(self):
+        """
+        :return: An unambiguous string representation of this object.
+        :rtype:  ``str``
+        """
+        return str(self.__class__)+str(self)
+
+
+    # PUBLIC METHODS
+    def draw(self,view):
+        """
+        Draws this sprite in the provide view.
+
+        Ideally, the view should be the one provided by :class:`GameApp`.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        if self._moved:
+            self._place()
+        view.draw(self._cache)
+
+
+    # HIDDEN METHODS
+    def _place(self):
+        """
+        Moves the corners of the quad to the current position, angle and size.
+
+        The corners go counter-clockwise from the bottom left, which is the order of
+        the texture coordinates.
+        """
+        half = self._size/2.0
+        if self._angle:
+            radians = math.radians(self._angle)
+            c = math.cos(radians)*half
+            s = math.sin(radians)*half
+        else:
+            c = half
+            s = 0.0
+        x = self._x
+        y = self._y
+        self._quad.points = (x-c+s,y-s-c, x+c+s,y+s-c, x+c-s,y+s+c, x-c-s,y-s+c)
+        self._moved = False
@@ -29,6 +29,9 @@ class GRectangle(GObject):
     the border around the rectangle.  For all other properties, see the documentation
     for :class:`GObject`."""
     
+    # The setters replaced in release mode (see :func:`set_release`)
+    _FAST = ('linewidth',)
+    
     # MUTABLE PROPERTIES 
     @property
     def linewidth(self):
@@ -75,6 +78,15 @@ class GRectangle(GObject):
         self._defined = True
     
     
+    # RELEASE SETTERS
+    def _fast_linewidth(self,value):
+        """
+        Sets the line width without checks.
+        """
+        self._linewidth = value
+        if self._defined:
+            self._reset()
+    
     # HIDDEN METHODS
     def _reset(self):
         """
@@ -205,6 +217,9 @@ class GImage(GRectangle):
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
     
+    # The setters replaced in release mode (see :func:`set_release`)
+    _FAST = ('source',)
+    
     # MUTABLE PROPERTIES
     @property
     def source(self):
@@ -248,6 +263,15 @@ class GImage(GRectangle):
         self._defined = True
     
     
+    # RELEASE SETTERS
+    def _fast_source(self,value):
+        """
+        Sets the source file without checks.
+        """
+        self._source = value
+        if self._defined:
+            self._reset()
+    
     # HIDDEN METHODS
     def _reset(self):
         """
@@ -298,6 +322,9 @@ class GLabel(GRectangle):
     other fonts you will need the .ttf file for the bold version of that font.  See the
     provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
     
+    # The setters replaced in release mode (see :func:`set_release`)
+    _FAST = ('x','y','left','right','top','bottom')
+    
     # MUTABLE PROPERTIES
     @property
     def font_size(self):
@@ -626,6 +653,57 @@ class GLabel(GRectangle):
         return '%s,text=%s,center=(%s,%s),angle=%s]' \
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
+    # RELEASE SETTERS
+    def _fast_x(self,value):
+        """
+        Sets the x coordinate without checks.
+        """
+        self._trans.x = value
+        self._mtrue = False
+        self._hanchor = 'center'
+        self._ha = value
+    
+    def _fast_y(self,value):
+        """
+        Sets the y coordinate without checks.
+        """
+        self._trans.y = value
+        self._mtrue = False
+        self._vanchor = 'center'
+        self._hv = value
+    
+    def _fast_left(self,value):
+        """
+        Sets the left edge without checks.
+        """
+        self.x += value-self.left
+        self._hanchor = 'left'
+        self._ha = value
+    
+    def _fast_right(self,value):
+        """
+        Sets the right edge without checks.
+        """
+        self.x += value-self.right
+        self._hanchor = 'right'
+        self._ha = value
+    
+    def _fast_top(self,value):
+        """
+        Sets the top edge without checks.
+        """
+        self.y += value-self.top
+        self._vanchor = 'top'
+        self._hv = value
+    
+    def _fast_bottom(self,value):
+        """
+        Sets the bottom edge without checks.
+        """
+        self.y += value-self.bottom
+        self._vanchor = 'bottom'
+        self._hv = value
+    
     # HIDDEN METHODS
     def _callback(self,instance=None,value=None):
         """
@@ -35,6 +35,9 @@ class GSprite(GRectangle):
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
     
+    # The setters replaced in release mode (see :func:`set_release`)
+    _FAST = ('source','frame')
+    
     # MUTABLE PROPERTIES
     @property
     def source(self):
@@ -133,6 +136,24 @@ class GSprite(GRectangle):
         GRectangle.__init__(self,**keywords)
         self._defined = True
     
+    # RELEASE SETTERS
+    def _fast_source(self,value):
+        """
+        Sets the source file without checks.
+        """
+        self._source = value
+        if self._defined:
+            self._reset()
+    
+    def _fast_frame(self,value):
+        """
+        Sets the animation frame without checks.
+        """
+        self._frame = value
+        if self._bounds:
+            self._texture = self._images[self._frame]
+            self._bounds.texture = self._texture
+    
     # HIDDEN METHODS
     def _setFormat(self,value):
         """
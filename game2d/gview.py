@@ -323,8 +323,40 @@ class GView(FloatLayout):
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
     See the documentation of that class for more information.
+
+    The view has two drawing modes.  In immediate mode (the default), the canvas is
+    emptied at the start of every frame and every object is added back as it is drawn.
+    In retained mode, objects stay on the canvas from one frame to the next.  At the end
+    of a frame, the view compares what was drawn with what is on the canvas, and only
+    removes the objects that were not drawn and inserts the ones that are new.  Since
+    the transforms of an object are changed in place when it moves, a frame where the
+    same objects are drawn in the same order does not change the canvas at all.  Both
+    modes show exactly the same picture; you still draw every object every frame.
     """
 
+    # MUTABLE PROPERTIES
+    @property
+    def retained(self):
+        """
+        Whether this view is in retained mode.
+
+        Changing the mode empties the view.
+
+        **Invariant**: Must be a bool
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        if value != self._retained:
+            self._frame.clear()
+            self._contents.clear()
+            self._drawn = []
+            self._shown = []
+        self._retained = value
+
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -341,6 +373,9 @@ class GView(FloatLayout):
         self.bind(size=self._reset)
         self._reset()
         self._contents = set()
+        self._retained = False
+        self._drawn = []
+        self._shown = []
 
 
     # PUBLIC METHODS
@@ -355,18 +390,57 @@ class GView(FloatLayout):
         :type cmd:  A Kivy graphics command
         """
         if not cmd in self._contents:
-            self._frame.add(cmd)
             self._contents.add(cmd)
+            if self._retained:
+                self._drawn.append(cmd)
+            else:
+                self._frame.add(cmd)
 
     def clear(self):
         """
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  In retained
+        mode, the canvas is not changed until the frame is over (see :meth:`commit`).
         """
-        self._frame.clear()
         self._contents.clear()
+        if self._retained:
+            self._drawn = []
+        else:
+            self._frame.clear()
+
+    def commit(self):
+        """
+        Makes the canvas show what was drawn since the last :meth:`clear`.
+
+        This method is called for you automatically at the end of the animation frame.
+        It does nothing in immediate mode.  In retained mode, it skips the objects at the
+        start and at the end that are already on the canvas in the same order, and only
+        replaces the ones in between.  So adding or removing a single object costs one
+        insertion or removal, wherever it is.
+        """
+        if not self._retained:
+            return
+        drawn = self._drawn
+        shown = self._shown
+        if drawn == shown:
+            return
+
+        size = min(len(drawn),len(shown))
+        head = 0
+        while head < size and drawn[head] is shown[head]:
+            head += 1
+        tail = 0
+        while tail < size-head and drawn[-1-tail] is shown[-1-tail]:
+            tail += 1
+
+        for cmd in shown[head:len(shown)-tail]:
+            self._frame.remove(cmd)
+        for cmd in drawn[head:len(drawn)-tail]:
+            self._frame.insert(head,cmd)
+            head += 1
+        self._shown = drawn
 
     # HIDDEN METHODS
     def _reset(self,obj=None,value=None):
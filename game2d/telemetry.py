@@ -0,0 +1,226 @@
+"""
+Frame telemetry for 2D game support.
+
+Every :class:`GameApp` times its animation frames with an instance of :class:`FrameStats`,
+which you can reach through the attribute ``telemetry`` of the application.  The class
+does not use Kivy, so it can be used on its own as well.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import numpy as np
+
+
+class FrameStats(object):
+    """
+    A class recording the time spent in each animation frame.
+
+    A frame has three stages, which are timed separately: clearing the view, updating
+    the game and drawing it.  In addition, the class records the time ``dt`` between
+    frames, as reported by the Kivy ``Clock``.  From that it computes the jitter (how
+    far ``dt`` is from the target frame time ``1/fps``) and counts the missed deadlines
+    (the frames that arrived more than half a frame late, so at least one frame was
+    skipped on screen).
+
+    The class keeps the last ``capacity`` frames in a ring buffer, and all statistics
+    except the counts are over these frames.  The buffer is a NumPy array that is
+    written once per frame, so recording a frame is cheap enough to do all the time.
+
+    The series that can be queried are ``'clear'``, ``'update'`` and ``'draw'`` (the
+    three stages), ``'frame'`` (their sum), ``'dt'`` and ``'jitter'``.  All times are
+    reported in milliseconds.
+    """
+    # The names of the series, in the order of the columns of the buffer
+    SERIES = ('clear','update','draw','frame','dt','jitter')
+
+    # MUTABLE PROPERTIES
+    @property
+    def fps(self):
+        """
+        The target number of frames-per-second.
+
+        This determines the frame deadline.  Changing it does not clear the recorded
+        frames.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._fps
+
+    @fps.setter
+    def fps(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._fps = value
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def capacity(self):
+        """
+        The number of frames kept for the statistics.
+
+        **Immutable**: This value cannot be changed after the object is created.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return len(self._data)
+
+    @property
+    def frames(self):
+        """
+        The number of frames recorded so far.
+
+        Only the last ``capacity`` of them are used for the statistics.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._count
+
+    @property
+    def missed(self):
+        """
+        The number of missed frame deadlines so far.
+
+        A deadline is missed when ``dt`` is more than 1.5 times the target frame time.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._missed
+
+
+    # BUILT-IN METHODS
+    def __init__(self,fps=60,capacity=600):
+        """
+        Creates a new, empty frame record.
+
+        :param fps: The target number of frames-per-second
+        :type fps:  ``int`` or ``float`` > 0
+
+        :param capacity: The number of frames to keep
+        :type capacity:  ``int`` > 0
+        """
+        assert type(capacity) == int and capacity > 0, \
+            'capacity %s is not a positive int' % repr(capacity)
+        self.fps = fps
+        self._data = np.zeros((capacity,len(self.SERIES)))
+        self._next = 0
+        self._count = 0
+        self._missed = 0
+
+
+    # PUBLIC METHODS
+    def record(self,dt,clear,update,draw):
+        """
+        Records a single frame.
+
+        :param dt: time in seconds since the last frame
+        :type dt:  ``int`` or ``float``
+
+        :param clear: time in seconds spent clearing the view
+        :type clear:  ``float``
+
+        :param update: time in seconds spent updating the game
+        :type update:  ``float``
+
+        :param draw: time in seconds spent drawing the game
+        :type draw:  ``float``
+        """
+        target = 1.0/self._fps
+        if dt > 1.5*target:
+            self._missed += 1
+        row = self._data[self._next]
+        row[0] = clear*1000
+        row[1] = update*1000
+        row[2] = draw*1000
+        row[3] = (clear+update+draw)*1000
+        row[4] = dt*1000
+        row[5] = abs(dt-target)*1000
+        self._next = (self._next+1) % len(self._data)
+        self._count += 1
+
+    def reset(self):
+        """
+        Deletes all of the recorded frames and counts.
+        """
+        self._next = 0
+        self._count = 0
+        self._missed = 0
+
+    def series(self,name):
+        """
+        Returns the values of a series over the frames kept, oldest first.
+
+        :param name: The series to get
+        :type name:  one of ``SERIES``
+
+        :return: The values in milliseconds
+        :rtype:  1-dimensional NumPy array
+        """
+        assert name in self.SERIES, '%s is not a frame series' % repr(name)
+        column = self._data[:,self.SERIES.index(name)]
+        if self._count <= len(self._data):
+            return column[:self._count].copy()
+        return np.roll(column,-self._next)
+
+    def histogram(self,name='frame',bins=None):
+        """
+        Returns a histogram of a series over the frames kept.
+
+        By default, the bins are 1 millisecond wide and cover two frame deadlines, with
+        a last bin for everything beyond that.  So the histogram of ``'frame'`` shows at
+        a glance how much of the frame budget is used.
+
+        :param name: The series to count
+        :type name:  one of ``SERIES``
+
+        :param bins: The edges of the bins in milliseconds (or None for the default)
+        :type bins:  increasing sequence of numbers, or None
+
+        :return: The counts per bin and the bin edges
+        :rtype:  ``tuple`` of two NumPy arrays
+        """
+        if bins is None:
+            top = int(np.ceil(2000.0/self._fps))
+            bins = list(range(top+1))+[np.inf]
+        values = self.series(name)
+        return np.histogram(np.minimum(values,bins[-1]),bins=bins)
+
+    def percentile(self,name,level):
+        """
+        Returns a percentile of a series over the frames kept.
+
+        :param name: The series to measure
+        :type name:  one of ``SERIES``
+
+        :param level: The percentile to compute
+        :type level:  ``int`` or ``float`` in 0..100
+
+        :return: The percentile in milliseconds, or 0 if there are no frames
+        :rtype:  ``float``
+        """
+        values = self.series(name)
+        if len(values) == 0:
+            return 0.0
+        return float(np.percentile(values,level))
+
+    def summary(self):
+        """
+        Returns a one-line summary of the frames kept, for display.
+
+        The summary gives the average frame rate, the average time of each stage, the
+        95th percentile of the frame time, the average jitter and the missed deadlines.
+
+        :return: The summary
+        :rtype:  ``str``
+        """
+        n = min(self._count,len(self._data))
+        if n == 0:
+            return 'no frames'
+        means = self._data[:n].mean(axis=0)
+        rate = 1000.0/means[4] if means[4] > 0 else 0.0
+        text = '%.1f fps  clear %.2f  update %.2f  draw %.2f  p95 %.2f  jitter %.2f ms  missed %d'
+        return text % (rate,means[0],means[1],means[2],self.percentile('frame',95),
+                       means[5],self._missed)
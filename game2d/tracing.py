@@ -0,0 +1,309 @@
+"""
+Trace-event export for 2D game support.
+
+A :class:`Tracer` writes a timeline of the game to a file in the Chrome trace-event
+format, which can be opened in ``chrome://tracing`` or https://ui.perfetto.dev.  When a
+:class:`GameApp` is created with the keyword ``trace``, it traces every animation frame
+(with its clear, update and draw stages), every texture load and every JSON load.  The
+game can add its own events through the attribute ``tracer`` of the application.
+
+Events are buffered in memory as tuples, and every full buffer is handed to a
+background thread that formats and writes it.  So the game thread never waits for the
+disk, and recording an event costs about as much as appending to a list.
+
+The class does not use Kivy, so it can be used on its own as well.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+
+class Tracer(object):
+    """
+    A class writing timed events to a Chrome trace file.
+
+    All times are given as integers from ``time.perf_counter_ns``.  The file is a JSON
+    array of events that is written as the game runs, and closed by :meth:`close` (or
+    when Python exits).  The viewers accept an unclosed array, so a trace of a game that
+    crashed can still be opened.
+
+    Events are drawn on tracks, one per ``tid``.  By default everything goes on the
+    track :attr:`MAIN`.  Use another track for events that overlap those of the main
+    track without being nested in them, such as the states of a game.
+    """
+    # The track of the main thread
+    MAIN = 1
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def filename(self):
+        """
+        The file the trace is written to.
+
+        **Immutable**: This value cannot be changed after the tracer is created.
+
+        **Invariant**: Must be a nonempty string.
+        """
+        return self._filename
+
+    @property
+    def closed(self):
+        """
+        Whether this tracer has been closed.
+
+        A closed tracer ignores all new events.
+
+        **Immutable**: This value cannot be altered.  Use :meth:`close` instead.
+
+        **Invariant**: Must be a bool.
+        """
+        return self._closed
+
+
+    # BUILT-IN METHODS
+    def __init__(self,filename,buffer=4096):
+        """
+        Creates a new tracer, writing to the given file.
+
+        The file is created (or emptied) right away.
+
+        :param filename: The trace file to write
+        :type filename:  ``str``
+
+        :param buffer: The number of events to collect before each write
+        :type buffer:  ``int`` > 0
+        """
+        assert type(filename) == str and filename != '', \
+            '%s is not a valid file name' % repr(filename)
+        assert type(buffer) == int and buffer > 0, '%s is not a valid buffer' % repr(buffer)
+        self._filename = filename
+        self._buffer = buffer
+        self._events = []
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._closed = False
+        self._file = open(filename,'w')
+        self._file.write('[\n')
+        self._first = True
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write,name='Tracer',daemon=True)
+        self._thread.start()
+        self.name_track(self.MAIN,'main')
+        atexit.register(self.close)
+
+
+    # PUBLIC METHODS
+    def complete(self,name,cat,start,end,tid=MAIN,args=None):
+        """
+        Records an event that ran from start to end.
+
+        :param name: The name of the event
+        :type name:  ``str``
+
+        :param cat: The category of the event (for filtering in the viewer)
+        :type cat:  ``str``
+
+        :param start: The start time of the event
+        :type start:  ``int`` from ``time.perf_counter_ns``
+
+        :param end: The end time of the event
+        :type end:  ``int`` >= start
+
+        :param tid: The track of the event
+        :type tid:  ``int``
+
+        :param args: The extra information to show with the event
+        :type args:  ``dict`` of JSON values, or None
+        """
+        if self._closed:
+            return
+        self._events.append(('X',name,cat,start,end-start,tid,args))
+        if len(self._events) >= self._buffer:
+            self.flush()
+
+    def instant(self,name,cat,tid=MAIN,args=None):
+        """
+        Records an event that happens now.
+
+        :param name: The name of the event
+        :type name:  ``str``
+
+        :param cat: The category of the event (for filtering in the viewer)
+        :type cat:  ``str``
+
+        :param tid: The track of the event
+        :type tid:  ``int``
+
+        :param args: The extra information to show with the event
+        :type args:  ``dict`` of JSON values, or None
+        """
+        if self._closed:
+            return
+        self._events.append(('i',name,cat,time.perf_counter_ns(),0,tid,args))
+        if len(self._events) >= self._buffer:
+            self.flush()
+
+    def counter(self,name,values):
+        """
+        Records the current values of a counter, drawn as a graph by the viewer.
+
+        :param name: The name of the counter
+        :type name:  ``str``
+
+        :param values: The values of the counter, by series
+        :type values:  ``dict`` of ``int`` or ``float``
+        """
+        if self._closed:
+            return
+        self._events.append(('C',name,'counter',time.perf_counter_ns(),0,self.MAIN,values))
+        if len(self._events) >= self._buffer:
+            self.flush()
+
+    def span(self,name,cat,tid=MAIN,args=None):
+        """
+        Returns a context manager that records the time spent in its block.
+
+        For example::
+
+            with tracer.span('load level','io'):
+                ...
+
+        :param name: The name of the event
+        :type name:  ``str``
+
+        :param cat: The category of the event (for filtering in the viewer)
+        :type cat:  ``str``
+
+        :param tid: The track of the event
+        :type tid:  ``int``
+
+        :param args: The extra information to show with the event
+        :type args:  ``dict`` of JSON values, or None
+        """
+        return _Span(self,name,cat,tid,args)
+
+    def name_track(self,tid,name):
+        """
+        Sets the name shown by the viewer for a track.
+
+        :param tid: The track to name
+        :type tid:  ``int``
+
+        :param name: The name of the track
+        :type name:  ``str``
+        """
+        if self._closed:
+            return
+        self._events.append(('M','thread_name','',self._origin,0,tid,{'name':name}))
+
+    def flush(self):
+        """
+        Hands the buffered events to the writer thread.
+
+        This method does not wait for the events to be written.
+        """
+        if self._events and not self._closed:
+            self._queue.put(self._events)
+            self._events = []
+
+    def close(self):
+        """
+        Writes all of the buffered events and closes the trace file.
+
+        This method waits for the writer thread to finish.  It is safe to call it more
+        than once.
+        """
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.write('\n]\n')
+        self._file.close()
+
+
+    # HIDDEN METHODS
+    def _write(self):
+        """
+        Writes the batches of events in the queue until it gets None.
+
+        This method is the body of the writer thread.
+        """
+        while True:
+            events = self._queue.get()
+            if events is None:
+                return
+            lines = []
+            for (ph,name,cat,start,duration,tid,args) in events:
+                event = {'name':name,'cat':cat,'ph':ph,'ts':(start-self._origin)/1000.0,
+                         'pid':self._pid,'tid':tid}
+                if ph == 'X':
+                    event['dur'] = duration/1000.0
+                elif ph == 'i':
+                    event['s'] = 't'
+                if not args is None:
+                    event['args'] = args
+                lines.append(json.dumps(event))
+            if self._first:
+                self._first = False
+            else:
+                self._file.write(',\n')
+            self._file.write(',\n'.join(lines))
+            self._file.flush()
+
+
+# #mark -
+class _Span(object):
+    """
+    A context manager recording the time spent in a block as an event.
+
+    You should never construct an object of this class.  Use :meth:`Tracer.span` instead.
+    """
+
+    def __init__(self,tracer,name,cat,tid,args):
+        """
+        Creates a new span for the given tracer.
+
+        :param tracer: The tracer to record the event with
+        :type tracer:  :class:`Tracer`
+
+        :param name: The name of the event
+        :type name:  ``str``
+
+        :param cat: The category of the event
+        :type cat:  ``str``
+
+        :param tid: The track of the event
+        :type tid:  ``int``
+
+        :param args: The extra information to show with the event
+        :type args:  ``dict`` of JSON values, or None
+        """
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._tid = tid
+        self._args = args
+        self._start = 0
+
+    def __enter__(self):
+        """
+        Starts the timer of the span.
+        """
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        """
+        Records the event of the span.
+        """
+        self._tracer.complete(self._name,self._cat,self._start,time.perf_counter_ns(),
+                              self._tid,self._args)
+        return False
@@ -0,0 +1,268 @@
+"""
+Frame-hitch detection for 2D game support.
+
+A :class:`HitchWatchdog` watches the animation frames of a :class:`GameApp` from a
+background thread.  Whenever a frame runs longer than its budget, the watchdog writes
+an incident to a rotating log: how long the frame took, the state of the game (as given
+by :meth:`GameApp.diagnostics`) and the Python stacks of the main thread that it sampled
+while the frame was running.  When a :class:`GameApp` is created with the keyword
+``hitch_log``, it runs a watchdog for you.
+
+The watchdog only samples a frame once it has used half of its budget, so frames that
+are on time cost two clock reads and nothing else.  An incident is written by the
+background thread as well, so a slow frame does not also pay for the log file.  The class does not use Kivy, so it
+can be used on its own as well.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+import traceback
+
+
+class HitchWatchdog(object):
+    """
+    A class that records the stack of the main thread during slow frames.
+
+    The main thread calls :meth:`begin` at the start of every frame and :meth:`end` at
+    the end.  In between, a daemon thread wakes up every ``interval`` of the budget.  If
+    the frame has run for more than half of the budget, it samples the stack of the main
+    thread.  If the frame ends over budget, the samples are handed back to the daemon
+    thread, which groups them by stack and writes them to the log, most common first.
+    Otherwise they are thrown away.  The main thread never waits on the log file.
+
+    The log is a ``RotatingFileHandler``, so it never grows beyond ``backups+1`` files
+    of ``size`` bytes each.
+    """
+    # The number of distinct stacks written for each incident
+    STACKS = 3
+
+    # MUTABLE PROPERTIES
+    @property
+    def fps(self):
+        """
+        The target number of frames-per-second.
+
+        The budget of a frame is ``factor/fps`` seconds.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._fps
+
+    @fps.setter
+    def fps(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._fps = value
+        self._budget = self._factor/value
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def budget(self):
+        """
+        The time in seconds a frame may take before it is a hitch.
+
+        **Immutable**: This value cannot be altered.  Change ``fps`` instead.
+
+        **Invariant**: Must be a float > 0.
+        """
+        return self._budget
+
+    @property
+    def incidents(self):
+        """
+        The number of hitches recorded so far.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._incidents
+
+
+    # BUILT-IN METHODS
+    def __init__(self,filename,fps=60,factor=2.0,interval=0.125,size=1<<20,backups=3):
+        """
+        Creates a new watchdog for the calling thread, and starts it.
+
+        The calling thread is the one whose frames are watched, so create the watchdog
+        on the main thread.
+
+        :param filename: The log file to write the incidents to
+        :type filename:  ``str``
+
+        :param fps: The target number of frames-per-second
+        :type fps:  ``int`` or ``float`` > 0
+
+        :param factor: The budget of a frame, in frame times
+        :type factor:  ``int`` or ``float`` > 0
+
+        :param interval: The time between samples, as a fraction of the budget
+        :type interval:  ``float`` in 0..1
+
+        :param size: The most bytes in a log file before it is rotated
+        :type size:  ``int`` > 0
+
+        :param backups: The number of old log files to keep
+        :type backups:  ``int`` >= 0
+        """
+        assert type(factor) in [int,float] and factor > 0, \
+            'factor %s is not a positive number' % repr(factor)
+        assert type(interval) == float and 0 < interval < 1, \
+            'interval %s is not a fraction' % repr(interval)
+        self._factor = factor
+        self.fps = fps
+        self._interval = interval
+        self._ident = threading.get_ident()
+        self._frame = 0
+        self._start = None
+        self._samples = []
+        self._pending = queue.SimpleQueue()
+        self._incidents = 0
+        self._stopped = False
+
+        self._log = logging.getLogger('game2d.hitch.%d' % id(self))
+        self._log.setLevel(logging.INFO)
+        self._log.propagate = False
+        self._handler = logging.handlers.RotatingFileHandler(filename,maxBytes=size,
+                                                             backupCount=backups)
+        self._handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        self._log.addHandler(self._handler)
+
+        self._thread = threading.Thread(target=self._sample,name='HitchWatchdog',
+                                        daemon=True)
+        self._thread.start()
+
+
+    # PUBLIC METHODS
+    def begin(self):
+        """
+        Marks the start of a frame.
+
+        This method must be called on the watched thread.
+        """
+        self._frame += 1
+        self._start = time.perf_counter()
+
+    def end(self,dt=0,state=None):
+        """
+        Marks the end of a frame, and logs it if it was over budget.
+
+        The game state is only asked for when there is an incident.  The incident is
+        written to the log later, by the watchdog thread.
+
+        :param dt: time in seconds since the last frame (for the log)
+        :type dt:  ``int`` or ``float``
+
+        :param state: A function returning the state of the game
+        :type state:  callable returning a ``dict``, or None
+
+        :return: True if the frame was over budget; False otherwise
+        :rtype:  ``bool``
+        """
+        elapsed = time.perf_counter()-self._start
+        self._start = None
+        samples = self._samples
+        if samples:
+            self._samples = []
+        if elapsed <= self._budget:
+            return False
+
+        self._incidents += 1
+        try:
+            info = state() if not state is None else {}
+        except Exception as e:
+            info = {'error':repr(e)}
+        self._pending.put((self._frame,elapsed,dt,info,samples))
+        return True
+
+    def stop(self):
+        """
+        Stops the watchdog thread, writes any incidents left, and closes the log.
+
+        It is safe to call this method more than once.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        self._thread.join()
+        self._flush()
+        self._log.removeHandler(self._handler)
+        self._handler.close()
+
+
+    # HIDDEN METHODS
+    def _sample(self):
+        """
+        Samples the stack of the watched thread during slow frames until stopped.
+
+        Between samples, it writes the incidents handed over by :meth:`end`.  This
+        method is the body of the watchdog thread.
+        """
+        while not self._stopped:
+            time.sleep(self._budget*self._interval)
+            self._flush()
+            start = self._start
+            frame = self._frame
+            if start is None or time.perf_counter()-start < self._budget/2:
+                continue
+            current = sys._current_frames().get(self._ident)
+            if current is None:
+                continue
+            stack = tuple((entry.filename,entry.lineno,entry.name)
+                          for entry in traceback.extract_stack(current))
+            self._samples.append((frame,stack))
+
+    def _flush(self):
+        """
+        Writes every incident handed over by :meth:`end` to the log.
+        """
+        while True:
+            try:
+                incident = self._pending.get_nowait()
+            except queue.Empty:
+                return
+            self._report(*incident)
+
+    def _report(self,frame,elapsed,dt,info,samples):
+        """
+        Writes an incident to the log.
+
+        Only the samples taken during the given frame are counted.
+
+        :param frame: The number of the frame
+        :type frame:  ``int``
+
+        :param elapsed: The time the frame took, in seconds
+        :type elapsed:  ``float``
+
+        :param dt: The time since the previous frame, in seconds
+        :type dt:  ``int`` or ``float``
+
+        :param info: The state of the game
+        :type info:  ``dict``
+
+        :param samples: The stack samples, as pairs (frame, stack)
+        :type samples:  ``list`` of ``tuple``
+        """
+        stacks = {}
+        for (number,stack) in samples:
+            if number == frame:
+                stacks[stack] = stacks.get(stack,0)+1
+        lines = ['Hitch in frame %d: %.1f ms (budget %.1f ms, dt %.1f ms)' %
+                 (frame,elapsed*1000,self._budget*1000,dt*1000)]
+        lines.append('  state: '+', '.join('%s=%s' % item for item in info.items()))
+        total = sum(stacks.values())
+        if total == 0:
+            lines.append('  no stack samples (the frame was too short to sample)')
+        ranked = sorted(stacks.items(),key=lambda item: -item[1])
+        for (stack,count) in ranked[:self.STACKS]:
+            lines.append('  %d of %d samples:' % (count,total))
+            for (filename,lineno,name) in stack:
+                lines.append('    File "%s", line %d, in %s' % (filename,lineno,name))
+        self._log.info('\n'.join(lines))
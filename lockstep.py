@@ -0,0 +1,146 @@
+"""
+Lockstep check module for Planetoids
+
+This module checks that BatchedWave (see batched.py) plays by exactly the same rules as
+Wave. It builds one BatchedWave over many worlds, cycling through the wave files in Data,
+and one Wave for each world. It then gives every world and its Wave the same random input
+on every tick, restoring the ship as soon as it is destroyed, and compares them after
+each tick: the lives, whether the ship is alive, its position, the number of bullets, and
+the asteroids in draw order.
+
+A world that diverges is reported once (with the tick it diverged on) and then ignored.
+To run the default check of 40 worlds for 3000 ticks, type
+
+    python lockstep.py
+
+Type python lockstep.py --help for all of the options. The exit status is 1 if any
+world diverged.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from wave import *
+from batched import BatchedWave
+import numpy as np
+import argparse
+import glob
+import json
+import os
+import sys
+
+# The largest difference between two positions that are taken to be the same
+LOCKSTEP_TOLERANCE = 1e-6
+
+
+def matches(wave, batch, world):
+    """
+    Returns True if a wave is in the same state as a world of a batch.
+
+    Parameter wave: the wave to compare
+    Precondition: wave is a Wave object
+
+    Parameter batch: the batch to compare
+    Precondition: batch is a BatchedWave object
+
+    Parameter world: the world of the batch to compare
+    Precondition: world is an int in 0..batch.getWorlds()-1
+    """
+    ship=wave.getShip()
+    if wave.getLives()!=batch.getLives()[world] or (ship!=None)!=batch.getAlive()[world]:
+        return False
+    if ship!=None:
+        if not np.allclose((ship.x,ship.y),batch.getShipPositions()[world],
+                           rtol=0,atol=LOCKSTEP_TOLERANCE):
+            return False
+    if len(wave.getBullets())!=batch.getBulletMask()[world].sum():
+        return False
+    if wave.getAstLen()!=batch.getAstLen()[world]:
+        return False
+    mask=batch.getAsteroidMask()[world]
+    order=np.argsort(batch.getAsteroidKeys()[world][mask],kind='stable')
+    positions=batch.getAsteroidPositions()[world][mask][order]
+    return np.allclose(positions,wave.getAsteroids().getPositions(),
+                       rtol=0,atol=LOCKSTEP_TOLERANCE)
+
+
+def check(waves, worlds, ticks, seed=0, log=None):
+    """
+    Returns the worlds that diverged, as a dictionary from world to tick.
+
+    World k starts from waves[k % len(waves)]. The input of each world is drawn from a
+    generator with the given seed, and holds down the fire key most of the time.
+
+    Parameter waves: the wave data to cycle through
+    Precondition: waves is a nonempty list of wave JSON dictionaries
+
+    Parameter worlds: the number of worlds
+    Precondition: worlds is an int > 0
+
+    Parameter ticks: the number of ticks to run
+    Precondition: ticks is an int > 0
+
+    Parameter seed: the seed of the inputs (and of every Wave)
+    Precondition: seed is an int
+
+    Parameter log: a function to call with each world that diverges, and its tick
+    Precondition: log is None or a function of two arguments (world, tick)
+    """
+    data=[waves[k%len(waves)] for k in range(worlds)]
+    batch=BatchedWave(data)
+    single=[Wave(wave,seed=seed) for wave in data]
+    inputs=np.random.default_rng(seed)
+    diverged={}
+    for tick in range(ticks):
+        actions=inputs.integers(0,INPUT_KEYS+1,worlds)
+        actions|=INPUT_FIRE*(inputs.random(worlds)<0.7)
+        for (k,wave) in enumerate(single):
+            if wave.getShip() is None and wave.getLives()>0:
+                wave.reset()
+            wave.step(int(actions[k]))
+        batch.reset()
+        batch.step(actions)
+        for (k,wave) in enumerate(single):
+            if not k in diverged and not matches(wave,batch,k):
+                diverged[k]=tick
+                if log!=None:
+                    log(k,tick)
+    return diverged
+
+
+def main(args=None):
+    """
+    Runs the check given on the command line and prints a report.
+
+    Parameter args: the command line arguments (sys.argv if None)
+    Precondition: args is None or a list of strings
+    """
+    parser=argparse.ArgumentParser(description='Compare BatchedWave against Wave.')
+    parser.add_argument('--waves',nargs='+',default=None,
+                        help='the wave files (default: every JSON file in Data)')
+    parser.add_argument('--worlds',type=int,default=40,help='the number of worlds')
+    parser.add_argument('--ticks',type=int,default=3000,help='the number of ticks')
+    parser.add_argument('--seed',type=int,default=0,help='the seed of the inputs')
+    options=parser.parse_args(args)
+    paths=options.waves
+    if paths is None:
+        folder=os.path.join(os.path.dirname(os.path.abspath(__file__)),'Data')
+        paths=sorted(glob.glob(os.path.join(folder,'*.json')))
+    waves=[]
+    for path in paths:
+        with open(path) as file:
+            waves.append(json.load(file))
+
+    def log(world, tick):
+        print('world %d (%s) diverged at tick %d' % (world,
+              os.path.basename(paths[world%len(paths)]),tick))
+
+    diverged=check(waves,options.worlds,options.ticks,options.seed,log)
+    print('%d of %d worlds diverged in %d ticks' % (len(diverged),options.worlds,
+          options.ticks))
+    return 1 if diverged else 0
+
+
+# Application code
+if __name__ == '__main__':
+    sys.exit(main())
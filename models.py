@@ -4,11 +4,15 @@ Models module for Planetoids
 This module contains the model classes for the Planetoids game. Anything that you
 interact with on the screen is model: the ship, the bullets, and the planetoids.
 
-We need models for these objects because they contain information beyond the simple
-shapes like GImage and GEllipse. In particular, ALL of these classes need a velocity
-representing their movement direction and speed (and hence they all need an additional
-attribute representing this fact). But for the most part, that is all they need. You
-will only need more complex models if you are adding advanced features like scoring.
+The models are plain data objects. They hold the position, velocity and size of each
+object, but they do not draw themselves and they never import game2d (and hence Kivy).
+That way a Wave can be simulated without a window. The drawables that mirror these
+models on screen are the view adapters in views.py.
+
+There can be tens of thousands of planetoids, so they are not individual objects. The
+class AsteroidField stores all of them in contiguous NumPy arrays instead. Bullets come
+and go many times a second, so spent bullets are recycled through a Pool rather than
+left to the garbage collector.
 
 You are free to add even more models to this module. You may wish to do this when you
 add new features to your game, such as power-ups. If you are unsure about whether to
@@ -18,8 +22,8 @@ make a new class or not, please ask on Ed Discussions.
 # 08-Dec-2022
 """
 from consts import *
-from game2d import *
 from introcs import *
+import numpy as np
 import math
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other than
@@ -40,30 +44,82 @@ def degToRad(deg):
 # END REMOVE
 
 
-class Bullet(GEllipse):
+def _leaveTick(p, v, length):
+    """
+    Returns the first number of moves k >= 1 after which a bullet is off screen on an axis
+
+    The bullet is off screen if p+k*v is more than BULLET_RADIUS outside [0,length].
+    The result is math.inf if that never happens.
+
+    Parameter p: the coordinate of the bullet on the axis
+    Precondition: p is a float
+
+    Parameter v: the velocity of the bullet on the axis
+    Precondition: v is a float
+
+    Parameter length: the length of the screen on the axis
+    Precondition: length is a number > 0
+    """
+    low=-BULLET_RADIUS
+    high=length+BULLET_RADIUS
+    if v==0:
+        return 1 if p<low or p>high else math.inf
+    first=(low-p)/v
+    last=(high-p)/v
+    if v<0:
+        (first,last)=(last,first)
+    if first>1 or last<1:
+        return 1
+    return math.floor(last)+1
+
+
+def sizeCode(size):
+    """
+    Returns the size code (the index in ASTEROID_SIZES) for the given size name
+
+    Any name other than SMALL_ASTEROID or MEDIUM_ASTEROID is a large planetoid.
+
+    Parameter size: the size name of the planetoid
+    Precondition: size is a string
+    """
+    if size==SMALL_ASTEROID:
+        return 0
+    elif size==MEDIUM_ASTEROID:
+        return 1
+    return 2
+
+
+class Bullet(object):
     """
     A class representing a bullet from the ship
     
-    Bullets are typically just white circles (ellipses). The size of the bullet is 
-    determined by constants in consts.py. However, we MUST subclass GEllipse, because 
-    we need to add an extra attribute for the velocity of the bullet.
-    
-    The class Wave will need to look at this velocity, so you will need getters for
-    the velocity components. However, it is possible to write this assignment with no 
-    setters for the velocities. That is because the velocity is fixed and cannot change 
-    once the bolt is fired.
+    Bullets are typically just red circles. The size of the bullet is determined by 
+    constants in consts.py. A bullet is a plain data object: it only stores the position
+    and the velocity of the bullet. It is drawn by a BulletView (in views.py).
     
-    In addition to the getters, you need to write the __init__ method to set the starting
-    velocity. This __init__ method will need to call the __init__ from GEllipse as a
-    helper. This init will need a parameter to set the direction of the velocity.
+    The class Wave will need to look at this velocity, so there is a getter for it.  
+    However, there are no setters for the velocity. That is because the velocity is 
+    fixed and cannot change once the bolt is fired.
     
-    You also want to create a method to update the bolt. You update the bolt by adding
-    the velocity to the position. While it is okay to add a method to detect collisions
-    in this class, you may find it easier to process collisions in wave.py.
+    You update the bolt by adding the velocity to the position. While it is okay to add 
+    a method to detect collisions in this class, you may find it easier to process 
+    collisions in wave.py.
     """
     # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute x: the horizontal coordinate of the bullet center
+    # Invariant: x is a float
+    #
+    # Attribute y: the vertical coordinate of the bullet center
+    # Invariant: y is a float
+    #
     # Attribute _velocity: the velocity vector of the Bullet object
     # Invariant: _velocity is a Vector2 object
+    #
+    # Attribute _last: the position of the bullet before the last move
+    # Invariant: _last is a tuple of two floats
+    #
+    # Attribute _expiry: the tick on which the bullet is due to leave the screen
+    # Invariant: _expiry is an int, or None if the bullet is not in play
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     def getVelocity(self):
@@ -73,6 +129,57 @@ class Bullet(GEllipse):
         The velocity is a Vector2 object.
         """
         return self._velocity
+
+    def getLast(self):
+        """
+        Returns the position of a Bullet object before its last move.
+
+        The position is a tuple of two floats. Together with the current position it
+        is the path that the bullet swept in the last step.
+        """
+        return self._last
+
+    def getExpiry(self):
+        """
+        Returns the tick on which this bullet is due to leave the screen.
+
+        The expiry is an int, or None if the bullet is not in play.
+        """
+        return self._expiry
+
+    def setExpiry(self, value):
+        """
+        Sets the tick on which this bullet is due to leave the screen.
+
+        Parameter value: the new expiry
+        Precondition: value is an int, or None if the bullet is not in play
+        """
+        self._expiry=value
+
+    def getState(self):
+        """
+        Returns the complete state of this bullet as a tuple of seven floats.
+
+        The tuple is (x, y, last x, last y, velocity x, velocity y, expiry), where the
+        expiry is -1 if it is None. It can be given to setState to restore the bullet.
+        """
+        expiry=-1 if self._expiry is None else self._expiry
+        return (self.x,self.y,self._last[0],self._last[1],self._velocity.x,
+                self._velocity.y,float(expiry))
+
+    def setState(self, state):
+        """
+        Restores the complete state of this bullet.
+
+        Parameter state: the state of a bullet
+        Precondition: state is a sequence of seven numbers, as returned by getState
+        """
+        self.x=float(state[0])
+        self.y=float(state[1])
+        self._last=(float(state[2]),float(state[3]))
+        self._velocity.x=float(state[4])
+        self._velocity.y=float(state[5])
+        self._expiry=None if state[6]<0 else int(state[6])
     
     # INITIALIZER TO SET THE POSITION AND VELOCITY
     def __init__(self, facing, pos):
@@ -85,22 +192,51 @@ class Bullet(GEllipse):
         Parameter pos: the position of the ship
         Precondition: pos is a tuple with the x and y attribute of the ship
         """
-        tip_x=(facing.x*SHIP_RADIUS)+pos[0]
-        tip_y=(facing.y*SHIP_RADIUS)+pos[1]
-        super().__init__(x=tip_x, y=tip_y)
-        self.fillcolor=BULLET_COLOR
-        self.width=BULLET_RADIUS*2
-        self.height=BULLET_RADIUS*2
-        self._velocity=introcs.Vector2(facing.x*BULLET_SPEED,facing.y*BULLET_SPEED)
+        self._velocity=introcs.Vector2(0.0,0.0)
+        self.reset(facing, pos)
 
     # ADDITIONAL METHODS (MOVEMENT, COLLISIONS, ETC)
-    def move(self):
+    def reset(self, facing, pos):
+        """
+        Fires this bullet again from the given ship position, as if it were new.
+
+        This lets a Pool recycle a spent bullet without allocating a new one.
+
+        Parameter facing: the facing attribute of the ship
+        Precondition: facing is a Vector2 object
+
+        Parameter pos: the position of the ship
+        Precondition: pos is a tuple with the x and y attribute of the ship
+        """
+        self.x=float((facing.x*SHIP_RADIUS)+pos[0])
+        self.y=float((facing.y*SHIP_RADIUS)+pos[1])
+        self._velocity.x=facing.x*BULLET_SPEED
+        self._velocity.y=facing.y*BULLET_SPEED
+        self._last=(self.x,self.y)
+        self._expiry=None
+
+    def move(self, scale=1):
         """
         Modifies the x and y attributes of the bullet based on its velocity.
+
+        Parameter scale: the number of ticks to move
+        Precondition: scale is an int >= 1
         """
-        self.x+=self._velocity.x
-        self.y+=self._velocity.y
+        self._last=(self.x,self.y)
+        self.x+=self._velocity.x*scale
+        self.y+=self._velocity.y*scale
     
+    def getLife(self):
+        """
+        Returns the number of moves until isDelete first becomes True.
+
+        A bullet flies in a straight line at a fixed velocity, so this is known as soon
+        as the bullet is fired. The value is an int >= 1, or math.inf if the bullet 
+        never leaves (it has no velocity and is on screen).
+        """
+        return min(_leaveTick(self.x,self._velocity.x,GAME_WIDTH),
+                   _leaveTick(self.y,self._velocity.y,GAME_HEIGHT))
+
     def isDelete(self):
         """
         Returns True if the bullet has passed the boundaries of the game.
@@ -113,34 +249,44 @@ class Bullet(GEllipse):
         return False
 
 
-class Ship(GImage):
+class Ship(object):
     """
     A class to represent the game ship.
     
-    This ship is represented by an image. The size of the ship is determined by constants 
-    in consts.py. However, we MUST subclass GEllipse, because we need to add an extra 
-    attribute for the velocity of the ship, as well as the facing vecotr (not the same)
-    thing.
-    
-    The class Wave will need to access these two values, so you will need getters for 
-    them. But per the instructions,these values are changed indirectly by applying thrust 
-    or turning the ship. That means you won't want setters for these attributes, but you 
-    will want methods to apply thrust or turn the ship.
+    The size of the ship is determined by constants in consts.py. A ship is a plain data 
+    object: it stores the position, the angle, the velocity and the facing vector (not 
+    the same thing) of the ship. It is drawn by a ShipView (in views.py).
     
-    This class needs an __init__ method to set the position and initial facing angle.
-    This information is provided by the wave JSON file. Ships should start with a shield
-    enabled.
+    The class Wave will need to access the velocity and facing, so there are getters for 
+    them. But per the instructions, these values are changed indirectly by applying 
+    thrust or turning the ship. That means there are no setters for these attributes, 
+    but there are methods to apply thrust or turn the ship.
     
-    Finally, you want a method to update the ship. When you update the ship, you apply
-    the velocity to the position. While it is okay to add a method to detect collisions 
-    in this class, you may find it easier to process collisions in wave.py.
+    When you update the ship, you apply the velocity to the position. While it is okay 
+    to add a method to detect collisions in this class, you may find it easier to process 
+    collisions in wave.py.
     """
     # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute x: the horizontal coordinate of the ship center
+    # Invariant: x is a float
+    #
+    # Attribute y: the vertical coordinate of the ship center
+    # Invariant: y is a float
+    #
+    # Attribute angle: the angle of the ship in degrees (counter-clockwise)
+    # Invariant: angle is a float
+    #
     # Attribute _velocity: the velocity vector of the Ship object
     # Invariant: _velocity is a Vector2 object
     #
     # Attribute _facing: the facing vector of the Ship object
     # Invariant: _facing is a Vector2 object
+    #
+    # Attribute _turning: the degrees the ship has turned since it last moved
+    # Invariant: _turning is a float
+    #
+    # Attribute _spin: the degrees the ship turned during its last tick (for drawing)
+    # Invariant: _spin is a float
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     def getVelocity(self):
@@ -158,6 +304,15 @@ class Ship(GImage):
         The facing is a Vector2 object.
         """
         return self._facing
+
+    def getSpin(self):
+        """
+        Returns the degrees the ship turned (counter-clockwise) during its last tick.
+
+        A view uses this to find the angle of the previous tick, just as it uses the
+        velocity to find the previous position. The spin is a float.
+        """
+        return self._spin
     
     def getPosition(self):
         """
@@ -167,6 +322,33 @@ class Ship(GImage):
         """
         return (self.x,self.y)
 
+    def getState(self):
+        """
+        Returns the complete state of this ship as a tuple of seven floats.
+
+        The tuple is (x, y, angle, velocity x, velocity y, facing x, facing y). It can
+        be given to setState to restore the ship. The spin is not part of the state.
+        """
+        return (self.x,self.y,self.angle,self._velocity.x,self._velocity.y,
+                self._facing.x,self._facing.y)
+
+    def setState(self, state):
+        """
+        Restores the complete state of this ship.
+
+        The ship is drawn without spin until its next tick.
+
+        Parameter state: the state of a ship
+        Precondition: state is a sequence of seven numbers, as returned by getState
+        """
+        (self.x,self.y,self.angle)=(float(state[0]),float(state[1]),float(state[2]))
+        self._velocity.x=float(state[3])
+        self._velocity.y=float(state[4])
+        self._facing.x=float(state[5])
+        self._facing.y=float(state[6])
+        self._turning=0.0
+        self._spin=0.0
+
     # INITIALIZER TO CREATE A NEW SHIP
     def __init__(self, pos, ang):
         """
@@ -178,11 +360,13 @@ class Ship(GImage):
         Parameter ang: the angle of the ship
         Precondition: ang is an int
         """
-        super().__init__(angle=ang, x=pos[0], y=pos[1], source=SHIP_IMAGE)
-        self.width=SHIP_RADIUS*2
-        self.height=SHIP_RADIUS*2        
+        self.x=float(pos[0])
+        self.y=float(pos[1])
+        self.angle=float(ang)
         self._velocity=introcs.Vector2(0.0,0.0)
         self._facing=introcs.Vector2(math.cos(degToRad(ang)),math.sin(degToRad(ang)))
+        self._turning=0.0
+        self._spin=0.0
     
     # ADDITIONAL METHODS (MOVEMENT, COLLISIONS, ETC)
     def turn(self, dir):
@@ -194,14 +378,19 @@ class Ship(GImage):
         """
         if dir:
             self.angle+=SHIP_TURN_RATE
+            self._turning+=SHIP_TURN_RATE
         if not dir:
             self.angle-=SHIP_TURN_RATE
+            self._turning-=SHIP_TURN_RATE
         self._facing.x=math.cos(degToRad(self.angle))
         self._facing.y=math.sin(degToRad(self.angle))
 
     def velocity(self):
         """
         Modifies the velocity of the ship.
+
+        Thrust changes the velocity, so a step of several ticks must apply it (and move
+        the ship) one tick at a time. See Wave._steer.
         """
         self._velocity=self._velocity+(self._facing*(SHIP_IMPULSE))
         if self._velocity.length()>SHIP_MAX_SPEED:
@@ -211,7 +400,11 @@ class Ship(GImage):
     def move(self):
         """
         Modifies the x and y attributes of the ship based on its velocity.
+
+        This ends the tick of the ship, so the turns since the last move become its spin.
         """
+        self._spin=self._turning
+        self._turning=0.0
         self.x+=self._velocity.x
         self.y+=self._velocity.y
         if self.x<-DEAD_ZONE:
@@ -219,111 +412,457 @@ class Ship(GImage):
         if self.x>(GAME_WIDTH+DEAD_ZONE):
             self.x-=GAME_WIDTH+(2*DEAD_ZONE)
         if self.y<-DEAD_ZONE:
-            self.y+=GAME_WIDTH+(2*DEAD_ZONE)
-        if self.y>(GAME_WIDTH+DEAD_ZONE):
-            self.y-=GAME_WIDTH+(2*DEAD_ZONE)
+            self.y+=GAME_HEIGHT+(2*DEAD_ZONE)
+        if self.y>(GAME_HEIGHT+DEAD_ZONE):
+            self.y-=GAME_HEIGHT+(2*DEAD_ZONE)
 
 
-class Asteroid(GImage):
+class AsteroidField(object):
     """
-    A class to represent a single asteroid.
-    
-    Asteroids are typically are represented by images. Asteroids come in three 
-    different sizes (SMALL_ASTEROID, MEDIUM_ASTEROID, and LARGE_ASTEROID) that 
-    determine the choice of image and asteroid radius. We MUST subclass GImage, because 
-    we need extra attributes for both the size and the velocity of the asteroid.
+    A class to represent all of the asteroids of a wave.
     
-    The class Wave will need to look at the size and velocity, so you will need getters 
-    for them.  However, it is possible to write this assignment with no setters for 
-    either of these. That is because they are fixed and cannot change when the planetoid 
-    is created. 
+    Asteroids come in three different sizes (SMALL_ASTEROID, MEDIUM_ASTEROID, and 
+    LARGE_ASTEROID) that determine the asteroid radius and speed. Rather than making an
+    object for each asteroid, this class stores every asteroid as a row of contiguous 
+    NumPy arrays: positions, velocities, radii and size codes. The size code of an 
+    asteroid is its index in ASTEROID_SIZES. The order of the rows is the draw order.
     
-    In addition to the getters, you need to write the __init__ method to set the size
-    and starting velocity. Note that the SPEED of an asteroid is defined in const.py,
-    so the only thing that differs is the velocity direction.
+    The class Wave will need to look at these arrays, so there are getters for them.
+    However, there are no setters. Asteroids are only added with the method spawn and 
+    taken away with the method remove, both of which work on many asteroids at once.
+    The method replace does both in a single pass, putting new asteroids in the place
+    of the ones they replace.
+
+    Rows shift whenever asteroids are added or taken away, so a row number is only good
+    until the next change. Every asteroid also gets an id when it is spawned, which it
+    keeps until it is removed and which is never reused. Use the method find to turn
+    ids back into the current rows.
     
-    You also want to create a method to update the asteroid. You update the asteroid 
-    by adding the velocity to the position. While it is okay to add a method to detect 
-    collisions in this class, you may find it easier to process collisions in wave.py.
+    The method move updates every asteroid in a single vectorized step, wrapping the 
+    asteroids that leave the dead zone around to the other side.
     """
     # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
-    # Attribute _velocity: the velocity vector of the Asteroid object
-    # Invariant: _velocity is a Vector2 object
+    # Attribute _pos: the centers of the asteroids
+    # Invariant: _pos is a float array of shape (n,2)
+    #
+    # Attribute _vel: the velocities of the asteroids
+    # Invariant: _vel is a float array of shape (n,2)
+    #
+    # Attribute _radius: the radii of the asteroids
+    # Invariant: _radius is a float array of shape (n,)
     #
-    # Attribute _radius: the radius of the Asteroid  object
-    # Invariant: _radius is an int
+    # Attribute _size: the size codes of the asteroids
+    # Invariant: _size is an int8 array of shape (n,) with values in 0..2
     #
-    # Attribute _size: the size of the Asteroid object
-    # Invariant: _size is a string
+    # Attribute _id: the ids of the asteroids
+    # Invariant: _id is an int64 array of shape (n,) of distinct values < _nextId
+    #
+    # Attribute _nextId: the id of the next asteroid to spawn
+    # Invariant: _nextId is an int >= 0
+    #
+    # Attribute _byId: the rows of the asteroids sorted by id
+    # Invariant: _byId is an int array that sorts _id, or None if not computed yet
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
-    def getRadius(self):
+    def getPositions(self):
+        """
+        Returns the centers of the asteroids.
+
+        The centers are a float array of shape (n,2). Do not modify it.
+        """
+        return self._pos
+
+    def getVelocities(self):
+        """
+        Returns the velocities of the asteroids.
+
+        The velocities are a float array of shape (n,2). Do not modify it.
+        """
+        return self._vel
+
+    def getRadii(self):
         """
-        Return the radius of an Asteroid object.
+        Returns the radii of the asteroids.
 
-        The radius is an int.
+        The radii are a float array of shape (n,). Do not modify it.
         """
         return self._radius
 
-    def getSize(self):
+    def getSizes(self):
         """
-        Return the size of an Asteroid object.
+        Returns the size codes of the asteroids.
 
-        The size is a string.
+        The size codes are an int8 array of shape (n,). Do not modify it.
         """
         return self._size
 
-    # INITIALIZER TO CREATE A NEW ASTEROID
-    def __init__(self, size, pos, dir):
+    def getIds(self):
+        """
+        Returns the ids of the asteroids.
+
+        The ids are an int64 array of shape (n,). Do not modify it.
         """
-        Initializes an Asteroid object.
+        return self._id
 
-        Parameter size: size of the asteroid
-        Precondition: size is a string
+    def getNextId(self):
+        """
+        Returns the id of the next asteroid to spawn.
 
-        Parameter pos: position of the asteroid
-        Precondition: pos is a tuple
+        The id is an int >= 0.
+        """
+        return self._nextId
 
-        Parameter dir: the direction of movemement of the asteroid
-        Precondition: dir is a list
+    def setState(self, positions, velocities, sizes, ids, nextId):
         """
-        if size==SMALL_ASTEROID:
-            img=SMALL_IMAGE
-            radius=SMALL_RADIUS
-            speed=SMALL_SPEED
-        elif size==MEDIUM_ASTEROID:
-            img=MEDIUM_IMAGE
-            radius=MEDIUM_RADIUS
-            speed=MEDIUM_SPEED
+        Replaces every asteroid in this field, as when restoring a snapshot.
+
+        The radii follow from the sizes. The arrays are copied.
+
+        Parameter positions: the centers of the asteroids
+        Precondition: positions is a float array of shape (n,2)
+
+        Parameter velocities: the velocities of the asteroids
+        Precondition: velocities is a float array of shape (n,2)
+
+        Parameter sizes: the size codes of the asteroids
+        Precondition: sizes is an int array of shape (n,) with values in 0..2
+
+        Parameter ids: the ids of the asteroids
+        Precondition: ids is an int array of shape (n,) of distinct values < nextId
+
+        Parameter nextId: the id of the next asteroid to spawn
+        Precondition: nextId is an int >= 0
+        """
+        self._pos=np.array(positions,dtype=float).reshape(-1,2)
+        self._vel=np.array(velocities,dtype=float).reshape(-1,2)
+        self._size=np.array(sizes,dtype=np.int8).reshape(-1)
+        self._radius=np.take(ASTEROID_RADII,self._size).astype(float)
+        self._id=np.array(ids,dtype=np.int64).reshape(-1)
+        self._nextId=int(nextId)
+        self._byId=None
+
+    # INITIALIZER TO CREATE AN EMPTY FIELD
+    def __init__(self):
+        """
+        Initializes an AsteroidField with no asteroids.
+        """
+        self._pos=np.zeros((0,2))
+        self._vel=np.zeros((0,2))
+        self._radius=np.zeros(0)
+        self._size=np.zeros(0,dtype=np.int8)
+        self._id=np.zeros(0,dtype=np.int64)
+        self._nextId=0
+        self._byId=None
+
+    def __len__(self):
+        """
+        Returns the number of asteroids in this field.
+        """
+        return len(self._size)
+
+    # ADDITIONAL METHODS (MOVEMENT, COLLISIONS, ETC)
+    def spawn(self, sizes, positions, directions, index=None):
+        """
+        Adds new asteroids to this field.
+
+        The speed of each asteroid is determined by its size. A direction of (0,0) 
+        makes a stationary asteroid. If index is None, the asteroids are added at the 
+        end (so they are drawn last). Otherwise they are inserted before the given rows, 
+        with the same meaning as the argument of numpy.insert.
+
+        Parameter sizes: the size codes of the new asteroids
+        Precondition: sizes is a sequence of ints in 0..2
+
+        Parameter positions: the centers of the new asteroids
+        Precondition: positions is a sequence of (x,y) pairs, one per size
+
+        Parameter directions: the directions of movement of the new asteroids
+        Precondition: directions is a sequence of (x,y) pairs, one per size
+
+        Parameter index: the row(s) to insert before
+        Precondition: index is None, an int, or a sequence of ints (one per size)
+        """
+        (size,pos,vel,radius,ids)=self._make(sizes, positions, directions)
+        if index is None:
+            self._pos=np.concatenate((self._pos,pos))
+            self._vel=np.concatenate((self._vel,vel))
+            self._radius=np.concatenate((self._radius,radius))
+            self._size=np.concatenate((self._size,size))
+            self._id=np.concatenate((self._id,ids))
         else:
-            img=LARGE_IMAGE
-            radius=LARGE_RADIUS
-            speed=LARGE_SPEED
-        super().__init__(source=img, x=pos[0], y=pos[1])
-        self.width=radius*2
-        self.height=radius*2
-        self._radius=radius
-        self._size=size
-        if dir==[0,0]:
-                self._velocity = Vector2(0,0)
+            self._pos=np.insert(self._pos,index,pos,axis=0)
+            self._vel=np.insert(self._vel,index,vel,axis=0)
+            self._radius=np.insert(self._radius,index,radius)
+            self._size=np.insert(self._size,index,size)
+            self._id=np.insert(self._id,index,ids)
+        self._byId=None
+
+    def remove(self, indices):
+        """
+        Removes asteroids from this field.
+
+        The remaining asteroids keep their order.
+
+        Parameter indices: the rows to remove
+        Precondition: indices is an int or a sequence of ints, all valid rows
+        """
+        self._pos=np.delete(self._pos,indices,axis=0)
+        self._vel=np.delete(self._vel,indices,axis=0)
+        self._radius=np.delete(self._radius,indices)
+        self._size=np.delete(self._size,indices)
+        self._id=np.delete(self._id,indices)
+        self._byId=None
+
+    def replace(self, indices, owners, sizes, positions, directions):
+        """
+        Removes asteroids and spawns new ones in their place, in a single pass.
+
+        Every new asteroid has an owner, one of the removed rows. The new asteroids take
+        the place of their owner in the draw order, in the order given. A removed row
+        that owns no new asteroids simply disappears. The remaining asteroids keep their
+        order. This is the same as remove followed by spawn at the right indices, but
+        every array is copied only once.
+
+        Parameter indices: the rows to remove
+        Precondition: indices is a sequence of distinct ints, all valid rows
+
+        Parameter owners: the removed row that each new asteroid replaces
+        Precondition: owners is a sequence of ints in indices, one per size
+
+        Parameter sizes: the size codes of the new asteroids
+        Precondition: sizes is a sequence of ints in 0..2
+
+        Parameter positions: the centers of the new asteroids
+        Precondition: positions is a sequence of (x,y) pairs, one per size
+
+        Parameter directions: the directions of movement of the new asteroids
+        Precondition: directions is a sequence of (x,y) pairs, one per size
+        """
+        n=len(self._size)
+        owners=np.asarray(owners,dtype=np.intp).reshape(-1)
+        keep=np.ones(n,dtype=bool)
+        keep[np.asarray(indices,dtype=np.intp)]=False
+        # Every old row becomes as many new rows as it keeps or owns
+        count=keep.astype(np.intp)
+        np.add.at(count,owners,1)
+        start=np.cumsum(count)-count
+        order=np.argsort(owners,kind='stable')
+        first=np.searchsorted(owners[order],owners[order])
+        dest=np.empty(len(owners),dtype=np.intp)
+        dest[order]=start[owners[order]]+np.arange(len(owners))-first
+        rows=np.empty(int(count.sum()),dtype=np.intp)
+        rows[start[keep]]=np.flatnonzero(keep)
+        rows[dest]=-1
+        (size,pos,vel,radius,ids)=self._make(sizes, positions, directions)
+        old=rows>=0
+        rows=rows[old]
+        self._pos=self._splice(self._pos,rows,old,dest,pos)
+        self._vel=self._splice(self._vel,rows,old,dest,vel)
+        self._radius=self._splice(self._radius,rows,old,dest,radius)
+        self._size=self._splice(self._size,rows,old,dest,size)
+        self._id=self._splice(self._id,rows,old,dest,ids)
+        self._byId=None
+
+    def find(self, ids):
+        """
+        Returns the current rows of the asteroids with the given ids.
+
+        The rows are an int array with one entry per id. The entry is -1 for an id that
+        is no longer in this field.
+
+        Parameter ids: the ids to look up
+        Precondition: ids is a sequence of ints
+        """
+        ids=np.asarray(ids,dtype=np.int64).reshape(-1)
+        if len(self._id)==0:
+            return np.full(len(ids),-1,dtype=np.intp)
+        if self._byId is None:
+            self._byId=np.argsort(self._id)
+        known=self._id[self._byId]
+        at=np.minimum(np.searchsorted(known,ids),len(known)-1)
+        return np.where(known[at]==ids,self._byId[at],-1)
+
+    def move(self, scale=1):
+        """
+        Modifies the positions of all asteroids based on their velocities.
+
+        Asteroids that pass beyond the dead zone wrap around to the other side.
+
+        Parameter scale: the number of ticks to move
+        Precondition: scale is an int >= 1
+        """
+        if scale==1:
+            self._pos+=self._vel
         else:
-            magnitude = ((dir[0]**2)+(dir[1]**2))**0.5
-            self._velocity = Vector2((dir[0]/magnitude)*speed, (dir[1]/magnitude)*speed)
+            self._pos+=self._vel*scale
+        x=self._pos[:,0]
+        y=self._pos[:,1]
+        x[x<-DEAD_ZONE]+=WORLD_WIDTH
+        x[x>(GAME_WIDTH+DEAD_ZONE)]-=WORLD_WIDTH
+        y[y<-DEAD_ZONE]+=WORLD_HEIGHT
+        y[y>(GAME_HEIGHT+DEAD_ZONE)]-=WORLD_HEIGHT
+
+    # HELPER METHODS
+    def _make(self, sizes, positions, directions):
+        """
+        Returns the rows for new asteroids as a tuple (size, pos, vel, radius, ids).
 
-    # ADDITIONAL METHODS (MOVEMENT, COLLISIONS, ETC)
-    def move(self):
+        The speed of each asteroid is determined by its size, and each one gets a new id.
+
+        Parameter sizes: the size codes of the new asteroids
+        Precondition: sizes is a sequence of ints in 0..2
+
+        Parameter positions: the centers of the new asteroids
+        Precondition: positions is a sequence of (x,y) pairs, one per size
+
+        Parameter directions: the directions of movement of the new asteroids
+        Precondition: directions is a sequence of (x,y) pairs, one per size
         """
-        Modifies the x and y attributes of the asteroid based on its velocity
+        size=np.asarray(sizes,dtype=np.int8).reshape(-1)
+        pos=np.asarray(positions,dtype=float).reshape(-1,2)
+        dir=np.asarray(directions,dtype=float).reshape(-1,2)
+        magnitude=np.sqrt((dir[:,0]**2)+(dir[:,1]**2))[:,np.newaxis]
+        vel=np.divide(dir,magnitude,out=np.zeros_like(dir),where=magnitude>0)
+        vel*=np.take(ASTEROID_SPEEDS,size)[:,np.newaxis]
+        radius=np.take(ASTEROID_RADII,size).astype(float)
+        ids=np.arange(self._nextId,self._nextId+len(size),dtype=np.int64)
+        self._nextId+=len(size)
+        return (size,pos,vel,radius,ids)
+
+    def _splice(self, array, rows, old, dest, new):
         """
-        self.x+=self._velocity.x
-        self.y+=self._velocity.y
-        if self.x<-DEAD_ZONE:
-            self.x+=GAME_WIDTH+(2*DEAD_ZONE)
-        if self.x>(GAME_WIDTH+DEAD_ZONE):
-            self.x-=GAME_WIDTH+(2*DEAD_ZONE)
-        if self.y<-DEAD_ZONE:
-            self.y+=GAME_WIDTH+(2*DEAD_ZONE)
-        if self.y>(GAME_WIDTH+DEAD_ZONE):
-            self.y-=GAME_WIDTH+(2*DEAD_ZONE)
+        Returns a new array made of the given old rows and new rows.
+
+        Parameter array: the old array
+        Precondition: array is a NumPy array with one row per asteroid
+
+        Parameter rows: the old rows to keep, in order
+        Precondition: rows is an int array
+
+        Parameter old: where the kept rows go in the result
+        Precondition: old is a bool array, True once for every element of rows
+
+        Parameter dest: where the new rows go in the result
+        Precondition: dest is an int array, one per new row, where old is False
+
+        Parameter new: the new rows
+        Precondition: new is a NumPy array with the same row shape as array
+        """
+        result=np.empty((len(old),)+array.shape[1:],dtype=array.dtype)
+        result[old]=array[rows]
+        result[dest]=new
+        return result
+
+# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
+class Pool(object):
+    """
+    A class to recycle model objects instead of allocating new ones.
+
+    The pool makes objects with a factory (usually a class) and takes them back when
+    they are spent. The method acquire hands out a spent object if there is one, after
+    calling its method reset with the same arguments the factory would get. So every
+    pooled class needs a method reset that turns an old object into a new one.
+
+    The pool keeps at most cap spent objects. Any object released beyond that is left
+    to the garbage collector. The pool counts its hits (reused objects) and misses
+    (newly made objects), so the cap can be tuned.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _factory: the function that makes a new object
+    # Invariant: _factory is a callable
+    #
+    # Attribute _cap: the most spent objects to keep
+    # Invariant: _cap is an int >= 0
+    #
+    # Attribute _free: the spent objects ready for reuse
+    # Invariant: _free is a list of at most _cap objects
+    #
+    # Attribute _hits: the number of objects acquired by reuse
+    # Invariant: _hits is an int >= 0
+    #
+    # Attribute _misses: the number of objects acquired by making a new one
+    # Invariant: _misses is an int >= 0
+    #
+    # Attribute _dropped: the number of objects released while the pool was full
+    # Invariant: _dropped is an int >= 0
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getCap(self):
+        """
+        Returns the most spent objects this pool keeps.
 
-# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
\ No newline at end of file
+        The cap is an int >= 0.
+        """
+        return self._cap
+
+    def setCap(self, value):
+        """
+        Sets the most spent objects this pool keeps.
+
+        Spent objects beyond the new cap are let go.
+
+        Parameter value: the new cap
+        Precondition: value is an int >= 0
+        """
+        assert type(value)==int and value>=0, repr(value)+' is not a valid cap'
+        self._cap=value
+        del self._free[value:]
+
+    def getStats(self):
+        """
+        Returns the statistics of this pool as a dictionary.
+
+        The keys are 'hits', 'misses', 'dropped' and 'free' (the number of spent
+        objects ready for reuse). All values are ints >= 0.
+        """
+        return {'hits':self._hits,'misses':self._misses,'dropped':self._dropped,
+                'free':len(self._free)}
+
+    # INITIALIZER TO CREATE AN EMPTY POOL
+    def __init__(self, factory, cap):
+        """
+        Initializes a pool with no spent objects.
+
+        Parameter factory: the function that makes a new object
+        Precondition: factory is a callable whose objects have a method reset that
+        takes the same arguments as factory
+
+        Parameter cap: the most spent objects to keep
+        Precondition: cap is an int >= 0
+        """
+        self._factory=factory
+        self._free=[]
+        self._hits=0
+        self._misses=0
+        self._dropped=0
+        self.setCap(cap)
+
+    # ADDITIONAL METHODS
+    def acquire(self, *args):
+        """
+        Returns an object made from args, reusing a spent one if possible.
+
+        Parameter args: the arguments for the factory (or the method reset)
+        Precondition: args are valid arguments for the factory
+        """
+        if self._free:
+            obj=self._free.pop()
+            obj.reset(*args)
+            self._hits+=1
+            return obj
+        self._misses+=1
+        return self._factory(*args)
+
+    def release(self, obj):
+        """
+        Takes back a spent object for reuse.
+
+        The object must no longer be used by the caller.
+
+        Parameter obj: the spent object
+        Precondition: obj was made by this pool's factory
+        """
+        if len(self._free)<self._cap:
+            self._free.append(obj)
+        else:
+            self._dropped+=1
@@ -0,0 +1,658 @@
+"""
+Physics module for Planetoids
+
+This module contains the collision detection for the Planetoids game. The collision
+tests work on whole NumPy arrays of positions at once (such as the arrays of an
+AsteroidField) rather than on one pair of objects at a time. They only report which
+objects touch; what happens after a hit (splitting an asteroid, killing the ship) is up
+to the class Wave.
+
+Collision detection is split into a broadphase and a narrowphase. A broadphase is an
+object with two methods:
+
+    update(centers, radii)    remembers the asteroids for this frame
+    touching(points, radius)  returns the pairs (point, asteroid) that touch
+
+The broadphase picks the candidate pairs and then tests which of them really touch. The
+world wraps around at DEAD_ZONE beyond the screen edges, so all distances are measured
+the short way around (see wrapDelta).
+
+Bullets are fast and small, so they are tested along the whole path they swept during
+a step rather than only at their end position (see sweptHits). That way a bullet cannot
+tunnel through a small asteroid, even when a step covers several ticks. The ship is
+tested at the end of every tick of a step, against the asteroids as they were at that
+tick (see sampledHits), which is what a step of one tick at a time would test.
+
+Like models.py, this module never imports game2d, so it can be used without a window.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+import numpy as np
+import math
+
+# PRIMARY RULE: Physics is not allowed to access anything in any module other than
+# consts.py. Wave passes it the arrays that it needs.
+
+# HELPER FUNCTIONS FOR WRAPPED DISTANCES
+def wrapDelta(d, period):
+    """
+    Returns the offsets d measured the short way around a wrapped axis
+
+    The result is congruent to d modulo period, and lies in [-period/2, period/2].
+
+    Parameter d: the offsets along one axis
+    Precondition: d is a float array
+
+    Parameter period: the length of the wrapped axis
+    Precondition: period is a number > 0
+    """
+    return d-period*np.round(d/period)
+
+
+def wrapPoints(points):
+    """
+    Returns the coordinates of the points wrapped into the world as a pair (x, y)
+
+    The values of x are in [-DEAD_ZONE, WORLD_WIDTH-DEAD_ZONE) and the values of y are
+    in [-DEAD_ZONE, WORLD_HEIGHT-DEAD_ZONE). So the distance between two wrapped values
+    on the same axis is always less than the length of the axis.
+
+    Parameter points: the points to wrap
+    Precondition: points is a float array of shape (m,2)
+    """
+    x=(points[:,0]+DEAD_ZONE)%WORLD_WIDTH-DEAD_ZONE
+    y=(points[:,1]+DEAD_ZONE)%WORLD_HEIGHT-DEAD_ZONE
+    return (x,y)
+
+
+def firstHits(points, asteroids):
+    """
+    Returns the collisions to act on as a pair of int arrays (points, asteroids)
+
+    The arguments are the touching pairs reported by a broadphase (or sweptHits), sorted
+    by point and then in order of preference. Every point hits at most one asteroid, and
+    every asteroid is hit by at most one point. Points are resolved in order: each point
+    takes the first asteroid (in the given order) that it touches and that was not taken
+    by an earlier point.
+
+    Parameter points: the point of each touching pair
+    Precondition: points is a sorted int array
+
+    Parameter asteroids: the asteroid of each touching pair
+    Precondition: asteroids is an int array, in order of preference within each point
+    """
+    if len(points)==0:
+        return (points,asteroids)
+    head=np.ones(len(points),dtype=bool)
+    head[1:]=points[1:]!=points[:-1]
+    first=asteroids[head]
+    if len(np.unique(first))==len(first):
+        return (points[head],first)
+    # Two points want the same asteroid; settle it in point order
+    taken=set()
+    winners=[]
+    targets=[]
+    for point,asteroid in zip(points.tolist(),asteroids.tolist()):
+        if (winners and winners[-1]==point) or asteroid in taken:
+            continue
+        taken.add(asteroid)
+        winners.append(point)
+        targets.append(asteroid)
+    return (np.array(winners,dtype=np.intp),np.array(targets,dtype=np.intp))
+
+
+def sweptHits(broadphase, starts, ends, radius, centers, radii, motion, spans=None):
+    """
+    Returns the swept collisions as a tuple of arrays (points, asteroids, times)
+
+    Each moving circle travels in a straight line from starts[k] to ends[k] during the
+    step, while each asteroid travels by its motion and ends at its center. A pair hits
+    if the circles touch at any time during the step. The time of impact is the fraction
+    of the step (0 to 1) at which they first touch; it is 0 if they touched already at
+    the start. Positions are compared the short way around the wrapped world.
+
+    A circle need not move during the whole step. A bullet fired on a later tick, or
+    one that leaves the screen before the end, only travels from its start to its end
+    during its span, a part of the step given by two fractions (begin, end). It cannot
+    hit anything outside of its span.
+
+    The broadphase is only used to pick the candidate pairs, so it must be up to date
+    with the given asteroids. The pairs are sorted by point, then by time of impact, and
+    then by asteroid, which is the order of preference for firstHits.
+
+    Parameter broadphase: the broadphase over the asteroids
+    Precondition: broadphase is a broadphase object, updated with centers and radii
+
+    Parameter starts: the centers of the moving circles at the start of the step
+    Precondition: starts is a float array of shape (m,2)
+
+    Parameter ends: the centers of the moving circles at the end of the step
+    Precondition: ends is a float array of shape (m,2)
+
+    Parameter radius: the radius of the moving circles
+    Precondition: radius is a number >= 0
+
+    Parameter centers: the asteroid centers at the end of the step
+    Precondition: centers is a float array of shape (n,2)
+
+    Parameter radii: the asteroid radii
+    Precondition: radii is a float array of shape (n,)
+
+    Parameter motion: the distance each asteroid moved during the step
+    Precondition: motion is a float array of shape (n,2)
+
+    Parameter spans: the part of the step in which each circle moves (all of it if None)
+    Precondition: spans is None or a float array of shape (m,2), with 0 <= begin < end <= 1
+    """
+    if len(starts)==0 or len(centers)==0:
+        return (np.zeros(0,dtype=np.intp),np.zeros(0,dtype=np.intp),np.zeros(0))
+    travel=ends-starts
+    # The midpoint of a path is within reach of every asteroid it can hit
+    reach=radius+np.sqrt((travel*travel).sum(axis=1)).max()/2
+    reach+=np.sqrt((motion*motion).sum(axis=1)).max()
+    points,asteroids=broadphase.touching((starts+ends)/2, float(reach))
+    # The part of the step that each pair spans, and how far the asteroid moves in it
+    if spans is None:
+        moved=motion[asteroids]
+        back=moved
+    else:
+        begin=spans[points,0]
+        span=spans[points,1]-begin
+        moved=motion[asteroids]*span[:,np.newaxis]
+        back=motion[asteroids]*(1-begin)[:,np.newaxis]
+    # Work in the frame of each asteroid, from where it was when the span begins
+    sx=wrapDelta(starts[points,0]-centers[asteroids,0]+back[:,0],WORLD_WIDTH)
+    sy=wrapDelta(starts[points,1]-centers[asteroids,1]+back[:,1],WORLD_HEIGHT)
+    dx=travel[points,0]-moved[:,0]
+    dy=travel[points,1]-moved[:,1]
+    reach=radii[asteroids]+radius
+    a=dx*dx+dy*dy
+    b=sx*dx+sy*dy
+    c=sx*sx+sy*sy-reach*reach
+    disc=b*b-a*c
+    inside=c<=0
+    moving=(a>0)&(disc>=0)&~inside
+    times=np.zeros(len(points))
+    times[moving]=(-b[moving]-np.sqrt(disc[moving]))/a[moving]
+    keep=inside|(moving&(times>=0)&(times<=1))
+    points=points[keep]
+    asteroids=asteroids[keep]
+    times=times[keep]
+    if not spans is None:
+        times=begin[keep]+times*span[keep]
+    order=np.lexsort((asteroids,times,points))
+    return (points[order],asteroids[order],times[order])
+
+
+def sampledHits(broadphase, points, ticks, radius, centers, radii, velocities):
+    """
+    Returns the collisions of circles seen at different ticks as a pair of int arrays 
+    (points, asteroids)
+
+    Each circle is tested against the asteroids as they are ticks[k] ticks after they
+    were at their centers, moving at their velocities. So a path of positions, one per
+    tick, is tested tick by tick in a single query. Positions are compared the short way
+    around the wrapped world. The pairs are sorted by point and then by asteroid.
+
+    The broadphase is only used to pick the candidate pairs, so it must be up to date
+    with the given centers.
+
+    Parameter broadphase: the broadphase over the asteroids
+    Precondition: broadphase is a broadphase object, updated with centers and radii
+
+    Parameter points: the centers of the circles to test
+    Precondition: points is a float array of shape (m,2)
+
+    Parameter ticks: the number of ticks the asteroids have moved for each circle
+    Precondition: ticks is a float array of shape (m,)
+
+    Parameter radius: the radius of the circles
+    Precondition: radius is a number >= 0
+
+    Parameter centers: the asteroid centers
+    Precondition: centers is a float array of shape (n,2)
+
+    Parameter radii: the asteroid radii
+    Precondition: radii is a float array of shape (n,)
+
+    Parameter velocities: the asteroid velocities, per tick
+    Precondition: velocities is a float array of shape (n,2)
+    """
+    if len(points)==0 or len(centers)==0:
+        return (np.zeros(0,dtype=np.intp),np.zeros(0,dtype=np.intp))
+    # An asteroid is never further from its center than its speed times the ticks
+    speed=np.sqrt((velocities*velocities).sum(axis=1)).max()
+    reach=radius+speed*np.abs(ticks).max()
+    owner,asteroids=broadphase.touching(points, float(reach))
+    dx=wrapDelta(points[owner,0]-centers[asteroids,0]-velocities[asteroids,0]*ticks[owner],
+                 WORLD_WIDTH)
+    dy=wrapDelta(points[owner,1]-centers[asteroids,1]-velocities[asteroids,1]*ticks[owner],
+                 WORLD_HEIGHT)
+    reach=radii[asteroids]+radius
+    keep=dx*dx+dy*dy<=reach*reach
+    return (owner[keep],asteroids[keep])
+
+
+def _gather(lo, hi):
+    """
+    Returns every slot of the given ranges as a pair of int arrays (ranges, slots)
+
+    For each range k, the result lists the slots lo[k], lo[k]+1, ..., hi[k]-1, each 
+    paired with k. The slots are listed range by range.
+
+    Parameter lo: the first slot of each range
+    Precondition: lo is an int array
+
+    Parameter hi: the slot after the last one of each range
+    Precondition: hi is an int array of the same length as lo, with hi >= lo
+    """
+    counts=hi-lo
+    total=int(counts.sum())
+    ranges=np.repeat(np.arange(len(lo)),counts)
+    slots=np.repeat(lo-(np.cumsum(counts)-counts),counts)+np.arange(total)
+    return (ranges,slots)
+
+
+def _narrow(x, y, radius, owner, slot, xs, ys, radii, rows):
+    """
+    Returns the candidate pairs that really touch as a pair of int arrays (points, asteroids)
+
+    Pair k is made of point owner[k] and the asteroid in slot[k] of the broadphase
+    arrays. All coordinates must be wrapped (see wrapPoints). The pairs are sorted by 
+    point and then by asteroid.
+
+    Parameter x: the wrapped horizontal coordinates of the points
+    Precondition: x is a float array
+
+    Parameter y: the wrapped vertical coordinates of the points
+    Precondition: y is a float array of the same length as x
+
+    Parameter radius: the radius of the points
+    Precondition: radius is a number >= 0
+
+    Parameter owner: the point of each candidate pair
+    Precondition: owner is an int array
+
+    Parameter slot: the broadphase slot of each candidate pair
+    Precondition: slot is an int array of the same length as owner
+
+    Parameter xs: the wrapped horizontal coordinates of the asteroids, by slot
+    Precondition: xs is a float array
+
+    Parameter ys: the wrapped vertical coordinates of the asteroids, by slot
+    Precondition: ys is a float array of the same length as xs
+
+    Parameter radii: the radii of the asteroids, by slot
+    Precondition: radii is a float array of the same length as xs
+
+    Parameter rows: the asteroid row of each slot
+    Precondition: rows is an int array of the same length as xs
+    """
+    dx=np.abs(xs[slot]-x[owner])
+    np.minimum(dx,WORLD_WIDTH-dx,out=dx)
+    dy=np.abs(ys[slot]-y[owner])
+    np.minimum(dy,WORLD_HEIGHT-dy,out=dy)
+    reach=radii[slot]+radius
+    keep=dx*dx+dy*dy<=reach*reach
+    owner=owner[keep]
+    other=rows[slot[keep]]
+    order=np.lexsort((other,owner))
+    return (owner[order],other[order])
+
+
+class BruteForce(object):
+    """
+    A broadphase that tests every point against every asteroid.
+
+    This is the simplest broadphase, and the fastest one when there are only a few
+    asteroids. The pairs are tested in blocks, so that no more than BLOCK_PAIRS pairs
+    are in memory at once.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _centers: the asteroid centers of this frame
+    # Invariant: _centers is a float array of shape (n,2)
+    #
+    # Attribute _radii: the asteroid radii of this frame
+    # Invariant: _radii is a float array of shape (n,)
+
+    def __init__(self):
+        """
+        Initializes a broadphase with no asteroids.
+        """
+        self._centers=np.zeros((0,2))
+        self._radii=np.zeros(0)
+
+    def update(self, centers, radii):
+        """
+        Remembers the asteroids for this frame.
+
+        Parameter centers: the asteroid centers
+        Precondition: centers is a float array of shape (n,2)
+
+        Parameter radii: the asteroid radii
+        Precondition: radii is a float array of shape (n,)
+        """
+        self._centers=centers
+        self._radii=radii
+
+    def touching(self, points, radius):
+        """
+        Returns the touching pairs as a pair of int arrays (points, asteroids)
+
+        The pairs are sorted by point and then by asteroid.
+
+        Parameter points: the centers of the circles to test
+        Precondition: points is a float array of shape (m,2)
+
+        Parameter radius: the radius of the circles to test
+        Precondition: radius is a number >= 0
+        """
+        n=len(self._centers)
+        if len(points)==0 or n==0:
+            return (np.zeros(0,dtype=np.intp),np.zeros(0,dtype=np.intp))
+        reach=self._radii+radius
+        block=max(1,BLOCK_PAIRS//n)
+        found=[]
+        for start in range(0,len(points),block):
+            chunk=points[start:start+block]
+            dx=wrapDelta(chunk[:,0,np.newaxis]-self._centers[np.newaxis,:,0],WORLD_WIDTH)
+            dy=wrapDelta(chunk[:,1,np.newaxis]-self._centers[np.newaxis,:,1],WORLD_HEIGHT)
+            rows,cols=np.nonzero(dx*dx+dy*dy<=reach*reach)
+            found.append((rows+start,cols))
+        return (np.concatenate([f[0] for f in found]),np.concatenate([f[1] for f in found]))
+
+
+class SpatialHash(object):
+    """
+    A broadphase that buckets the asteroids in a uniform grid.
+
+    The grid covers the whole wrapped world (the screen plus the dead zone). Each frame
+    the asteroids are sorted by grid cell, and a point is only tested against the
+    asteroids in the cells within reach of its own cell. The grid wraps like the world
+    does, so a point near an edge also finds the asteroids on the opposite side. The 
+    cost grows with the number of asteroids near each point, not with the square of the
+    population.
+
+    The cells are sized from LARGE_RADIUS (half of it by default). The number of cells 
+    is rounded down so that the cells tile the world exactly. The cells to search around
+    a point depend on the largest asteroid radius this frame, so the search shrinks once
+    the large asteroids are gone.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _cols: the number of grid columns
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _rows: the number of grid rows
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cellw: the width of a grid cell
+    # Invariant: _cellw is a float, WORLD_WIDTH/_cols
+    #
+    # Attribute _cellh: the height of a grid cell
+    # Invariant: _cellh is a float, WORLD_HEIGHT/_rows
+    #
+    # Attribute _order: the asteroid rows sorted by grid cell
+    # Invariant: _order is an int array of shape (n,)
+    #
+    # Attribute _start: where each cell begins in _order
+    # Invariant: _start is an int array of shape (_cols*_rows+1,)
+    #
+    # Attribute _x: the wrapped horizontal coordinates of the asteroids, in _order
+    # Invariant: _x is a float array of shape (n,) with values in [-DEAD_ZONE, 
+    #            WORLD_WIDTH-DEAD_ZONE)
+    #
+    # Attribute _y: the wrapped vertical coordinates of the asteroids, in _order
+    # Invariant: _y is a float array of shape (n,) with values in [-DEAD_ZONE, 
+    #            WORLD_HEIGHT-DEAD_ZONE)
+    #
+    # Attribute _radii: the asteroid radii, in _order
+    # Invariant: _radii is a float array of shape (n,)
+    #
+    # Attribute _largest: the largest asteroid radius
+    # Invariant: _largest is a float >= 0 (0 if there are no asteroids)
+    #
+    # Attribute _offsets: the cell offsets to search, by the cells spanned (see _around)
+    # Invariant: _offsets is a dict mapping pairs of ints to pairs of int arrays
+
+    def __init__(self, cell=LARGE_RADIUS/2):
+        """
+        Initializes a grid with no asteroids.
+
+        Parameter cell: the smallest allowed cell size
+        Precondition: cell is a number > 0
+        """
+        self._cols=max(1,int(WORLD_WIDTH//cell))
+        self._rows=max(1,int(WORLD_HEIGHT//cell))
+        self._cellw=WORLD_WIDTH/self._cols
+        self._cellh=WORLD_HEIGHT/self._rows
+        self._offsets={}
+        self.update(np.zeros((0,2)),np.zeros(0))
+
+    def update(self, centers, radii):
+        """
+        Rebuilds the grid from the asteroids of this frame.
+
+        Parameter centers: the asteroid centers
+        Precondition: centers is a float array of shape (n,2)
+
+        Parameter radii: the asteroid radii
+        Precondition: radii is a float array of shape (n,)
+        """
+        x,y=wrapPoints(centers)
+        cols,rows=self._cell(x,y)
+        cells=rows*self._cols+cols
+        self._order=np.argsort(cells,kind='stable')
+        self._start=np.searchsorted(cells[self._order],np.arange(self._cols*self._rows+1))
+        self._x=x[self._order]
+        self._y=y[self._order]
+        self._radii=radii[self._order]
+        self._largest=float(radii.max()) if len(radii) else 0.0
+
+    def touching(self, points, radius):
+        """
+        Returns the touching pairs as a pair of int arrays (points, asteroids)
+
+        The pairs are sorted by point and then by asteroid.
+
+        Parameter points: the centers of the circles to test
+        Precondition: points is a float array of shape (m,2)
+
+        Parameter radius: the radius of the circles to test
+        Precondition: radius is a number >= 0
+        """
+        if len(points)==0 or len(self._order)==0:
+            return (np.zeros(0,dtype=np.intp),np.zeros(0,dtype=np.intp))
+        x,y=wrapPoints(points)
+        cols,rows=self._cell(x,y)
+        around=self._around(self._largest+radius)
+        cols=(cols[:,np.newaxis]+around[0])%self._cols
+        rows=(rows[:,np.newaxis]+around[1])%self._rows
+        cells=(rows*self._cols+cols).ravel()
+        owner,slot=_gather(self._start[cells],self._start[cells+1])
+        owner//=len(around[0])
+        return _narrow(x,y,radius,owner,slot,self._x,self._y,self._radii,self._order)
+
+    def _cell(self, x, y):
+        """
+        Returns the grid cells of the given coordinates as a pair of int arrays (cols, rows)
+
+        Parameter x: the wrapped horizontal coordinates
+        Precondition: x is a float array
+
+        Parameter y: the wrapped vertical coordinates
+        Precondition: y is a float array of the same shape as x
+        """
+        cols=np.floor((x+DEAD_ZONE)/self._cellw).astype(np.intp)%self._cols
+        rows=np.floor((y+DEAD_ZONE)/self._cellh).astype(np.intp)%self._rows
+        return (cols,rows)
+
+    def _around(self, reach):
+        """
+        Returns the cell offsets to search as a pair of int arrays (cols, rows)
+
+        The offsets cover every cell that may hold a center within reach of a point in
+        the center cell. Offsets that wrap onto the same cell are only listed once. A reach
+        only spans a few different numbers of cells (it depends on the asteroid sizes
+        left), so the offsets are computed once for each span and then reused.
+
+        Parameter reach: the largest distance between two centers that touch
+        Precondition: reach is a number >= 0
+        """
+        spans=(math.ceil(reach/self._cellw),math.ceil(reach/self._cellh))
+        if not spans in self._offsets:
+            cols=np.unique(np.arange(-spans[0],spans[0]+1)%self._cols)
+            rows=np.unique(np.arange(-spans[1],spans[1]+1)%self._rows)
+            cols,rows=np.meshgrid(cols,rows)
+            self._offsets[spans]=(cols.ravel(),rows.ravel())
+        return self._offsets[spans]
+
+
+class SweepAndPrune(object):
+    """
+    A broadphase that keeps the asteroids sorted along the x axis from frame to frame.
+
+    Asteroids move at most LARGE_SPEED, MEDIUM_SPEED or SMALL_SPEED each frame, so their
+    order along the x axis barely changes. This broadphase keeps the sorted list of the
+    asteroid centers (the endpoints of their intervals, padded by the largest radius) 
+    across frames and repairs it with an insertion sort, which is close to linear on a 
+    list that is almost sorted. Only when too many asteroids are out of place (more than
+    SWEEP_REPAIR moves) does it fall back to a full (stable, adaptive) sort.
+
+    A point is only tested against the asteroids whose centers lie in a window of the 
+    sorted list around it, found by binary search. The x axis wraps, so a window that 
+    runs off one end of the world continues at the other end.
+
+    The sorted list is only repaired if the asteroids are the same as last frame. The 
+    class AsteroidField makes new arrays whenever asteroids are added or removed (and 
+    only then), so a new radii array means the list must be sorted from scratch.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _order: the asteroid rows sorted by center x
+    # Invariant: _order is an int array of shape (n,)
+    #
+    # Attribute _keys: the wrapped center x of the asteroids, in _order
+    # Invariant: _keys is a sorted float array of shape (n,)
+    #
+    # Attribute _y: the wrapped center y of the asteroids, in _order
+    # Invariant: _y is a float array of shape (n,)
+    #
+    # Attribute _radii: the asteroid radii, by row (as passed to update)
+    # Invariant: _radii is a float array of shape (n,)
+    #
+    # Attribute _sorted: the asteroid radii, in _order
+    # Invariant: _sorted is a float array of shape (n,)
+    #
+    # Attribute _largest: the largest asteroid radius
+    # Invariant: _largest is a float >= 0 (0 if there are no asteroids)
+
+    def __init__(self):
+        """
+        Initializes a sorted list with no asteroids.
+        """
+        self._order=np.zeros(0,dtype=np.intp)
+        self._keys=np.zeros(0)
+        self._y=np.zeros(0)
+        self._radii=None
+        self._sorted=np.zeros(0)
+        self._largest=0.0
+
+    def update(self, centers, radii):
+        """
+        Repairs (or rebuilds) the sorted list from the asteroids of this frame.
+
+        Parameter centers: the asteroid centers
+        Precondition: centers is a float array of shape (n,2)
+
+        Parameter radii: the asteroid radii
+        Precondition: radii is a float array of shape (n,)
+        """
+        x,y=wrapPoints(centers)
+        if radii is self._radii and len(self._order)==len(radii):
+            self._keys=x[self._order]
+            self._repair()
+        else:
+            self._order=np.argsort(x,kind='stable')
+            self._keys=x[self._order]
+            self._radii=radii
+            self._largest=float(radii.max()) if len(radii) else 0.0
+        self._y=y[self._order]
+        self._sorted=radii[self._order]
+
+    def touching(self, points, radius):
+        """
+        Returns the touching pairs as a pair of int arrays (points, asteroids)
+
+        The pairs are sorted by point and then by asteroid.
+
+        Parameter points: the centers of the circles to test
+        Precondition: points is a float array of shape (m,2)
+
+        Parameter radius: the radius of the circles to test
+        Precondition: radius is a number >= 0
+        """
+        if len(points)==0 or len(self._order)==0:
+            return (np.zeros(0,dtype=np.intp),np.zeros(0,dtype=np.intp))
+        x,y=wrapPoints(points)
+        reach=self._largest+radius
+        if 2*reach>=WORLD_WIDTH:
+            lo=np.zeros(len(x),dtype=np.intp)
+            hi=np.full(len(x),len(self._keys))
+        else:
+            top=WORLD_WIDTH-DEAD_ZONE
+            # The window itself, and the parts that wrap off the left and right ends
+            lo=np.stack((np.searchsorted(self._keys,x-reach,'left'),
+                         np.searchsorted(self._keys,x-reach+WORLD_WIDTH,'left'),
+                         np.zeros(len(x),dtype=np.intp)),axis=1)
+            hi=np.stack((np.searchsorted(self._keys,x+reach,'right'),
+                         np.full(len(x),len(self._keys)),
+                         np.searchsorted(self._keys,x+reach-WORLD_WIDTH,'right')),axis=1)
+            hi[:,1]=np.where(x-reach<-DEAD_ZONE,hi[:,1],lo[:,1])
+            hi[:,2]=np.where(x+reach>=top,hi[:,2],lo[:,2])
+            lo=lo.ravel()
+            hi=hi.ravel()
+        owner,slot=_gather(lo,hi)
+        owner//=len(lo)//len(x)
+        return _narrow(x,y,radius,owner,slot,self._keys,self._y,self._sorted,self._order)
+
+    def _repair(self):
+        """
+        Restores the order of _keys (and _order) after the asteroids moved.
+
+        This is an insertion sort that only visits the asteroids that are out of place.
+        If more than SWEEP_REPAIR asteroids have to move, it falls back to a full sort.
+        """
+        keys=self._keys
+        order=self._order
+        bad=(np.flatnonzero(keys[1:]<keys[:-1])+1).tolist()
+        if len(bad)>SWEEP_REPAIR:
+            perm=np.argsort(keys,kind='stable')
+            self._keys=keys[perm]
+            self._order=order[perm]
+            return
+        moves=0
+        k=0
+        i=bad[0] if bad else len(keys)
+        while i<len(keys):
+            # Everything before i is sorted; slide keys[i] back into place
+            key=keys[i]
+            row=order[i]
+            j=int(np.searchsorted(keys[:i],key,'right'))
+            keys[j+1:i+1]=keys[j:i]
+            order[j+1:i+1]=order[j:i]
+            keys[j]=key
+            order[j]=row
+            moves+=1
+            if moves>SWEEP_REPAIR:
+                perm=np.argsort(keys,kind='stable')
+                self._keys=keys[perm]
+                self._order=order[perm]
+                return
+            # The only new inversion can be right after i
+            while k<len(bad) and bad[k]<=i:
+                k+=1
+            if i+1<len(keys) and keys[i+1]<keys[i]:
+                i+=1
+            else:
+                i=bad[k] if k<len(bad) else len(keys)
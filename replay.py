@@ -0,0 +1,270 @@
+"""
+Replay module for Planetoids
+
+This module records the input of a game session and plays it back without a window.
+
+A wave is deterministic. Given the same wave file, the same seed and the same input mask
+on every tick, it always ends up in the same state. So a session is fully described by
+the wave file, the seed, and what happened on every frame: which keys were held down
+(including S, which restores the ship in Planetoids.update) and how many ticks the clock
+ran. A Recorder collects exactly that, and a Replay feeds it back into a Wave as fast as
+the CPU allows. Nothing here imports game2d, so replays run on machines with no display.
+
+A replay file starts with a small header (see REPLAY_MAGIC and REPLAY_VERSION) holding
+the seed and the name of the wave file. It is followed by the frames, compressed with
+zlib, as two bytes per frame: the input mask (with INPUT_START for the S key) and the
+number of ticks.
+
+To replay a file from the command line, type
+
+    python replay.py session.rec
+
+Type python replay.py --help for all of the options.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from wave import *
+import argparse
+import json
+import os
+import struct
+import time
+import zlib
+
+# The layout of the header: magic, version, seed, length of the wave file name
+_HEADER = struct.Struct('<4sHqH')
+
+
+def loadWave(name):
+    """
+    Returns the data of the given wave file in the Data directory.
+
+    This does the same as GameApp.load_json, but without Kivy.
+
+    Parameter name: the name of the wave file
+    Precondition: name is a string naming a JSON file in Data
+    """
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)),'Data',name)
+    with open(path) as file:
+        return json.load(file)
+
+
+class Recorder(object):
+    """
+    A class to record the input of a game session, frame by frame.
+
+    Planetoids calls the method record once per animation frame while a wave is in
+    play. Each frame takes two bytes, so an hour of play at 60 frames a second is
+    under half a megabyte before compression.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _name: the name of the wave file
+    # Invariant: _name is a string
+    #
+    # Attribute _seed: the seed of the wave
+    # Invariant: _seed is an int
+    #
+    # Attribute _frames: the recorded frames, two bytes each
+    # Invariant: _frames is a bytearray of even length
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getName(self):
+        """
+        Returns the name of the wave file of this session.
+
+        The name is a string.
+        """
+        return self._name
+
+    def getSeed(self):
+        """
+        Returns the seed of the wave of this session.
+
+        The seed is an int.
+        """
+        return self._seed
+
+    def getFrames(self):
+        """
+        Returns the number of frames recorded so far.
+
+        The number is an int >= 0.
+        """
+        return len(self._frames)//2
+
+    # INITIALIZER TO CREATE AN EMPTY RECORDING
+    def __init__(self, name, seed):
+        """
+        Initializes a recorder with no frames.
+
+        Parameter name: the name of the wave file
+        Precondition: name is a string
+
+        Parameter seed: the seed of the wave
+        Precondition: seed is an int that fits in 64 bits
+        """
+        self._name=name
+        self._seed=seed
+        self._frames=bytearray()
+
+    # ADDITIONAL METHODS
+    def record(self, mask, ticks):
+        """
+        Adds a frame to the recording.
+
+        Parameter mask: the input mask of the frame, with INPUT_START if S is held down
+        Precondition: mask is an int in 0..255
+
+        Parameter ticks: the number of ticks the wave advanced this frame
+        Precondition: ticks is an int in 0..255
+        """
+        self._frames.append(mask)
+        self._frames.append(ticks)
+
+    def save(self, filename):
+        """
+        Writes the recording to the given file.
+
+        Parameter filename: the file to write
+        Precondition: filename is a string
+        """
+        name=self._name.encode('utf-8')
+        with open(filename,'wb') as file:
+            file.write(_HEADER.pack(REPLAY_MAGIC,REPLAY_VERSION,self._seed,len(name)))
+            file.write(name)
+            file.write(zlib.compress(bytes(self._frames)))
+
+
+class Replay(object):
+    """
+    A class to play back a recorded session without a window.
+
+    The method run makes a new wave from the recorded file and seed, and steps it
+    through every recorded frame, following the same rules as Planetoids.update: the
+    ticks of a frame stop when the ship is destroyed, and while the ship is destroyed
+    holding S restores it (if there are lives left).
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _name: the name of the wave file
+    # Invariant: _name is a string
+    #
+    # Attribute _seed: the seed of the wave
+    # Invariant: _seed is an int
+    #
+    # Attribute _frames: the recorded frames, two bytes each
+    # Invariant: _frames is a bytes object of even length
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getName(self):
+        """
+        Returns the name of the wave file of the recorded session.
+
+        The name is a string.
+        """
+        return self._name
+
+    def getSeed(self):
+        """
+        Returns the seed of the wave of the recorded session.
+
+        The seed is an int.
+        """
+        return self._seed
+
+    def getFrames(self):
+        """
+        Returns the number of recorded frames.
+
+        The number is an int >= 0.
+        """
+        return len(self._frames)//2
+
+    def getTicks(self):
+        """
+        Returns the ship input mask of every recorded tick, in order.
+
+        A frame of several ticks gives its mask once per tick. Frames without ticks
+        (such as while the ship is destroyed) give nothing. The result is a bytes
+        object of masks with only INPUT_KEYS bits.
+        """
+        ticks=bytearray()
+        frames=self._frames
+        for i in range(0,len(frames),2):
+            ticks.extend(bytes((frames[i]&INPUT_KEYS,))*frames[i+1])
+        return bytes(ticks)
+
+    # INITIALIZER TO READ A RECORDING
+    def __init__(self, filename):
+        """
+        Initializes a replay from the given file.
+
+        Parameter filename: the file written by Recorder.save
+        Precondition: filename is a string naming a replay file
+        """
+        with open(filename,'rb') as file:
+            blob=file.read()
+        (magic,version,seed,length)=_HEADER.unpack_from(blob)
+        if magic!=REPLAY_MAGIC or version!=REPLAY_VERSION:
+            raise ValueError('%s is not a replay file (version %d)' %
+                             (repr(filename),REPLAY_VERSION))
+        start=_HEADER.size+length
+        self._name=blob[_HEADER.size:start].decode('utf-8')
+        self._seed=seed
+        self._frames=zlib.decompress(blob[start:])
+
+    # ADDITIONAL METHODS
+    def run(self, data=None, broadphase=None):
+        """
+        Returns the wave after playing back every recorded frame.
+
+        Parameter data: the wave data (loaded from the recorded file name if None)
+        Precondition: data is None or a dictionary defining a wave
+
+        Parameter broadphase: the collision broadphase (see Wave)
+        Precondition: broadphase is None or a broadphase object (see physics.py)
+        """
+        if data is None:
+            data=loadWave(self._name)
+        wave=Wave(data, broadphase, self._seed)
+        frames=self._frames
+        active=True
+        for i in range(0,len(frames),2):
+            mask=frames[i]
+            if active:
+                inputs=mask&INPUT_KEYS
+                for tick in range(frames[i+1]):
+                    if wave.getShip() is None:
+                        break
+                    wave.step(inputs)
+                active=wave.getShip()!=None
+            if not active and wave.getLives()>0 and mask&INPUT_START:
+                wave.reset()
+                active=True
+        return wave
+
+
+def main(args=None):
+    """
+    Plays back the replay file given on the command line and prints how it ended.
+
+    Parameter args: the command line arguments (sys.argv if None)
+    Precondition: args is None or a list of strings
+    """
+    parser=argparse.ArgumentParser(description='Play back a Planetoids session.')
+    parser.add_argument('file',help='the replay file to play back')
+    options=parser.parse_args(args)
+    replay=Replay(options.file)
+    data=loadWave(replay.getName())
+    start=time.perf_counter()
+    wave=replay.run(data)
+    seconds=time.perf_counter()-start
+    print('%s (seed %d): %d frames in %.3f s (%.0f frames/s)' % (replay.getName(),
+          replay.getSeed(),replay.getFrames(),seconds,replay.getFrames()/max(seconds,1e-9)))
+    print('lives %d, asteroids %d' % (wave.getLives(),wave.getAstLen()))
+
+
+# Application code
+if __name__ == '__main__':
+    main()
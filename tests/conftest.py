@@ -0,0 +1,14 @@
+"""
+Test configuration for Planetoids
+
+The game modules are imported by name (consts, wave, physics, ...), as the game itself
+does. The directory of the game goes first on the path, so that wave.py is found before
+the module wave of the standard library.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,127 @@
+"""
+Tests for the broadphases in physics.py
+
+SpatialHash and SweepAndPrune must report exactly the same pairs as BruteForce, in the
+same order, for any asteroids and points, including pairs that only touch across the
+edges of the wrapped world. SweepAndPrune keeps its order from frame to frame, so it is
+also checked over many frames of moving asteroids.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from models import AsteroidField
+from physics import *
+import numpy as np
+import pytest
+
+# The broadphases that must agree with BruteForce
+BROADPHASES = (SpatialHash, SweepAndPrune)
+# The radii of the circles to test (a bullet, a ship, and a very large circle)
+RADII = (BULLET_RADIUS, SHIP_RADIUS, 200)
+
+
+def assertSamePairs(broadphase, centers, radii, points, radius):
+    """
+    Asserts that a broadphase finds the same pairs as BruteForce.
+
+    Parameter broadphase: the broadphase to check, already updated
+    Precondition: broadphase is a broadphase object
+
+    Parameter centers: the asteroid centers
+    Precondition: centers is a float array of shape (n,2)
+
+    Parameter radii: the asteroid radii
+    Precondition: radii is a float array of shape (n,)
+
+    Parameter points: the points to test
+    Precondition: points is a float array of shape (m,2)
+
+    Parameter radius: the radius of the points
+    Precondition: radius is a number >= 0
+    """
+    brute=BruteForce()
+    brute.update(centers,radii)
+    expected=brute.touching(points,radius)
+    found=broadphase.touching(points,radius)
+    assert np.array_equal(found[0],expected[0])
+    assert np.array_equal(found[1],expected[1])
+
+
+@pytest.mark.parametrize('kind', BROADPHASES)
+@pytest.mark.parametrize('radius', RADII)
+@pytest.mark.parametrize('seed', range(4))
+def test_random_field(kind, radius, seed):
+    """
+    Tests a broadphase on random asteroids and points all over the wrapped world.
+    """
+    random=np.random.default_rng(seed)
+    low=(-DEAD_ZONE,-DEAD_ZONE)
+    high=(GAME_WIDTH+DEAD_ZONE,GAME_HEIGHT+DEAD_ZONE)
+    centers=random.uniform(low,high,(150,2))
+    radii=random.choice(ASTEROID_RADII,150).astype(float)
+    points=random.uniform(low,high,(200,2))
+    broadphase=kind()
+    broadphase.update(centers,radii)
+    assertSamePairs(broadphase,centers,radii,points,radius)
+
+
+@pytest.mark.parametrize('kind', BROADPHASES)
+def test_wrap_seam(kind):
+    """
+    Tests a broadphase on pairs that only touch across the edges of the world.
+    """
+    left=-DEAD_ZONE+1.0
+    right=GAME_WIDTH+DEAD_ZONE-1.0
+    bottom=-DEAD_ZONE+1.0
+    top=GAME_HEIGHT+DEAD_ZONE-1.0
+    centers=np.array([[left,100.0],[300.0,top],[left,bottom],[right,350.0]])
+    radii=np.array([SMALL_RADIUS,MEDIUM_RADIUS,SMALL_RADIUS,LARGE_RADIUS],dtype=float)
+    points=np.array([[right,100.0],[300.0,bottom],[right,top],[left,350.0],
+                     [GAME_WIDTH/2,GAME_HEIGHT/2]])
+    broadphase=kind()
+    broadphase.update(centers,radii)
+    found=broadphase.touching(points,BULLET_RADIUS)
+    assert list(zip(*(a.tolist() for a in found)))==[(0,0),(1,1),(2,2),(3,3)]
+    assertSamePairs(broadphase,centers,radii,points,SHIP_RADIUS)
+
+
+@pytest.mark.parametrize('kind', BROADPHASES)
+def test_empty(kind):
+    """
+    Tests a broadphase with no asteroids, and with no points.
+    """
+    broadphase=kind()
+    broadphase.update(np.zeros((0,2)),np.zeros(0))
+    found=broadphase.touching(np.array([[10.0,10.0]]),SHIP_RADIUS)
+    assert len(found[0])==0 and len(found[1])==0
+    broadphase.update(np.array([[10.0,10.0]]),np.array([SMALL_RADIUS],dtype=float))
+    found=broadphase.touching(np.zeros((0,2)),SHIP_RADIUS)
+    assert len(found[0])==0 and len(found[1])==0
+
+
+@pytest.mark.parametrize('kind', BROADPHASES)
+def test_moving_field(kind):
+    """
+    Tests a broadphase over many frames of moving asteroids.
+
+    The asteroids move in place most frames (so SweepAndPrune repairs its order), and
+    every so often some are removed (so the arrays of the field are replaced).
+    """
+    random=np.random.default_rng(11)
+    field=AsteroidField()
+    count=120
+    sizes=random.integers(0,3,count)
+    positions=random.uniform((0,0),(GAME_WIDTH,GAME_HEIGHT),(count,2))
+    directions=random.normal(size=(count,2))
+    field.spawn(sizes.tolist(),positions.tolist(),directions.tolist())
+    broadphase=kind()
+    for frame in range(300):
+        field.move(1)
+        if frame%50==49:
+            field.remove(np.arange(0,len(field),7))
+        broadphase.update(field.getPositions(),field.getRadii())
+        points=random.uniform((-DEAD_ZONE,-DEAD_ZONE),
+                              (GAME_WIDTH+DEAD_ZONE,GAME_HEIGHT+DEAD_ZONE),(40,2))
+        assertSamePairs(broadphase,field.getPositions(),field.getRadii(),points,
+                        SHIP_RADIUS)
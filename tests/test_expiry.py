@@ -0,0 +1,83 @@
+"""
+Tests for the expiry heap of bullets in wave.py
+
+Wave deletes the bullets that left the screen by popping the ones that are due from a
+heap (see Wave._expireBullets), instead of checking every bullet on every tick. Each
+test plays the same session on two waves, one of them checking every bullet the old
+way, and requires the two to stay in exactly the same state. The expiry of each bullet
+is only kept for the heap, so it is left out of the comparison.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from wave import *
+from replay import loadWave
+import numpy as np
+import pytest
+
+# The wave files to play
+WAVES = ('easy1.json', 'wave1.json', 'wave3.json')
+# The number of ticks in each session
+TICKS = 1200
+
+
+def scanBullets(wave):
+    """
+    Returns a function that finds the spent bullets of a wave by checking all of them.
+
+    This is how bullets were deleted before the expiry heap.
+
+    Parameter wave: the wave whose bullets to check
+    Precondition: wave is a Wave object
+    """
+    def expire():
+        return {id(bullet) for bullet in wave.getBullets() if bullet.isDelete()}
+    return expire
+
+
+def worldState(wave):
+    """
+    Returns the state of a wave, without the expiry of its bullets, as a tuple.
+
+    Parameter wave: the wave to read
+    Precondition: wave is a Wave object
+    """
+    ship=wave.getShip()
+    field=wave.getAsteroids()
+    return (wave.getLives(),None if ship is None else ship.getState(),
+            field.getPositions().tolist(),field.getIds().tolist(),
+            [bullet.getState()[:6] for bullet in wave.getBullets()])
+
+
+@pytest.mark.parametrize('scale', (1, 3))
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('name', WAVES)
+def test_heap_matches_scan(name, seed, scale):
+    """
+    Tests that the expiry heap deletes exactly the bullets that a full scan deletes.
+    """
+    data=loadWave(name)
+    heap=Wave(data, seed=seed)
+    scan=Wave(data, seed=seed)
+    scan._expireBullets=scanBullets(scan)
+    random=np.random.default_rng(seed)
+    ticks=0
+    deleted=0
+    while ticks<TICKS:
+        inputs=int(random.integers(0,INPUT_KEYS+1))
+        if random.random()<0.8:
+            inputs|=INPUT_FIRE
+        if heap.getShip() is None:
+            if heap.getLives()==0:
+                break
+            heap.reset()
+            scan.reset()
+        before={id(bullet) for bullet in heap.getBullets()}
+        done=heap.step(inputs, scale)
+        assert scan.step(inputs, scale)==done
+        ticks+=done
+        deleted+=len(before-{id(bullet) for bullet in heap.getBullets()})
+        assert not any(bullet.isDelete() for bullet in heap.getBullets())
+        assert worldState(heap)==worldState(scan)
+    assert deleted>0
@@ -0,0 +1,144 @@
+"""
+Tests for the collision kernels in physics.py
+
+The vectorized kernels are compared against plain Python loops that test one pair at a
+time, the way the original collision code did.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from physics import *
+import numpy as np
+import pytest
+
+
+def randomField(random, n, m):
+    """
+    Returns random asteroids and points as a tuple (centers, radii, points)
+
+    The coordinates cover the whole wrapped world, dead zone included, so that many
+    pairs touch across the edges of the world.
+
+    Parameter random: the generator to draw from
+    Precondition: random is a numpy Generator
+
+    Parameter n: the number of asteroids
+    Precondition: n is an int >= 0
+
+    Parameter m: the number of points
+    Precondition: m is an int >= 0
+    """
+    low=(-DEAD_ZONE,-DEAD_ZONE)
+    high=(GAME_WIDTH+DEAD_ZONE,GAME_HEIGHT+DEAD_ZONE)
+    centers=random.uniform(low,high,(n,2))
+    radii=random.choice(ASTEROID_RADII,n).astype(float)
+    points=random.uniform(low,high,(m,2))
+    return (centers,radii,points)
+
+
+def slowTouching(centers, radii, points, radius):
+    """
+    Returns the touching pairs as a sorted list of tuples (point, asteroid)
+
+    This tests every pair on its own, the short way around the wrapped world.
+
+    Parameter centers: the asteroid centers
+    Precondition: centers is a float array of shape (n,2)
+
+    Parameter radii: the asteroid radii
+    Precondition: radii is a float array of shape (n,)
+
+    Parameter points: the points to test
+    Precondition: points is a float array of shape (m,2)
+
+    Parameter radius: the radius of the points
+    Precondition: radius is a number >= 0
+    """
+    pairs=[]
+    for (i,(px,py)) in enumerate(points.tolist()):
+        for (j,(cx,cy)) in enumerate(centers.tolist()):
+            dx=(px-cx)-WORLD_WIDTH*round((px-cx)/WORLD_WIDTH)
+            dy=(py-cy)-WORLD_HEIGHT*round((py-cy)/WORLD_HEIGHT)
+            if dx*dx+dy*dy<=(radii[j]+radius)**2:
+                pairs.append((i,j))
+    return pairs
+
+
+def slowFirstHits(pairs):
+    """
+    Returns the collisions to act on as a list of tuples (point, asteroid)
+
+    Each point, in order, takes the first asteroid it touches that is not taken yet.
+
+    Parameter pairs: the touching pairs, in order of preference
+    Precondition: pairs is a list of tuples (point, asteroid), sorted by point
+    """
+    taken=set()
+    done=set()
+    hits=[]
+    for (point,asteroid) in pairs:
+        if point in done or asteroid in taken:
+            continue
+        taken.add(asteroid)
+        done.add(point)
+        hits.append((point,asteroid))
+    return hits
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_brute_force_matches_pairwise(seed):
+    """
+    Tests that BruteForce finds exactly the pairs found one at a time.
+    """
+    random=np.random.default_rng(seed)
+    (centers,radii,points)=randomField(random,60,80)
+    broadphase=BruteForce()
+    broadphase.update(centers,radii)
+    found=broadphase.touching(points,BULLET_RADIUS)
+    assert list(zip(*(a.tolist() for a in found)))==\
+        slowTouching(centers,radii,points,BULLET_RADIUS)
+
+
+def test_brute_force_blocks(monkeypatch):
+    """
+    Tests that BruteForce finds the same pairs when it works in many small blocks.
+    """
+    random=np.random.default_rng(7)
+    (centers,radii,points)=randomField(random,40,300)
+    broadphase=BruteForce()
+    broadphase.update(centers,radii)
+    whole=broadphase.touching(points,SHIP_RADIUS)
+    import physics
+    monkeypatch.setattr(physics,'BLOCK_PAIRS',len(centers)*3)
+    blocked=broadphase.touching(points,SHIP_RADIUS)
+    assert np.array_equal(whole[0],blocked[0])
+    assert np.array_equal(whole[1],blocked[1])
+
+
+def test_brute_force_wrap_seam():
+    """
+    Tests that BruteForce finds pairs that only touch across the edges of the world.
+    """
+    centers=np.array([[-DEAD_ZONE+1.0,100.0],[300.0,GAME_HEIGHT+DEAD_ZONE-1.0]])
+    radii=np.array([SMALL_RADIUS,SMALL_RADIUS],dtype=float)
+    points=np.array([[GAME_WIDTH+DEAD_ZONE-1.0,100.0],[300.0,-DEAD_ZONE+1.0],
+                     [GAME_WIDTH/2,GAME_HEIGHT/2]])
+    broadphase=BruteForce()
+    broadphase.update(centers,radii)
+    found=broadphase.touching(points,BULLET_RADIUS)
+    assert list(zip(*(a.tolist() for a in found)))==[(0,0),(1,1)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_first_hits_matches_loop(seed):
+    """
+    Tests that firstHits settles the touching pairs like a loop over the points.
+    """
+    random=np.random.default_rng(seed)
+    (centers,radii,points)=randomField(random,30,120)
+    pairs=slowTouching(centers,radii,points,SHIP_RADIUS)
+    assert pairs
+    (winners,targets)=firstHits(np.array([p for (p,a) in pairs],dtype=np.intp),
+                                np.array([a for (p,a) in pairs],dtype=np.intp))
+    assert list(zip(winners.tolist(),targets.tolist()))==slowFirstHits(pairs)
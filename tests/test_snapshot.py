@@ -0,0 +1,119 @@
+"""
+Tests for the snapshots of wave.py
+
+Wave.snapshot must capture everything that decides how a wave plays on. Restoring a
+snapshot and giving the same input again must give exactly the same states, byte for
+byte, whether the snapshot is restored on the wave it came from or on a new wave made
+from the same data.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from wave import *
+from replay import loadWave
+import numpy as np
+import pytest
+
+# The wave files to play
+WAVES = ('easy1.json', 'wave1.json', 'wave3.json')
+# The number of ticks to play before taking the snapshot
+LEAD = 300
+# The number of ticks to play after the snapshot
+TICKS = 300
+
+
+def randomInputs(seed, ticks):
+    """
+    Returns a list of random inputs, one for each tick, that fire most of the time.
+
+    Parameter seed: the seed of the inputs
+    Precondition: seed is an int
+
+    Parameter ticks: the number of inputs
+    Precondition: ticks is an int >= 0
+    """
+    random=np.random.default_rng(seed)
+    actions=random.integers(0,INPUT_KEYS+1,ticks)
+    actions|=INPUT_FIRE*(random.random(ticks)<0.7)
+    return actions.tolist()
+
+
+def play(wave, inputs):
+    """
+    Plays a wave with the given inputs, and returns the snapshot after each tick.
+
+    The ship is restored as soon as it is destroyed, while there are lives left.
+
+    Parameter wave: the wave to play
+    Precondition: wave is a Wave object
+
+    Parameter inputs: the input of each tick
+    Precondition: inputs is a list of int masks of the INPUT constants in consts.py
+    """
+    states=[]
+    for action in inputs:
+        if wave.getShip() is None and wave.getLives()>0:
+            wave.reset()
+        wave.step(action)
+        states.append(wave.snapshot())
+    return states
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('name', WAVES)
+def test_restore_replays(name, seed):
+    """
+    Tests that restoring a snapshot and replaying the same input gives the same states.
+    """
+    wave=Wave(loadWave(name), seed=seed)
+    play(wave, randomInputs(seed+100, LEAD))
+    blob=wave.snapshot()
+    inputs=randomInputs(seed, TICKS)
+    first=play(wave, inputs)
+    wave.restore(blob)
+    assert wave.snapshot()==blob
+    assert play(wave, inputs)==first
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('name', WAVES)
+def test_restore_on_new_wave(name, seed):
+    """
+    Tests that a snapshot restored on a new wave plays on like the original.
+    """
+    data=loadWave(name)
+    wave=Wave(data, seed=seed)
+    play(wave, randomInputs(seed+100, LEAD))
+    blob=wave.snapshot()
+    other=Wave(data, seed=seed+1)
+    other.restore(blob)
+    assert other.snapshot()==blob
+    inputs=randomInputs(seed, TICKS)
+    assert play(other, inputs)==play(wave, inputs)
+
+
+def test_restore_without_ship():
+    """
+    Tests snapshots taken while the ship is destroyed, restored on a wave with a ship.
+    """
+    data=loadWave('wave1.json')
+    wave=Wave(data, seed=0)
+    while wave.getShip()!=None:
+        wave.step(INPUT_FIRE|INPUT_LEFT)
+    blob=wave.snapshot()
+    other=Wave(data, seed=0)
+    other.restore(blob)
+    assert other.getShip() is None
+    assert other.snapshot()==blob
+    inputs=randomInputs(0, TICKS)
+    assert play(other, inputs)==play(wave, inputs)
+
+
+def test_restore_rejects_other_data():
+    """
+    Tests that restore refuses bytes that are not a snapshot.
+    """
+    wave=Wave(loadWave('easy1.json'), seed=0)
+    with pytest.raises(ValueError):
+        wave.restore(b'\0'*len(wave.snapshot()))
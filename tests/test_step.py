@@ -0,0 +1,122 @@
+"""
+Tests for steps of several ticks in wave.py
+
+A call of Wave.step with a scale of k must do what k calls with a scale of 1 do: the
+same ship position, the same lives, and the same asteroids hit. The one exception (see
+Wave.step) is an asteroid that breaks up before the last tick of a step, since its
+pieces only appear at the end of the step. Each test plays a session both ways with the
+same random input, compares them after every step, and fails on any difference that
+this exception does not explain. After such a step, the single ticks start over from
+the state of the long step (see Wave.snapshot), so the session goes on.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from wave import *
+from replay import loadWave
+import numpy as np
+import pytest
+
+# The wave files to play
+WAVES = ('easy1.json', 'easy2.json', 'wave1.json', 'wave2.json', 'wave3.json')
+# The number of ticks in each session
+TICKS = 900
+# The largest difference between two positions that are taken to be the same
+TOLERANCE = 1e-6
+
+
+def sameState(long, short):
+    """
+    Returns True if two waves have the same ship, lives and asteroids hit.
+
+    Parameter long: the wave stepped several ticks at a time
+    Precondition: long is a Wave object
+
+    Parameter short: the wave stepped one tick at a time
+    Precondition: short is a Wave object
+    """
+    if long.getLives()!=short.getLives() or long.getDestroyed()!=short.getDestroyed():
+        return False
+    if long.getAstLen()!=short.getAstLen() or len(long.getBullets())!=len(short.getBullets()):
+        return False
+    ship=long.getShip()
+    other=short.getShip()
+    if ship is None or other is None:
+        return ship is other
+    return (abs(ship.x-other.x)<=TOLERANCE and abs(ship.y-other.y)<=TOLERANCE and
+            ship.angle==other.angle)
+
+
+def stepShort(wave, inputs, ticks):
+    """
+    Steps a wave one tick at a time, and returns True if an asteroid broke up before
+    the last tick.
+
+    Parameter wave: the wave to step
+    Precondition: wave is a Wave object
+
+    Parameter inputs: the keys held down
+    Precondition: inputs is an int mask of the INPUT constants in consts.py
+
+    Parameter ticks: the number of ticks
+    Precondition: ticks is an int >= 0
+    """
+    early=False
+    for tick in range(ticks):
+        destroyed=wave.getDestroyed()
+        wave.step(inputs)
+        if tick<ticks-1 and wave.getDestroyed()!=destroyed:
+            early=True
+    return early
+
+
+@pytest.mark.parametrize('scale', (2, 3, 4, 8))
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('name', WAVES)
+def test_long_steps_match_single_ticks(name, seed, scale):
+    """
+    Tests that steps of several ticks match single ticks, except as documented.
+    """
+    data=loadWave(name)
+    long=Wave(data, seed=seed)
+    short=Wave(data, seed=seed)
+    random=np.random.default_rng(seed)
+    ticks=0
+    while ticks<TICKS:
+        inputs=int(random.integers(0,INPUT_KEYS+1))
+        if random.random()<0.7:
+            inputs|=INPUT_FIRE
+        if long.getShip() is None:
+            if long.getLives()==0:
+                break
+            long.reset()
+            short.reset()
+        done=long.step(inputs, scale)
+        early=stepShort(short, inputs, done)
+        ticks+=done
+        if not sameState(long, short):
+            assert early, 'diverged at tick %d without an early break-up' % ticks
+            short.restore(long.snapshot())
+    assert ticks>0
+
+
+def test_ship_hit_ends_step():
+    """
+    Tests that a step ends after the tick in which the ship is hit.
+
+    Turning and firing on wave1, the ship is first hit on tick 405, which is not at
+    the end of a step of 16 ticks.
+    """
+    data=loadWave('wave1.json')
+    long=Wave(data, seed=0)
+    short=Wave(data, seed=0)
+    ticks=0
+    while long.getShip()!=None and ticks<TICKS:
+        done=long.step(INPUT_FIRE|INPUT_LEFT, 16)
+        for tick in range(done):
+            assert short.getShip()!=None
+            short.step(INPUT_FIRE|INPUT_LEFT)
+        ticks+=done
+        assert sameState(long, short)
+    assert long.getShip() is None and done<16 and ticks==405
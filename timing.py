@@ -0,0 +1,325 @@
+"""
+Phase timing module for Planetoids
+
+This module contains the class PhaseTimer, which times the phases of Wave.update for
+every frame. Attach a timer to a wave with Wave.setTimer. A wave without a timer only
+pays a test against None for each phase, so timing can stay in the code of a release
+build and be turned on when a frame drop needs to be investigated.
+
+A sample is the time spent in each phase during a single frame (a call of Wave.update,
+or of Wave.step when it is called on its own), in nanoseconds. The timer keeps the last
+TIMING_SAMPLES samples in a ring buffer, and reports percentiles over them. The phases are
+
+    input            reading the keys
+    ship             turning, thrusting and moving the ship tick by tick, and finding
+                     the tick of a step in which the ship is hit (if any)
+    asteroids        moving the asteroids and updating the broadphase
+    bullets          firing and moving the bullets
+    bulletCollision  testing the bullets against the asteroids (without splits)
+    deleteBullet     deleting the spent bullets
+    shipCollision    testing the ship against the asteroids (without splits)
+    split            breaking up the asteroids that were hit
+
+followed by the total time of the frame. A sample also records the number of ticks run
+in the frame.
+
+The subclass TracedTimer also adds every phase to a Chrome trace (see game2d.Tracer).
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+import numpy as np
+import time
+
+# The names of the phases, in the order of the columns of a sample
+PHASES = ('input', 'ship', 'asteroids', 'bullets', 'bulletCollision', 'deleteBullet',
+          'shipCollision', 'split')
+
+# The column of each phase (use these in Wave rather than the names)
+PHASE_INPUT      = 0
+PHASE_SHIP       = 1
+PHASE_ASTEROIDS  = 2
+PHASE_BULLETS    = 3
+PHASE_COLLISION  = 4
+PHASE_DELETE     = 5
+PHASE_SHIP_HIT   = 6
+PHASE_SPLIT      = 7
+# The column of the total time of a frame
+PHASE_TOTAL      = len(PHASES)
+# The column of the number of ticks in a frame
+PHASE_TICKS      = len(PHASES)+1
+
+
+class PhaseTimer(object):
+    """
+    A class to time the phases of a wave, frame by frame.
+
+    A frame is opened with startFrame and closed with endFrame. In between, the wave
+    calls mark at the end of each phase, which charges the time since the previous mark
+    to that phase. A phase that runs inside another one (a split inside a collision)
+    is timed with begin and exclude instead, so it is not charged twice.
+
+    The ring buffer is a NumPy array written once per frame. The marks only touch a
+    Python list, so they cost about as much as a call of time.perf_counter_ns.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _samples: the ring buffer of samples
+    # Invariant: _samples is an int64 array of shape (capacity, len(PHASES)+2)
+    #
+    # Attribute _next: the row of _samples to write the next sample to
+    # Invariant: _next is an int in 0..capacity-1
+    #
+    # Attribute _count: the number of samples written so far
+    # Invariant: _count is an int >= 0 (only the last capacity samples are kept)
+    #
+    # Attribute _current: the sample of the open frame
+    # Invariant: _current is a list of len(PHASES)+2 ints
+    #
+    # Attribute _start: the time the open frame started, in nanoseconds
+    # Invariant: _start is an int, or None if no frame is open
+    #
+    # Attribute _last: the time of the last mark, in nanoseconds
+    # Invariant: _last is an int
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getCapacity(self):
+        """
+        Returns the number of samples kept by this timer.
+
+        The capacity is an int > 0.
+        """
+        return len(self._samples)
+
+    def getCount(self):
+        """
+        Returns the number of frames timed so far.
+
+        Only the last getCapacity() of them are kept. The count is an int >= 0.
+        """
+        return self._count
+
+    def getSamples(self):
+        """
+        Returns a copy of the samples kept, oldest first.
+
+        The samples are an int64 array with a row per frame. The columns are the phases
+        (in nanoseconds, in the order of PHASES), the total and the number of ticks.
+        """
+        n=min(self._count,len(self._samples))
+        if self._count<=len(self._samples):
+            return self._samples[:n].copy()
+        return np.roll(self._samples,-self._next,axis=0)
+
+    def isOpen(self):
+        """
+        Returns True if a frame is being timed.
+        """
+        return not self._start is None
+
+    # INITIALIZER TO CREATE A NEW TIMER
+    def __init__(self, capacity=TIMING_SAMPLES):
+        """
+        Initializes an empty timer.
+
+        Parameter capacity: the number of samples to keep
+        Precondition: capacity is an int > 0
+        """
+        self._samples=np.zeros((capacity,len(PHASES)+2),np.int64)
+        self._next=0
+        self._count=0
+        self._current=[0]*(len(PHASES)+2)
+        self._start=None
+        self._last=0
+
+    # ADDITIONAL METHODS
+    def startFrame(self):
+        """
+        Opens a new frame, and returns True if it did.
+
+        If a frame is already open, this method does nothing and returns False. So a
+        step run by update belongs to the frame of update, while a step called on its
+        own is a frame of its own.
+        """
+        if not self._start is None:
+            return False
+        current=self._current
+        for i in range(len(current)):
+            current[i]=0
+        self._start=self._last=time.perf_counter_ns()
+        return True
+
+    def endFrame(self, ticks=1):
+        """
+        Closes the open frame and writes its sample to the ring buffer.
+
+        Parameter ticks: the number of ticks run in the frame
+        Precondition: ticks is an int >= 0
+        """
+        current=self._current
+        current[PHASE_TOTAL]=time.perf_counter_ns()-self._start
+        current[PHASE_TICKS]=ticks
+        self._samples[self._next]=current
+        self._next=(self._next+1)%len(self._samples)
+        self._count+=1
+        self._start=None
+
+    def mark(self, phase):
+        """
+        Charges the time since the last mark to the given phase.
+
+        Parameter phase: the phase that just ended
+        Precondition: phase is one of the PHASE constants
+        """
+        now=time.perf_counter_ns()
+        self._current[phase]+=now-self._last
+        self._last=now
+
+    def begin(self):
+        """
+        Returns the start time of a nested phase, to pass to exclude.
+        """
+        return time.perf_counter_ns()
+
+    def exclude(self, phase, start):
+        """
+        Charges the time since start to a nested phase and not to the enclosing one.
+
+        Parameter phase: the nested phase that just ended
+        Precondition: phase is one of the PHASE constants
+
+        Parameter start: the start of the nested phase
+        Precondition: start is an int returned by begin since the last mark
+        """
+        elapsed=time.perf_counter_ns()-start
+        self._current[phase]+=elapsed
+        self._last+=elapsed
+
+    def percentiles(self, levels=(50, 95, 99)):
+        """
+        Returns the given percentiles of every phase over the samples kept.
+
+        The result is a dictionary from the names in PHASES (and 'total') to tuples of
+        times in microseconds, one per level. It is empty if no frame was timed.
+
+        Parameter levels: the percentiles to compute
+        Precondition: levels is a tuple of numbers in 0..100
+        """
+        samples=self.getSamples()
+        if len(samples)==0:
+            return {}
+        values=np.percentile(samples[:,:PHASE_TICKS],levels,axis=0)/1000.0
+        names=PHASES+('total',)
+        return {names[i]:(*values[:,i].tolist(),) for i in range(len(names))}
+
+    def clear(self):
+        """
+        Deletes all of the samples kept.
+        """
+        self._next=0
+        self._count=0
+        self._start=None
+
+    def dump(self, filename):
+        """
+        Writes the samples kept to a CSV file, oldest first.
+
+        The file has a header row, then a row per frame: the frame number, the number of
+        ticks, the time of every phase and the total, in microseconds.
+
+        Parameter filename: the file to write
+        Precondition: filename is a string
+        """
+        samples=self.getSamples()
+        first=self._count-len(samples)
+        with open(filename,'w') as file:
+            file.write(','.join(('frame','ticks')+PHASES+('total',))+'\n')
+            for i in range(len(samples)):
+                row=samples[i]
+                times=','.join('%.3f' % (value/1000.0) for value in row[:PHASE_TICKS])
+                file.write('%d,%d,%s\n' % (first+i,row[PHASE_TICKS],times))
+
+
+class TracedTimer(PhaseTimer):
+    """
+    A class to time the phases of a wave and also add them to a trace.
+
+    Every phase becomes an event of the trace, nested in an event for the whole frame.
+    A split is shown inside the collision that caused it, while its time is still
+    taken out of that collision in the samples.
+
+    The tracer is any object with the method complete of game2d.Tracer. This module
+    does not import game2d, so that waves can still run without a window.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _tracer: the tracer to add the events to
+    # Invariant: _tracer has a method complete(name, cat, start, end)
+    #
+    # Attribute _begun: the time the current phase started, in nanoseconds
+    # Invariant: _begun is an int (unlike _last, it is not moved by exclude)
+
+    # INITIALIZER TO CREATE A NEW TIMER
+    def __init__(self, tracer, capacity=TIMING_SAMPLES):
+        """
+        Initializes an empty timer that adds its phases to a trace.
+
+        Parameter tracer: the tracer to add the events to
+        Precondition: tracer is a game2d.Tracer, or an object with the same method complete
+
+        Parameter capacity: the number of samples to keep
+        Precondition: capacity is an int > 0
+        """
+        super().__init__(capacity)
+        self._tracer=tracer
+        self._begun=0
+
+    # ADDITIONAL METHODS
+    def startFrame(self):
+        """
+        Opens a new frame, and returns True if it did.
+
+        See PhaseTimer.startFrame.
+        """
+        opened=super().startFrame()
+        if opened:
+            self._begun=self._last
+        return opened
+
+    def endFrame(self, ticks=1):
+        """
+        Closes the open frame, writes its sample and adds the frame to the trace.
+
+        Parameter ticks: the number of ticks run in the frame
+        Precondition: ticks is an int >= 0
+        """
+        start=self._start
+        super().endFrame(ticks)
+        self._tracer.complete('Wave.update','wave',start,time.perf_counter_ns())
+
+    def mark(self, phase):
+        """
+        Charges the time since the last mark to the given phase, and traces the phase.
+
+        Parameter phase: the phase that just ended
+        Precondition: phase is one of the PHASE constants
+        """
+        now=time.perf_counter_ns()
+        self._current[phase]+=now-self._last
+        self._last=now
+        self._tracer.complete(PHASES[phase],'wave',self._begun,now)
+        self._begun=now
+
+    def exclude(self, phase, start):
+        """
+        Charges the time since start to a nested phase, and traces the nested phase.
+
+        Parameter phase: the nested phase that just ended
+        Precondition: phase is one of the PHASE constants
+
+        Parameter start: the start of the nested phase
+        Precondition: start is an int returned by begin since the last mark
+        """
+        now=time.perf_counter_ns()
+        self._current[phase]+=now-start
+        self._last+=now-start
+        self._tracer.complete(PHASES[phase],'wave',start,now)
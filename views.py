@@ -0,0 +1,279 @@
+"""
+Views module for Planetoids
+
+This module contains the view adapters for the Planetoids game. The models in models.py
+are plain data objects that do not know how to draw themselves. The classes in this
+module are thin GImage/GQuad/GEllipse wrappers that mirror the state of a model (position
+and angle) right before it is drawn.
+
+The simulation runs at a fixed tick rate, which need not match the frame rate. So the
+adapters do not copy the position of the last tick as is. They blend the last two ticks
+by the alpha of the wave clock, drawing each model up to one tick behind the simulation
+but always moving smoothly. Every model moves in a straight line during a tick, so the
+position of the previous tick follows from the velocity and nothing extra is stored.
+Likewise, the angle of the ship on the previous tick follows from its spin.
+
+The asteroid adapters are GQuads rather than GImages, since there can be a great many
+of them. If BATCH_ASTEROIDS is True, the asteroids are not drawn with adapters at all. The
+asteroids of each size are drawn as a single GSpriteBatch, whose quads come straight
+from the arrays of the AsteroidField.
+
+This is the only module (other than app.py) that imports game2d, and hence Kivy. The
+class Wave imports it lazily in its draw method, so that a wave that is never drawn
+never pays for any graphics objects.
+
+# Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
+# 08-Dec-2022
+"""
+from consts import *
+from game2d import *
+
+# PRIMARY RULE: Views may only read models through their getters and the attributes
+# x, y and angle. Views never change a model.
+
+
+class ShipView(GImage):
+    """
+    A class to draw the game ship.
+
+    The view is an image whose size is determined by constants in consts.py. Use the
+    method sync to copy the position and angle of a Ship before drawing.
+    """
+
+    # INITIALIZER TO CREATE A NEW SHIP VIEW
+    def __init__(self):
+        """
+        Initializes a ShipView object.
+        """
+        super().__init__(source=SHIP_IMAGE)
+        self.width=SHIP_RADIUS*2
+        self.height=SHIP_RADIUS*2
+
+    # ADDITIONAL METHODS
+    def sync(self, ship, alpha=1.0):
+        """
+        Copies the position and angle of the ship into this view.
+
+        Both are blended from the previous tick by alpha. The angle is blended by the
+        turn of the last tick (the spin), which is always the short way around.
+
+        Parameter ship: the ship to mirror
+        Precondition: ship is an instance of Ship
+
+        Parameter alpha: the fraction of the way from the previous tick to the last
+        Precondition: alpha is a float in [0,1]
+        """
+        velocity=ship.getVelocity()
+        self.x=ship.x-velocity.x*(1-alpha)
+        self.y=ship.y-velocity.y*(1-alpha)
+        self.angle=ship.angle-ship.getSpin()*(1-alpha)
+
+
+class AsteroidView(GQuad):
+    """
+    A class to draw a single asteroid.
+
+    The image and the size of the view are determined by the size code of the asteroid
+    (the index in ASTEROID_SIZES). Asteroids are rows of an AsteroidField, not objects,
+    so use the method sync to copy the position of a row before drawing.
+
+    GQuad has no instance dictionary, so the attributes of this class are slots.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _code: the size code of the asteroids this view draws
+    # Invariant: _code is an int in 0..2
+    __slots__ = ('_code',)
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getSize(self):
+        """
+        Returns the size code of the asteroids this view draws.
+
+        The size code is an int in 0..2.
+        """
+        return self._code
+
+    # INITIALIZER TO CREATE A NEW ASTEROID VIEW
+    def __init__(self, size):
+        """
+        Initializes an AsteroidView object.
+
+        Parameter size: size code of the asteroid
+        Precondition: size is an int in 0..2
+        """
+        super().__init__(ASTEROID_IMAGES[size], ASTEROID_RADII[size]*2)
+        self._code=size
+
+    # ADDITIONAL METHODS
+    def sync(self, x, y):
+        """
+        Copies the position of an asteroid into this view.
+
+        Parameter x: the horizontal coordinate of the asteroid center
+        Precondition: x is a number
+
+        Parameter y: the vertical coordinate of the asteroid center
+        Precondition: y is a number
+        """
+        self.x=x
+        self.y=y
+
+
+class BulletView(GEllipse):
+    """
+    A class to draw a bullet from the ship.
+
+    The view is a circle whose size and color are determined by constants in consts.py.
+    Use the method sync to copy the position of a Bullet before drawing.
+    """
+
+    # INITIALIZER TO CREATE A NEW BULLET VIEW
+    def __init__(self):
+        """
+        Initializes a BulletView object.
+        """
+        super().__init__()
+        self.fillcolor=BULLET_COLOR
+        self.width=BULLET_RADIUS*2
+        self.height=BULLET_RADIUS*2
+
+    # ADDITIONAL METHODS
+    def sync(self, bullet, alpha=1.0):
+        """
+        Copies the position of the bullet into this view.
+
+        Parameter bullet: the bullet to mirror
+        Precondition: bullet is an instance of Bullet
+
+        Parameter alpha: the fraction of the way from the previous tick to the last
+        Precondition: alpha is a float in [0,1]
+        """
+        last=bullet.getLast()
+        self.x=last[0]+(bullet.x-last[0])*alpha
+        self.y=last[1]+(bullet.y-last[1])*alpha
+
+
+class WaveView(object):
+    """
+    A class to draw all of the models of a wave.
+
+    An adapter only remembers a position, so adapters of the same kind are
+    interchangeable. This class keeps a list of adapters for each kind of drawable and
+    reuses them from frame to frame, making more only when there are more models on
+    screen than ever before. So a model only ever gets a drawable if it is drawn.
+
+    An asteroid keeps the same adapter for as long as it exists (adapters are found by
+    the asteroid id), and the adapters of destroyed asteroids are kept for new ones. So
+    the drawables on screen only change where asteroids break up, which is all that a
+    view in retained mode has to redraw (see GView).
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _ship: the view of the ship
+    # Invariant: _ship is a ShipView object, or None if no ship was drawn yet
+    #
+    # Attribute _asteroids: the views of the asteroids drawn last frame, by asteroid id
+    # Invariant: _asteroids is a dict of int to AsteroidView
+    #
+    # Attribute _spare: the views not in use, one list per size code
+    # Invariant: _spare is a list of three lists of AsteroidView
+    #
+    # Attribute _batches: the batches that draw the asteroids, one per size code
+    # Invariant: _batches is a list of three GSpriteBatch, or None if BATCH_ASTEROIDS
+    #            is False or no asteroids were drawn yet
+    #
+    # Attribute _bullets: the views of the bullets
+    # Invariant: _bullets is a list of BulletView
+
+    # INITIALIZER TO CREATE A NEW WAVE VIEW
+    def __init__(self):
+        """
+        Initializes a WaveView object with no adapters.
+        """
+        self._ship=None
+        self._asteroids={}
+        self._spare=[[],[],[]]
+        self._batches=None
+        self._bullets=[]
+
+    # DRAW METHOD TO DRAW THE SHIP, ASTEROIDS, AND BULLETS
+    def draw(self, wave, view, alpha=1.0):
+        """
+        Mirrors the models of the wave into their adapters and draws them.
+
+        Parameter wave: the wave to draw
+        Precondition: wave is an instance of Wave
+
+        Parameter view: the game view
+        Precondition: view is an instance of GView
+
+        Parameter alpha: the fraction of the way from the previous tick to the last
+        Precondition: alpha is a float in [0,1]
+        """
+        ship=wave.getShip()
+        if ship!=None:
+            if self._ship is None:
+                self._ship=ShipView()
+            self._ship.sync(ship, alpha)
+            self._ship.draw(view)
+        field=wave.getAsteroids()
+        positions=field.getPositions()
+        if alpha!=1.0:
+            positions=positions-field.getVelocities()*(1-alpha)
+        if BATCH_ASTEROIDS:
+            self._drawBatches(view, positions, field.getSizes())
+        else:
+            self._drawAsteroids(view, positions, field)
+        bullets=wave.getBullets()
+        while len(self._bullets)<len(bullets):
+            self._bullets.append(BulletView())
+        for bullet,adapter in zip(bullets,self._bullets):
+            adapter.sync(bullet, alpha)
+            adapter.draw(view)
+
+    # HELPER METHODS
+    def _drawBatches(self, view, positions, sizes):
+        """
+        Draws the asteroids as one batch per size.
+
+        Parameter view: the game view
+        Precondition: view is an instance of GView
+
+        Parameter positions: the positions to draw the asteroids at
+        Precondition: positions is a float array of shape (n,2)
+
+        Parameter sizes: the size codes of the asteroids
+        Precondition: sizes is an int array of shape (n,)
+        """
+        if self._batches is None:
+            self._batches=[GSpriteBatch(image) for image in ASTEROID_IMAGES]
+        for size,batch in enumerate(self._batches):
+            batch.update(positions[sizes==size], ASTEROID_RADII[size]*2)
+            batch.draw(view)
+
+    def _drawAsteroids(self, view, positions, field):
+        """
+        Draws the asteroids with an adapter each.
+
+        Parameter view: the game view
+        Precondition: view is an instance of GView
+
+        Parameter positions: the positions to draw the asteroids at
+        Precondition: positions is a float array of shape (n,2)
+
+        Parameter field: the asteroids
+        Precondition: field is an AsteroidField with n asteroids
+        """
+        old=self._asteroids
+        new={}
+        for (x,y),size,id in zip(positions.tolist(),field.getSizes().tolist(),\
+        field.getIds().tolist()):
+            adapter=old.pop(id,None)
+            if adapter is None:
+                spare=self._spare[size]
+                adapter=spare.pop() if spare else AsteroidView(size)
+            new[id]=adapter
+            adapter.sync(x,y)
+            adapter.draw(view)
+        for (id,adapter) in old.items():
+            self._spare[adapter.getSize()].append(adapter)
+        self._asteroids=new
@@ -9,6 +9,10 @@ expected to make a new instance of the class.
 The subcontroller Wave manages the ship, the asteroids, and any bullets on screen. These 
 are model objects. Their classes are defined in models.py.
 
+The simulation never touches Kivy. The method step advances the wave by one tick from
+an input mask (see the INPUT constants in consts.py), so a Wave can run without a window.
+Only the method draw imports the view adapters in views.py, and it does so lazily.
+
 Most of your work on this assignment will be in either this module or models.py.
 Whether a helper method belongs in this module or models.py is often a complicated
 issue.  If you do not know, ask on Ed Discussions and we will answer.
@@ -16,16 +20,147 @@ issue.  If you do not know, ask on Ed Discussions and we will answer.
 # Harshvardhan Maskara (hm475) and Sia Chitnis (sc2665)
 # 08-Dec-2022
 """
-from game2d import *
 from consts import *
 from models import *
+from physics import *
+from timing import *
+import numpy as np
+import heapq
 import random
+import struct
 import datetime
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Level is NOT allowed to access anything in app.py (Subcontrollers are not permitted
 # to access anything in their parent. To see why, take CS 3152)
 
+# The layout of a snapshot header: magic, version, lives, firerate, tick, fired, the next
+# asteroid id, the gauss_next of the random generator (NaN if None), whether there is a
+# ship, the number of asteroids and the number of bullets
+_SNAPSHOT = struct.Struct('<4sHiiqqqdBII')
+# The layout of the ship state in a snapshot (see Ship.getState)
+_SHIP = struct.Struct('<7d')
+
+
+# HELPER FUNCTION FOR INPUT CONVERSION
+def inputMask(input):
+    """
+    Returns the input mask for the keys currently held down.
+
+    The mask is an int combining INPUT_LEFT, INPUT_RIGHT, INPUT_THRUST and INPUT_FIRE.
+
+    Parameter input: the user input
+    Precondition: input is an instance of GInput
+    """
+    mask=0
+    if input.is_key_down('left'):
+        mask|=INPUT_LEFT
+    if input.is_key_down('right'):
+        mask|=INPUT_RIGHT
+    if input.is_key_down('up'):
+        mask|=INPUT_THRUST
+    if input.is_key_down('spacebar'):
+        mask|=INPUT_FIRE
+    return mask
+
+
+class StepClock(object):
+    """
+    A class to turn the time between frames into fixed simulation ticks.
+
+    The time of every frame is added to an accumulator, and the clock hands out one
+    tick for every 1/TICK_RATE seconds in it. So the game runs at the same speed
+    whatever the frame rate: a fast frame may get no ticks at all, and a slow frame
+    gets several to catch up. A frame never gets more than a fixed number of ticks;
+    any time beyond that is dropped, so that one long stall does not freeze the game
+    in a spiral of catching up.
+
+    The time left in the accumulator after the ticks is the alpha, the fraction of the
+    way from the last tick to the next one. Drawing blends the last two ticks by alpha
+    so motion stays smooth when the frame rate is not a multiple of the tick rate.
+    """
+    # LIST ANY ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # Attribute _period: the length of a tick in seconds
+    # Invariant: _period is a float > 0
+    #
+    # Attribute _catchup: the most ticks to hand out in a single frame
+    # Invariant: _catchup is an int >= 1
+    #
+    # Attribute _accum: the frame time not yet turned into ticks, in seconds
+    # Invariant: _accum is a float with 0 <= _accum < _period
+    #
+    # Attribute _ticks: the number of ticks handed out so far
+    # Invariant: _ticks is an int >= 0
+    #
+    # Attribute _dropped: the number of ticks dropped to keep within _catchup
+    # Invariant: _dropped is an int >= 0
+
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getAlpha(self):
+        """
+        Returns the fraction of the way from the last tick to the next one.
+
+        The alpha is a float in [0,1).
+        """
+        return self._accum/self._period
+
+    def getTicks(self):
+        """
+        Returns the number of ticks handed out so far.
+
+        The ticks are an int >= 0.
+        """
+        return self._ticks
+
+    def getDropped(self):
+        """
+        Returns the number of ticks dropped because a frame was too slow.
+
+        The dropped ticks are an int >= 0.
+        """
+        return self._dropped
+
+    # INITIALIZER TO CREATE A NEW CLOCK
+    def __init__(self, rate=TICK_RATE, catchup=MAX_CATCHUP):
+        """
+        Initializes a clock with an empty accumulator.
+
+        Parameter rate: the number of ticks per second
+        Precondition: rate is a number > 0
+
+        Parameter catchup: the most ticks to hand out in a single frame
+        Precondition: catchup is an int >= 1
+        """
+        self._period=1.0/rate
+        self._catchup=catchup
+        self._accum=0.0
+        self._ticks=0
+        self._dropped=0
+
+    # ADDITIONAL METHODS
+    def advance(self, dt):
+        """
+        Returns the number of ticks to simulate for a frame of dt seconds.
+
+        Parameter dt: the time in seconds since the last frame
+        Precondition: dt is a number >= 0
+        """
+        self._accum+=dt
+        ticks=int(self._accum/self._period)
+        self._accum-=ticks*self._period
+        if ticks>self._catchup:
+            self._dropped+=ticks-self._catchup
+            ticks=self._catchup
+        self._ticks+=ticks
+        return ticks
+
+    def reset(self):
+        """
+        Empties the accumulator, so that the next tick is a full period away.
+        """
+        self._accum=0.0
+
+
 class Wave(object):
     """
     This class controls a single level or wave of Planetoids.
@@ -60,7 +195,7 @@ class Wave(object):
     # Invariant: _ship is a Ship object
     #
     # Attribute _asteroids: the asteroids on screen 
-    # Invariant: _asteroids is a list of Asteroid, possibly empty
+    # Invariant: _asteroids is an AsteroidField, possibly empty
     #
     # Attribute _bullets: the bullets currently on screen 
     # Invariant: _bullets is a list of Bullet, possibly empty
@@ -70,6 +205,38 @@ class Wave(object):
     #
     # Attribute _firerate: the number of frames until the player can fire again 
     # Invariant: _firerate is an int >= 0
+    #
+    # Attribute _view: the adapter that mirrors the models into drawables
+    # Invariant: _view is a WaveView object, or None if the wave was never drawn
+    #
+    # Attribute _broadphase: the collision broadphase over the asteroids
+    # Invariant: _broadphase is a broadphase (see physics.py) kept up to date with
+    #            _asteroids whenever the asteroids move or break up
+    #
+    # Attribute _clock: the clock that turns frame times into ticks
+    # Invariant: _clock is a StepClock object
+    #
+    # Attribute _bulletPool: the pool that recycles spent bullets
+    # Invariant: _bulletPool is a Pool of Bullet objects, none of which are in _bullets
+    #
+    # Attribute _tick: the number of ticks the bullets have moved so far
+    # Invariant: _tick is an int >= 0
+    #
+    # Attribute _expiring: the bullets in order of expiry
+    # Invariant: _expiring is a heap of (expiry, serial, bullet) tuples, with an entry 
+    #            for every bullet in _bullets whose expiry is that of the bullet (it may
+    #            also hold stale entries for bullets that are no longer in play)
+    #
+    # Attribute _fired: the number of bullets fired so far (to break ties in _expiring)
+    # Invariant: _fired is an int >= 0
+    #
+    # Attribute _random: the random generator of this wave
+    # Invariant: _random is a random.Random object. Any randomness in the wave must 
+    #            come from it (never the random module itself), so a seeded wave is
+    #            reproducible
+    #
+    # Attribute _timer: the timer of the phases of each frame
+    # Invariant: _timer is a PhaseTimer object, or None if the wave is not timed
     
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     def getShip(self):
@@ -96,13 +263,83 @@ class Wave(object):
         """
         return len(self._asteroids)
 
+    def getAsteroids(self):
+        """
+        Returns the asteroids of this wave.
+
+        The asteroids are an AsteroidField object, possibly empty.
+        """
+        return self._asteroids
+
+    def getBullets(self):
+        """
+        Returns the bullets of this wave.
+
+        The bullets are a list of Bullet objects, possibly empty.
+        """
+        return self._bullets
+
+    def getDestroyed(self):
+        """
+        Returns the number of asteroids destroyed so far (by bullets or the ship).
+
+        Every asteroid that ever existed got a new id, so this is the number of ids
+        handed out minus the number of asteroids left. The value is an int >= 0.
+        """
+        return self._asteroids.getNextId()-len(self._asteroids)
+
+    def getBulletPool(self):
+        """
+        Returns the pool that recycles the bullets of this wave.
+
+        The pool is a Pool object. Use it to read the pool statistics or change its cap.
+        """
+        return self._bulletPool
+
+    def getClock(self):
+        """
+        Returns the simulation clock of this wave.
+
+        The clock is a StepClock object.
+        """
+        return self._clock
+
+    def getTimer(self):
+        """
+        Returns the phase timer of this wave.
+
+        The timer is a PhaseTimer object, or None if the wave is not timed.
+        """
+        return self._timer
+
+    def setTimer(self, value):
+        """
+        Sets the phase timer of this wave.
+
+        The same timer may be given to several waves in turn, to time a whole game.
+
+        Parameter value: the timer to record the phases of each frame in
+        Precondition: value is a PhaseTimer object, or None to stop timing
+        """
+        self._timer=value
+
     # INITIALIZER (standard form) TO CREATE SHIP AND ASTEROIDS
-    def __init__(self, data):
+    def __init__(self, data, broadphase=None, seed=None):
         """
         Initializes a wave object from the given data. 
 
+        Two waves made from the same data and seed behave exactly the same when they
+        are given the same inputs. See replay.py.
+
         Parameter data: the dictionary defining the wave
         Precondition: data is a JSON file
+
+        Parameter broadphase: the collision broadphase (if None, a BruteForce for waves
+        of at most BRUTE_FORCE_WAVE asteroids, and a SpatialHash otherwise)
+        Precondition: broadphase is None or a broadphase object (see physics.py)
+
+        Parameter seed: the seed of the random generator (the system time if None)
+        Precondition: seed is None or an int
         """
         self._lives=3
         self._data=data
@@ -110,59 +347,234 @@ class Wave(object):
         position=ship["position"]
         angle=ship["angle"]
         self._ship=Ship(position, angle)
-        self._asteroids=[]
+        self._asteroids=AsteroidField()
         asteroids_list=self._data["asteroids"]
-        for asteroid in asteroids_list:
-            size=asteroid["size"]
-            pos=asteroid["position"]
-            dir=asteroid["direction"]
-            self._asteroids.append(Asteroid(size, pos, dir))
+        sizes=[sizeCode(asteroid["size"]) for asteroid in asteroids_list]
+        pos=[asteroid["position"] for asteroid in asteroids_list]
+        dir=[asteroid["direction"] for asteroid in asteroids_list]
+        self._asteroids.spawn(sizes, pos, dir)
         self._bullets=[]
+        self._bulletPool=Pool(Bullet, BULLET_POOL_CAP)
+        self._tick=0
+        self._expiring=[]
+        self._fired=0
         self._firerate=0
-        
+        self._view=None
+        if broadphase is None and len(asteroids_list)<=BRUTE_FORCE_WAVE:
+            broadphase=BruteForce()
+        elif broadphase is None:
+            broadphase=SpatialHash()
+        self._broadphase=broadphase
+        self._broadphase.update(self._asteroids.getPositions(),self._asteroids.getRadii())
+        self._clock=StepClock()
+        self._random=random.Random(seed)
+        self._timer=None
+
     # UPDATE METHOD TO MOVE THE SHIP, ASTEROIDS, AND BULLETS
-    def update(self, input):
+    def update(self, input, dt=None):
         """
         Animates a single frame in the game.
 
+        If dt is None, the frame is exactly one tick. Otherwise the clock decides how
+        many ticks fit in dt seconds (possibly none), and the wave steps that many
+        times with the same input. The ticks stop early if the ship is destroyed.
+        This method returns the number of ticks it advanced.
+
         Parameter input: the user input
         Precondition: input is an instance of GInput
+
+        Parameter dt: the time in seconds since the last frame
+        Precondition: dt is None or a number >= 0
         """
-        if self._ship!=None:
-            self._firerate+=1
-            if input.is_key_down('left'):
-                self._ship.turn(True)
-            if input.is_key_down('right'):
-                self._ship.turn(False)
-            if input.is_key_down('up'):
-                self._ship.velocity()
-            self._ship.move()
-            for asteroid in self._asteroids:
-                asteroid.move()
-            if input.is_key_down('spacebar'):
-                if self._firerate>=BULLET_RATE:
-                    self._bullets.append(Bullet(self._ship.getFacing(),\
-                    self._ship.getPosition()))
-                    self._firerate=0
-            for bullet in self._bullets:
-                bullet.move()
-            self._deleteBullet()
-            self._detectBulletCollision()
-            self._detectShipCollision()
+        timer=self._timer
+        if timer:
+            timer.startFrame()
+        inputs=inputMask(input)
+        if dt is None:
+            self.step(inputs)
+            ticks=1
+        else:
+            ticks=0
+            for tick in range(self._clock.advance(dt)):
+                if self._ship is None:
+                    break
+                self.step(inputs)
+                ticks+=1
+        if timer:
+            timer.endFrame(ticks)
+        return ticks
+
+    def step(self, inputs, scale=1):
+        """
+        Advances the simulation by a single tick, or by scale ticks at once, and returns
+        the number of ticks it advanced.
+
+        This method does not need a window. It is the headless version of update.
+
+        The keys are taken to be held down for the whole step. The ship is steered and
+        moved one tick at a time, and fires every bullet that comes due, from where it
+        was on that tick. The asteroids and bullets move the whole step at once, and are
+        tested along the paths they swept (see sweptHits in physics.py). A bullet only
+        sweeps the ticks from when it was fired to when it leaves the screen. The ship is
+        tested at the end of every tick (see sampledHits), and the step ends early, after
+        the tick in which the ship is hit, just as update stops once the ship is gone.
+
+        A step of several ticks is not exactly the same as that many single ticks. The
+        asteroids that break up during a step do so at the end of it (their pieces are
+        placed where they would be by then), so the pieces cannot be hit, or hit the 
+        ship, before the last tick. Two bullets that reach the same asteroid are settled
+        in the order of the bullets, not of the impacts. And positions may differ by 
+        rounding, since a motion over several ticks is a single multiplication. So the
+        result of a session stays close to that of single ticks, but may not match it.
+
+        Parameter inputs: the keys held down during this step
+        Precondition: inputs is an int mask of the INPUT constants in consts.py
+
+        Parameter scale: the number of ticks to advance
+        Precondition: scale is an int >= 1
+        """
+        timer=self._timer
+        opened=timer.startFrame() if timer else False
+        if self._ship is None:
+            if opened:
+                timer.endFrame(0)
+            return 0
+        if timer:
+            timer.mark(PHASE_INPUT)
+        (path,shots,history)=self._steer(inputs, scale)
+        hit=self._findShipHit(path) if scale>1 else scale
+        if hit<scale-1:
+            # Nothing happens after the tick in which the ship is hit
+            scale=hit+1
+            shots=[shot for shot in shots if shot[0]<scale]
+            self._ship.setState(history[hit][0])
+            self._firerate=history[hit][1]
+        if timer:
+            timer.mark(PHASE_SHIP)
+        self._asteroids.move(scale)
+        self._broadphase.update(self._asteroids.getPositions(),\
+        self._asteroids.getRadii())
+        if timer:
+            timer.mark(PHASE_ASTEROIDS)
+        spans=self._moveBullets(shots, scale)
+        if timer:
+            timer.mark(PHASE_BULLETS)
+        hit=self._detectBulletCollision(scale, spans)
+        if timer:
+            timer.mark(PHASE_COLLISION)
+        self._deleteBullet(hit)
+        if timer:
+            timer.mark(PHASE_DELETE)
+        self._detectShipCollision()
+        if timer:
+            timer.mark(PHASE_SHIP_HIT)
+        if opened:
+            timer.endFrame(scale)
+        return scale
         
     # DRAW METHOD TO DRAW THE SHIP, ASTEROIDS, AND BULLETS
     def draw(self, view):
         """
         Draws the game objects to the view.
 
+        The objects are drawn between the last two ticks, as given by the alpha of the
+        clock. So they are up to one tick behind the simulation.
+
         Parameter view: the game view
         Precondition: view is an instance of GView
         """
-        self._ship.draw(view)
-        for asteroid in self._asteroids:
-            asteroid.draw(view)
+        if self._view is None:
+            from views import WaveView
+            self._view=WaveView()
+        self._view.draw(self, view, self._clock.getAlpha())
+
+    # SNAPSHOT METHODS TO SAVE AND RESTORE THE STATE
+    def snapshot(self):
+        """
+        Returns the complete state of this wave as a compact binary blob.
+
+        The state is the ship, the lives, the fire rate, every asteroid and bullet, and
+        the random generator. It is packed with struct and the raw bytes of the asteroid
+        arrays, so it costs little more than copying those arrays. The wave data, the
+        broadphase and the clock are not part of the state.
+
+        Give the blob to restore (on this wave or any wave made from the same data) to
+        go back to this state.
+        """
+        field=self._asteroids
+        (version,internal,gauss)=self._random.getstate()
+        ship=self._ship
+        header=_SNAPSHOT.pack(SNAPSHOT_MAGIC,SNAPSHOT_VERSION,self._lives,self._firerate,
+                              self._tick,self._fired,field.getNextId(),
+                              math.nan if gauss is None else gauss,ship!=None,
+                              len(field),len(self._bullets))
+        bullets=np.array([bullet.getState() for bullet in self._bullets],dtype='<f8')
+        return b''.join((header,
+            _SHIP.pack(*(ship.getState() if ship!=None else (0.0,)*7)),
+            np.array(internal,dtype='<u4').tobytes(),
+            field.getPositions().astype('<f8',copy=False).tobytes(),
+            field.getVelocities().astype('<f8',copy=False).tobytes(),
+            field.getSizes().tobytes(),
+            field.getIds().astype('<i8',copy=False).tobytes(),
+            bullets.tobytes()))
+
+    def restore(self, blob):
+        """
+        Restores the complete state of this wave from a snapshot.
+
+        The wave must have been made from the same data as the wave of the snapshot.
+        The clock starts a fresh frame.
+
+        Parameter blob: the state to restore
+        Precondition: blob is a bytes object returned by snapshot
+        """
+        (magic,version,lives,firerate,tick,fired,nextId,gauss,hasShip,n,m)=\
+        _SNAPSHOT.unpack_from(blob)
+        if magic!=SNAPSHOT_MAGIC or version!=SNAPSHOT_VERSION:
+            raise ValueError('blob is not a wave snapshot (version %d)' % SNAPSHOT_VERSION)
+        at=_SNAPSHOT.size
+        ship=_SHIP.unpack_from(blob,at)
+        at+=_SHIP.size
+        internal=np.frombuffer(blob,'<u4',625,at)
+        at+=internal.nbytes
+        pos=np.frombuffer(blob,'<f8',2*n,at)
+        at+=pos.nbytes
+        vel=np.frombuffer(blob,'<f8',2*n,at)
+        at+=vel.nbytes
+        sizes=np.frombuffer(blob,np.int8,n,at)
+        at+=sizes.nbytes
+        ids=np.frombuffer(blob,'<i8',n,at)
+        at+=ids.nbytes
+        bullets=np.frombuffer(blob,'<f8',7*m,at).reshape(m,7)
+        self._lives=lives
+        self._firerate=firerate
+        self._tick=tick
+        self._fired=fired
+        gauss=None if math.isnan(gauss) else gauss
+        self._random.setstate((self._random.VERSION,(*internal.tolist(),),gauss))
+        if hasShip:
+            if self._ship is None:
+                self.reset()
+            self._ship.setState(ship)
+        else:
+            self._ship=None
+        self._asteroids.setState(pos, vel, sizes, ids, nextId)
+        self._broadphase.update(self._asteroids.getPositions(),self._asteroids.getRadii())
         for bullet in self._bullets:
-            bullet.draw(view)
+            bullet.setExpiry(None)
+            self._bulletPool.release(bullet)
+        origin=(0.0,0.0)
+        facing=introcs.Vector2(1.0,0.0)
+        self._bullets=[]
+        self._expiring=[]
+        for state in bullets.tolist():
+            bullet=self._bulletPool.acquire(facing, origin)
+            bullet.setState(state)
+            if bullet.getExpiry()!=None:
+                self._expiring.append((bullet.getExpiry(),fired-m+len(self._bullets),bullet))
+            self._bullets.append(bullet)
+        heapq.heapify(self._expiring)
+        self._clock.reset()
 
     # RESET METHOD FOR CREATING A NEW LIFE
     def reset(self):
@@ -174,94 +586,236 @@ class Wave(object):
         position=ship["position"]
         angle=ship["angle"]
         self._ship=Ship(position, angle)
+        self._clock.reset()
 
     # HELPER METHODS FOR PHYSICS AND COLLISION DETECTION
-    def _deleteBullet(self):
+    def _steer(self, inputs, scale):
+        """
+        Turns, thrusts and moves the ship one tick at a time, and returns what it did.
+
+        The result is a tuple (path, shots, history). The path is a float array of shape
+        (scale,2) with the position of the ship at the end of each tick. The shots are a
+        list of tuples (tick, facing, position), one for every bullet that came due, with
+        the facing and the position of the ship on that tick. The history has a pair
+        (ship state, fire rate) for the end of each tick, to go back to if the step is
+        cut short; it is empty if scale is 1.
+
+        Parameter inputs: the keys held down during the step
+        Precondition: inputs is an int mask of the INPUT constants in consts.py
+
+        Parameter scale: the number of ticks in the step
+        Precondition: scale is an int >= 1
+        """
+        ship=self._ship
+        path=[]
+        shots=[]
+        history=[]
+        for tick in range(scale):
+            self._firerate+=1
+            if inputs&INPUT_LEFT:
+                ship.turn(True)
+            if inputs&INPUT_RIGHT:
+                ship.turn(False)
+            if inputs&INPUT_THRUST:
+                ship.velocity()
+            ship.move()
+            if inputs&INPUT_FIRE and self._firerate>=BULLET_RATE:
+                facing=ship.getFacing()
+                shots.append((tick,introcs.Vector2(facing.x,facing.y),ship.getPosition()))
+                self._firerate=0
+            path.append(ship.getPosition())
+            if scale>1:
+                history.append((ship.getState(),self._firerate))
+        return (np.array(path),shots,history)
+
+    def _moveBullets(self, shots, scale):
+        """
+        Fires the bullets that came due during a step and moves all bullets, and returns
+        the part of the step in which each bullet moved.
+
+        In a step of one tick, every bullet moves the whole tick and the result is None.
+        In a longer step, a bullet moves from the tick it was fired on, and stops on the
+        tick it leaves the screen (a single tick would delete it then). The result is
+        then a float array of shape (len(_bullets),2) with the fractions of the step at 
+        which each bullet began and stopped (see sweptHits in physics.py).
+
+        Parameter shots: the bullets to fire, as returned by _steer
+        Precondition: shots is a list of tuples (tick, facing, position)
+
+        Parameter scale: the number of ticks in the step
+        Precondition: scale is an int >= 1
+        """
+        first=self._tick
+        if scale==1:
+            for (tick,facing,position) in shots:
+                self._fire(facing, position)
+            self._tick+=1
+            for bullet in self._bullets:
+                bullet.move()
+            return None
+        spans=[]
+        for bullet in self._bullets:
+            moves=min(bullet.getLife(),scale)
+            bullet.move(moves)
+            spans.append((0.0,moves/scale))
+        for (tick,facing,position) in shots:
+            self._tick=first+tick
+            self._fire(facing, position)
+            bullet=self._bullets[-1]
+            moves=min(bullet.getLife(),scale-tick)
+            bullet.move(moves)
+            spans.append((tick/scale,(tick+moves)/scale))
+        self._tick=first+scale
+        return np.array(spans)
+
+    def _fire(self, facing=None, position=None):
+        """
+        Fires a new bullet and schedules its expiry.
+
+        The bullet is due to leave the screen getLife() ticks from now. It is scheduled
+        a tick early, since the bullet position builds up rounding errors as it moves.
+
+        Parameter facing: the facing of the ship (its current facing if None)
+        Precondition: facing is None or a Vector2 object
+
+        Parameter position: the position of the ship (its current position if None)
+        Precondition: position is None or a tuple of two floats
+        """
+        if facing is None:
+            facing=self._ship.getFacing()
+            position=self._ship.getPosition()
+        bullet=self._bulletPool.acquire(facing,position)
+        life=bullet.getLife()
+        if life!=math.inf:
+            bullet.setExpiry(self._tick+max(life-1,0))
+            heapq.heappush(self._expiring,(bullet.getExpiry(),self._fired,bullet))
+        self._fired+=1
+        self._bullets.append(bullet)
+
+    def _expireBullets(self):
+        """
+        Returns the bullets that left the screen, as a set of object ids.
+
+        Only the bullets whose expiry has come are looked at. A bullet that is due but
+        still on screen (because of rounding) is checked again on the next tick. Stale
+        entries, for bullets that hit an asteroid, are dropped.
+        """
+        spent=set()
+        while self._expiring and self._expiring[0][0]<=self._tick:
+            (expiry,serial,bullet)=heapq.heappop(self._expiring)
+            if bullet.getExpiry()!=expiry:
+                continue
+            if bullet.isDelete():
+                spent.add(id(bullet))
+            else:
+                bullet.setExpiry(self._tick+1)
+                heapq.heappush(self._expiring,(self._tick+1,serial,bullet))
+        return spent
+
+    def _deleteBullet(self, hit=()):
         """
         Checks if the bullet is to be deleted. If it does, then it modifies 
         the list attribute _bullets by deleting the particular element.
+
+        A bullet is deleted if it left the screen or if it hit an asteroid. Bullets are
+        not checked every tick; the ones leaving the screen come from the expiry heap
+        (see _expireBullets). All of the deleted bullets are removed in a single pass 
+        that keeps the others in order, and they go back to the bullet pool.
+
+        Parameter hit: the positions in _bullets of the bullets that hit an asteroid
+        Precondition: hit is a set (or other container) of ints
         """
-        i=0
-        while i<len(self._bullets):
-            if self._bullets[i].isDelete(): 
-                del self._bullets[i]
+        spent=self._expireBullets()
+        if not hit and not spent:
+            return
+        live=[]
+        for i,bullet in enumerate(self._bullets):
+            if i in hit or id(bullet) in spent:
+                bullet.setExpiry(None)
+                self._bulletPool.release(bullet)
             else:
-                i+=1
+                live.append(bullet)
+        self._bullets=live
     
-    def _detectBulletCollision(self):
+    def _detectBulletCollision(self, scale=1, spans=None):
         """
         Checks if the bullet has collided with an asteroid and modifies the 
-        list attribute _asteroids. 
+        attribute _asteroids. It returns the set of positions in _bullets of the bullets
+        that hit an asteroid, for _deleteBullet to delete.
 
-        If there is a collision then it deletes the bullet and the asteroid which collided.
+        If there is a collision then it deletes the asteroid which collided.
         If the asteroid was sized medium, then three new small asteroids are created,
         whereas, if the asteroid was sized large, three new medium asteroids are created.
+
+        All bullets are tested at once along the paths they swept in the last step (see
+        sweptHits in physics.py). Each bullet takes the asteroid it reaches first. The
+        new asteroids cannot be hit until the next step. In a step of several ticks, they
+        are placed where they would be had the asteroid broken up on the tick it was hit.
+
+        Parameter scale: the number of ticks in the last step
+        Precondition: scale is an int >= 1
+
+        Parameter spans: the part of the step in which each bullet moved
+        Precondition: spans is None (all of it) or a float array of shape (n,2), as
+        returned by _moveBullets
+        """
+        if len(self._bullets)==0 or len(self._asteroids)==0:
+            return set()
+        field=self._asteroids
+        starts=np.array([bullet.getLast() for bullet in self._bullets])
+        ends=np.array([(bullet.x,bullet.y) for bullet in self._bullets])
+        (points,asteroids,times)=sweptHits(self._broadphase, starts, ends, BULLET_RADIUS,\
+        field.getPositions(), field.getRadii(), field.getVelocities()*scale, spans)
+        (winners,targets)=firstHits(points, asteroids)
+        if len(winners)==0:
+            return set()
+        vectors=[self._bulletCollisionVector(self._bullets[i]) for i in winners.tolist()]
+        lags=None
+        if scale>1:
+            # The pieces move for the ticks left after the tick of the impact
+            impact=dict(zip(zip(points.tolist(),asteroids.tolist()),times.tolist()))
+            lags=[]
+            for pair in zip(winners.tolist(),targets.tolist()):
+                tick=min(max(math.ceil(impact[pair]*scale)-1,0),scale-1)
+                lags.append(scale-1-tick)
+        self._split(targets, vectors, lags)
+        return set(winners.tolist())
+
+    def _findShipHit(self, path):
         """
-        i=0
-        while i<(len(self._bullets)):
-            j=0
-            while j<(len(self._asteroids)):
-                distance=math.dist([self._bullets[i].x,self._bullets[i].y],\
-                [self._asteroids[j].x,self._asteroids[j].y])
-                if distance<=(self._asteroids[j].getRadius()+BULLET_RADIUS):
-                    temp=self._bullets[i]
-                    del self._bullets[i]
-                    if self._asteroids[j].getSize()==SMALL_ASTEROID:
-                        del self._asteroids[j]
-                        break
-                    elif self._asteroids[j].getSize()==MEDIUM_ASTEROID:
-                        old_center=(self._asteroids[j].x,self._asteroids[j].y)
-                        del self._asteroids[j]
-                        pos=self._bulletCollisionVector(temp)
-                        new_center=self._newCenter(old_center, pos, SMALL_RADIUS)
-                        self._insert(j, SMALL_ASTEROID, new_center, pos)
-                        break
-                    else:
-                        old_center=(self._asteroids[j].x,self._asteroids[j].y)
-                        del self._asteroids[j]
-                        pos=self._bulletCollisionVector(temp)
-                        new_center=self._newCenter(old_center, pos, MEDIUM_RADIUS)
-                        self._insert(j, MEDIUM_ASTEROID, new_center, pos)
-                        break
-                j+=1
-            i+=1
+        Returns the first tick of a step in which the ship hits an asteroid.
+
+        The result is the number of ticks in the step if the ship hits nothing. This 
+        method is called before the asteroids move, so on tick k (from 0) they have moved
+        k+1 ticks. All ticks are tested in one query (see sampledHits in physics.py).
+        Asteroids that break up during the step are tested as if they did not.
+
+        Parameter path: the position of the ship at the end of each tick of the step
+        Precondition: path is a float array of shape (n,2), as returned by _steer
+        """
+        field=self._asteroids
+        ticks=np.arange(1,len(path)+1,dtype=float)
+        hits=sampledHits(self._broadphase, path, ticks, SHIP_RADIUS, field.getPositions(),\
+        field.getRadii(), field.getVelocities())
+        return int(hits[0][0]) if len(hits[0]) else len(path)
 
     def _detectShipCollision(self):
         """
         Checks if the ship has collided with an asteroid and modifies the 
-        list attribute _asteroids. 
+        attribute _asteroids. 
 
         If there is a collision then it reduces the lives attribute by 1,
         sets the ship to None and deletes the asteroid with which the ship collided.
         If the asteroid was sized medium, then three new small asteroids are created,
         whereas, if the asteroid was sized large, three new medium asteroids are created.
         """
-        i=0
-        while i<len(self._asteroids):
-            distance=math.dist([self._ship.x,self._ship.y],\
-            [self._asteroids[i].x,self._asteroids[i].y])
-            if distance<=(self._asteroids[i].getRadius()+SHIP_RADIUS):
-                temp=self._ship
-                self._lives-=1
-                self._ship=None
-                if self._asteroids[i].getSize()==SMALL_ASTEROID:
-                    del self._asteroids[i]
-                    break
-                elif self._asteroids[i].getSize()==MEDIUM_ASTEROID:
-                    old_center=(self._asteroids[i].x,self._asteroids[i].y)
-                    del self._asteroids[i]
-                    pos=self._shipCollisionVector(temp)
-                    new_center=self._newCenter(old_center, pos, SMALL_RADIUS)
-                    self._insert(i, SMALL_ASTEROID, new_center, pos)
-                    break
-                else:
-                    old_center=(self._asteroids[i].x,self._asteroids[i].y)
-                    del self._asteroids[i]
-                    pos=self._shipCollisionVector(temp)
-                    new_center=self._newCenter(old_center, pos, MEDIUM_RADIUS)
-                    self._insert(i, MEDIUM_ASTEROID, new_center, pos)
-                    break
-            i+=1
+        hits=self._broadphase.touching(np.array([self._ship.getPosition()]), SHIP_RADIUS)
+        if len(hits[1]):
+            i=int(hits[1][0])
+            temp=self._ship
+            self._lives-=1
+            self._ship=None
+            self._split([i], [self._shipCollisionVector(temp)])
 
     def _bulletCollisionVector(self, bullet):
         """
@@ -326,23 +880,60 @@ class Wave(object):
         new_center3=((pos[2].x*radius)+old[0],(pos[2].y*radius)+old[1])
         return (new_center1, new_center2, new_center3)
 
-    def _insert(self, index, size, new, pos):
+    def _split(self, indices, vectors, lags=None):
         """
-        Modifies the list attribute _asteroids by inserting three new 
-        instances of the Asteroid class.
+        Modifies the attribute _asteroids by breaking up the given asteroids.
 
-        Parameter index: index to insert at
-        Precondition: index is an int
+        Every asteroid is deleted. In place of a medium asteroid, three new small 
+        asteroids are inserted, and in place of a large asteroid, three new medium 
+        asteroids are inserted. The new asteroids take the place of the old one in 
+        the draw order. The field is rebuilt once for all of the asteroids (see the
+        method replace of AsteroidField).
 
-        Parameter size: size of the Asteroid being inserted
-        Precondition: size is a string
+        An asteroid that broke up a few ticks ago (during a step of several ticks) is 
+        broken up where it was then, and its pieces are moved by the ticks since.
 
-        Parameter new: the position of the Asteroid being inserted
-        Precondition: new is a tuple of tuples
+        Parameter indices: the rows of the asteroids to break up
+        Precondition: indices is a sequence of distinct ints, all valid rows
 
-        Parameter pos: the direction of the Asteroid being inserted
-        Precondition: pos is a tuple of Vector2 objects
+        Parameter vectors: the directions of the new asteroids, one tuple per row
+        Precondition: vectors is a sequence of tuples of three Vector2 objects
+
+        Parameter lags: the ticks since each asteroid broke up (all 0 if None)
+        Precondition: lags is None or a sequence of ints >= 0, one per row
         """
-        self._asteroids.insert(index,Asteroid(size, new[0], [pos[0].x,pos[0].y]))
-        self._asteroids.insert(index+1,Asteroid(size, new[1], [pos[1].x,pos[1].y]))
-        self._asteroids.insert(index+2,Asteroid(size, new[2], [pos[2].x,pos[2].y]))
\ No newline at end of file
+        timer=self._timer
+        if timer:
+            start=timer.begin()
+        field=self._asteroids
+        centers=field.getPositions()
+        velocities=field.getVelocities()
+        codes=field.getSizes()
+        indices=[int(row) for row in indices]
+        sizes=[]
+        new=[]
+        dir=[]
+        owners=[]
+        for k,(row,pos) in enumerate(zip(indices,vectors)):
+            size=int(codes[row])
+            if size>0:
+                lag=0 if lags is None else lags[k]
+                # Where the asteroid broke up, and how far its pieces have moved since
+                old=(float(centers[row,0]-velocities[row,0]*lag),
+                     float(centers[row,1]-velocities[row,1]*lag))
+                pieces=self._newCenter(old, pos, ASTEROID_RADII[size-1])
+                if lag:
+                    reach=ASTEROID_SPEEDS[size-1]*lag
+                    moved=[]
+                    for ((x,y),v) in zip(pieces,pos):
+                        length=math.hypot(v.x,v.y)
+                        moved.append((x+v.x*reach/length,y+v.y*reach/length))
+                    pieces=moved
+                sizes.extend([size-1,size-1,size-1])
+                new.extend(pieces)
+                dir.extend([[pos[0].x,pos[0].y],[pos[1].x,pos[1].y],[pos[2].x,pos[2].y]])
+                owners.extend([row,row,row])
+        field.replace(indices, owners, sizes, new, dir)
+        self._broadphase.update(field.getPositions(), field.getRadii())
+        if timer:
+            timer.exclude(PHASE_SPLIT, start)